@@ -0,0 +1,119 @@
+"""
+Micro-benchmark: list-based chunking_by_token_size (encode everything, re-encode
+every split piece, decode every window) vs the single-pass streaming chunker.
+
+Chunk boundaries and token counts must be identical. Chunk text must be identical
+too when windows are decoded; with HuggingFace fast tokenizers windows are sliced
+from the source text instead, so they must be verbatim substrings of the document
+and the number of chunks whose text differs from the decoded one is reported.
+
+    python -m examples.benchmarks.chunking_benchmark --tokenizer /path/to/hf/tokenizer
+    python -m examples.benchmarks.chunking_benchmark            # tiktoken gpt-4o-mini
+"""
+import argparse
+import time
+from typing import Any
+
+from lightrag.chunk import (
+    _encode_with_offsets,
+    chunking_by_token_size,
+    iter_chunks_by_token_size,
+)
+from lightrag.utils import TiktokenTokenizer
+
+SPLIT = "\n↔\n"
+
+
+def legacy_chunking_by_token_size(
+    tokenizer,
+    content: str,
+    split_by_character: str | None = None,
+    split_by_character_only: bool = False,
+    overlap_token_size: int = 128,
+    max_token_size: int = 1024,
+) -> list[dict[str, Any]]:
+    tokens = tokenizer.encode(content)
+    results: list[dict[str, Any]] = []
+    if split_by_character:
+        new_chunks = []
+        for chunk in content.split(split_by_character):
+            _tokens = tokenizer.encode(chunk)
+            if not split_by_character_only and len(_tokens) > max_token_size:
+                for start in range(0, len(_tokens), max_token_size - overlap_token_size):
+                    new_chunks.append(
+                        (
+                            min(max_token_size, len(_tokens) - start),
+                            tokenizer.decode(_tokens[start : start + max_token_size]),
+                        )
+                    )
+            else:
+                new_chunks.append((len(_tokens), chunk))
+        for index, (_len, chunk) in enumerate(new_chunks):
+            results.append({"tokens": _len, "content": chunk.strip(), "chunk_order_index": index})
+    else:
+        for index, start in enumerate(range(0, len(tokens), max_token_size - overlap_token_size)):
+            results.append(
+                {
+                    "tokens": min(max_token_size, len(tokens) - start),
+                    "content": tokenizer.decode(tokens[start : start + max_token_size]).strip(),
+                    "chunk_order_index": index,
+                }
+            )
+    return results
+
+
+def synthetic_manual(pages: int) -> str:
+    section = "物料编码 BOM 审核申请流程说明，采购类型修改需要提交变更单。 " * 40
+    return SPLIT.join(f"第{i}章 {section * 3}" for i in range(pages))
+
+
+def timeit(func, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(tokenizer_path: str | None, pages: int):
+    if tokenizer_path:
+        from transformers import AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(tokenizer_path)
+    else:
+        tokenizer = TiktokenTokenizer()
+    content = synthetic_manual(pages)
+    sliced = _encode_with_offsets(tokenizer, content)[1] is not None
+
+    for split in (None, SPLIT):
+        args = (tokenizer, content, split, False, 100, 1200)
+        legacy = legacy_chunking_by_token_size(*args)
+        current = chunking_by_token_size(*args)
+        assert [c["tokens"] for c in legacy] == [c["tokens"] for c in current]
+        if sliced:
+            assert all(c["content"] in content for c in current)
+        else:
+            assert [c["content"] for c in legacy] == [c["content"] for c in current]
+        text_diffs = sum(
+            a["content"] != b["content"] for a, b in zip(legacy, current)
+        )
+
+        legacy_time = timeit(legacy_chunking_by_token_size, *args)
+        current_time = timeit(chunking_by_token_size, *args)
+        start = time.perf_counter()
+        next(iter_chunks_by_token_size(*args))
+        first_chunk = time.perf_counter() - start
+        print(
+            f"split={split!r:10} chunks={len(current):5} legacy={legacy_time:.3f}s "
+            f"single-pass={current_time:.3f}s first-chunk={first_chunk:.4f}s "
+            f"text-differs-from-decode={text_diffs}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokenizer", default=None, help="HuggingFace tokenizer path")
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+    main(args.tokenizer, args.pages)
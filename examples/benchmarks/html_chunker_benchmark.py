@@ -0,0 +1,56 @@
+"""
+Regression benchmark for HTMLChunker on a synthetic HTML export.
+
+Chunking time per paragraph should stay flat as the document grows (linear
+total time); the 10k-paragraph case is the regression target.
+
+    python -m examples.benchmarks.html_chunker_benchmark --tokenizer /path/to/hf/tokenizer
+"""
+import argparse
+import time
+
+from lightrag.utils import TiktokenTokenizer
+from plm.deepdoc.html2chunk import HTMLChunker
+
+
+def synthetic_html(paragraphs: int, paragraphs_per_section: int = 500) -> str:
+    body = []
+    for i in range(paragraphs):
+        if i % paragraphs_per_section == 0:
+            body.append(f"<h1>章节 {i // paragraphs_per_section}</h1>")
+            body.append(f"<h2>小节 {i // paragraphs_per_section}.1</h2>")
+        body.append(f"<p>第{i}段：物料的采购类型可以在 PLM 中通过变更单修改。</p>")
+    return f"<html><body>{''.join(body)}</body></html>"
+
+
+def run(tokenizer, paragraphs: int) -> float:
+    content = synthetic_html(paragraphs)
+    start = time.perf_counter()
+    chunker = HTMLChunker(tokenizer, content, "synthetic.html")
+    chunker.build_chunk_tree()
+    chunker.convert_to_dict_list()
+    chunker.get_full_text("root")
+    return time.perf_counter() - start
+
+
+def main(tokenizer_path: str | None):
+    if tokenizer_path:
+        from transformers import AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(tokenizer_path)
+    else:
+        tokenizer = TiktokenTokenizer()
+
+    for paragraphs in (1_000, 2_500, 5_000, 10_000):
+        elapsed = run(tokenizer, paragraphs)
+        print(
+            f"paragraphs={paragraphs:6} total={elapsed:.3f}s "
+            f"per-paragraph={elapsed / paragraphs * 1e6:.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokenizer", default=None, help="HuggingFace tokenizer path")
+    args = parser.parse_args()
+    main(args.tokenizer)
@@ -0,0 +1,89 @@
+"""
+Subgraph selection of NetworkXStorage.get_knowledge_graph.
+
+Compares the previous implementation (full sort for "*", list-based BFS that
+re-queues visited neighbors) against NetworkXStorage.select_subgraph_nodes on a
+random scale-free graph, and checks that both select the same nodes.
+
+    python -m examples.benchmarks.knowledge_graph_benchmark --nodes 300000
+"""
+import argparse
+import random
+import time
+
+import networkx as nx
+
+from lightrag.kg.networkx_impl import NetworkXStorage
+
+
+def previous_select_subgraph_nodes(
+    graph: nx.Graph, node_label: str, max_depth: int, max_nodes: int
+) -> tuple[list[str], bool]:
+    """The selection logic of get_knowledge_graph before the heap/deque rewrite"""
+    if node_label == "*":
+        degrees = dict(graph.degree())
+        sorted_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)
+        return [node for node, _ in sorted_nodes[:max_nodes]], len(
+            sorted_nodes
+        ) > max_nodes
+
+    bfs_nodes = []
+    visited = set()
+    queue = [(node_label, 0, graph.degree(node_label))]
+    while queue and len(bfs_nodes) < max_nodes:
+        current_depth = queue[0][1]
+        current_level_nodes = []
+        while queue and queue[0][1] == current_depth:
+            current_level_nodes.append(queue.pop(0))
+        current_level_nodes.sort(key=lambda x: x[2], reverse=True)
+        for current_node, depth, degree in current_level_nodes:
+            if current_node not in visited:
+                visited.add(current_node)
+                bfs_nodes.append(current_node)
+                if depth < max_depth:
+                    neighbors = list(graph.neighbors(current_node))
+                    unvisited_neighbors = [n for n in neighbors if n not in visited]
+                    for neighbor in unvisited_neighbors:
+                        queue.append((neighbor, depth + 1, graph.degree(neighbor)))
+            if len(bfs_nodes) >= max_nodes:
+                break
+    return bfs_nodes, bool(queue and len(bfs_nodes) >= max_nodes)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(num_nodes: int, max_depth: int, max_nodes: int, labels: int):
+    graph = nx.barabasi_albert_graph(num_nodes, 3, seed=42)
+    graph = nx.relabel_nodes(graph, {i: f"entity {i}" for i in graph.nodes})
+    print(f"graph: {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges")
+
+    rng = random.Random(42)
+    start_nodes = ["*"] + rng.sample(list(graph.nodes), labels)
+    total_previous = total_current = 0.0
+    for label in start_nodes:
+        (previous, _), t_previous = timed(
+            previous_select_subgraph_nodes, graph, label, max_depth, max_nodes
+        )
+        (current, _), t_current = timed(
+            NetworkXStorage.select_subgraph_nodes, graph, label, max_depth, max_nodes
+        )
+        assert previous == current, f"selection differs for {label}"
+        total_previous += t_previous
+        total_current += t_current
+        print(f"{label:>14}: previous {t_previous:.3f}s, current {t_current:.3f}s")
+
+    print(f"total: previous {total_previous:.3f}s, current {total_current:.3f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=300_000)
+    parser.add_argument("--max-depth", type=int, default=3)
+    parser.add_argument("--max-nodes", type=int, default=1000)
+    parser.add_argument("--labels", type=int, default=5)
+    args = parser.parse_args()
+    main(args.nodes, args.max_depth, args.max_nodes, args.labels)
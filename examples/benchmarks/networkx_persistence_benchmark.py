@@ -0,0 +1,86 @@
+"""
+Save / load time and file size of NetworkXStorage persistence.
+
+Compares GraphML (the previous format) against the binary snapshot that
+index_done_callback writes when the delta file gets compacted.
+
+    python -m examples.benchmarks.networkx_persistence_benchmark --edges 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import networkx as nx
+
+from lightrag.constants import GRAPH_FIELD_SEP
+from lightrag.kg.networkx_impl import NetworkXStorage
+
+
+def build_graph(num_nodes: int, num_edges: int) -> nx.Graph:
+    rng = random.Random(42)
+    graph = nx.Graph()
+    for i in range(num_nodes):
+        graph.add_node(
+            f"entity {i}",
+            entity_id=f"entity {i}",
+            entity_type=rng.choice(["person", "organization", "product", "event"]),
+            description=f"Description of entity {i}",
+            source_id=GRAPH_FIELD_SEP.join(
+                f"chunk-{rng.randrange(num_nodes):032x}" for _ in range(2)
+            ),
+            file_path="manual.pdf",
+            created_at=1750000000 + i,
+        )
+    edge_count = 0
+    while edge_count < num_edges:
+        u, v = rng.randrange(num_nodes), rng.randrange(num_nodes)
+        if u != v and not graph.has_edge(f"entity {u}", f"entity {v}"):
+            edge_count += 1
+            graph.add_edge(
+                f"entity {u}",
+                f"entity {v}",
+                weight=1.0,
+                description=f"Relation between {u} and {v}",
+                keywords="related",
+                source_id=f"chunk-{rng.randrange(num_nodes):032x}",
+                file_path="manual.pdf",
+                created_at=1750000000,
+            )
+    return graph
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(num_nodes: int, num_edges: int, skip_graphml: bool):
+    graph, elapsed = timed(build_graph, num_nodes, num_edges)
+    print(f"built graph: {num_nodes} nodes, {num_edges} edges in {elapsed:.1f}s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_file = os.path.join(tmp, "graph.msgpack")
+        _, save = timed(NetworkXStorage.write_graph_snapshot, graph, snapshot_file, 1)
+        (loaded, _), load = timed(NetworkXStorage.load_graph_snapshot, snapshot_file)
+        assert loaded.number_of_edges() == graph.number_of_edges()
+        size = os.path.getsize(snapshot_file) / 2**20
+        print(f"binary snapshot: save {save:.2f}s, load {load:.2f}s, {size:.1f} MiB")
+
+        if not skip_graphml:
+            graphml_file = os.path.join(tmp, "graph.graphml")
+            _, save = timed(nx.write_graphml, graph, graphml_file)
+            _, load = timed(nx.read_graphml, graphml_file)
+            size = os.path.getsize(graphml_file) / 2**20
+            print(f"graphml:         save {save:.2f}s, load {load:.2f}s, {size:.1f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=300_000)
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--skip-graphml", action="store_true")
+    args = parser.parse_args()
+    main(args.nodes, args.edges, args.skip_graphml)
@@ -0,0 +1,111 @@
+"""
+Per-call vs pooled AsyncOpenAI clients.
+
+Starts a local OpenAI-compatible stub (aiohttp) that answers chat and
+embedding requests after a fixed delay, then fires N concurrent requests
+once with a fresh client per call and once through the pooled client.
+
+    python -m examples.benchmarks.openai_client_benchmark --requests 200 --concurrency 32
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from aiohttp import web
+
+from lightrag.llm.openai import (
+    close_openai_async_clients,
+    create_openai_async_client,
+    get_openai_async_client,
+)
+
+API_KEY = "sk-benchmark"
+
+
+async def chat_handler(request: web.Request) -> web.Response:
+    await asyncio.sleep(request.app["delay"])
+    return web.json_response(
+        {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "bench",
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "ok"},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }
+    )
+
+
+async def start_stub(port: int, delay: float) -> web.AppRunner:
+    app = web.Application()
+    app["delay"] = delay
+    app.router.add_post("/v1/chat/completions", chat_handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+
+async def one_call(base_url: str, pooled: bool) -> float:
+    start = time.perf_counter()
+    if pooled:
+        client = get_openai_async_client(api_key=API_KEY, base_url=base_url)
+        await client.chat.completions.create(
+            model="bench", messages=[{"role": "user", "content": "hi"}]
+        )
+    else:
+        client = create_openai_async_client(api_key=API_KEY, base_url=base_url)
+        async with client:
+            await client.chat.completions.create(
+                model="bench", messages=[{"role": "user", "content": "hi"}]
+            )
+    return time.perf_counter() - start
+
+
+async def run(base_url: str, pooled: bool, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded():
+        async with semaphore:
+            return await one_call(base_url, pooled)
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(bounded() for _ in range(requests)))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def report(name: str, total: float, latencies: list[float]):
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{name:<10} total {total:7.3f}s  "
+        f"p50 {statistics.median(latencies) * 1000:7.2f}ms  "
+        f"p95 {p95 * 1000:7.2f}ms  "
+        f"{len(latencies) / total:8.1f} req/s"
+    )
+
+
+async def main(args):
+    runner = await start_stub(args.port, args.delay)
+    base_url = f"http://127.0.0.1:{args.port}/v1"
+    try:
+        report("per-call", *await run(base_url, False, args.requests, args.concurrency))
+        report("pooled", *await run(base_url, True, args.requests, args.concurrency))
+    finally:
+        await close_openai_async_clients()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--delay", type=float, default=0.005)
+    parser.add_argument("--port", type=int, default=8765)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,58 @@
+"""
+Startup / first-query latency of the PLM RAG routes.
+
+Compares the old per-request path (init_rag + initialize_storages for every
+question) against the warm instance served by ``rag_pool``.
+
+    python -m examples.benchmarks.rag_startup_benchmark --rounds 3
+"""
+import argparse
+import asyncio
+import time
+
+from lightrag import QueryParam
+from lightrag.kg.shared_storage import initialize_pipeline_status
+from plm.core.rag import init_rag, rag_pool
+
+QUESTION = "请问BOM是什么？"
+
+
+async def per_request_query(question: str) -> float:
+    start = time.perf_counter()
+    rag = init_rag()
+    await rag.initialize_storages()
+    await initialize_pipeline_status()
+    await rag.aquery(question, param=QueryParam(mode="naive", only_need_context=True))
+    elapsed = time.perf_counter() - start
+    await rag.finalize_storages()
+    return elapsed
+
+
+async def warm_query(question: str) -> float:
+    rag = await rag_pool.get()
+    start = time.perf_counter()
+    await rag.aquery(question, param=QueryParam(mode="naive", only_need_context=True))
+    return time.perf_counter() - start
+
+
+async def main(rounds: int, question: str):
+    per_request = [await per_request_query(question) for _ in range(rounds)]
+
+    start = time.perf_counter()
+    await rag_pool.get()
+    startup = time.perf_counter() - start
+    await initialize_pipeline_status()
+    warm = [await warm_query(question) for _ in range(rounds)]
+    await rag_pool.close()
+
+    print(f"per-request init + query: {[f'{t:.3f}s' for t in per_request]}")
+    print(f"pool startup + warm up:   {startup:.3f}s (paid once)")
+    print(f"warm instance query:      {[f'{t:.3f}s' for t in warm]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--question", default=QUESTION)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds, args.question))
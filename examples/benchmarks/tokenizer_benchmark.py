@@ -0,0 +1,126 @@
+"""
+Tokenizer time per query: encode-on-every-call vs Tokenizer.count_tokens_many.
+
+Replays the token accounting of _build_query_context (entity, relation and chunk
+truncation plus the KG context, system prompt and query counts) for a series of
+queries whose retrieved entities, relations and chunks overlap, as they do for
+related questions against the same knowledge graph.
+
+    python -m examples.benchmarks.tokenizer_benchmark --tokenizer /path/to/hf/tokenizer
+    python -m examples.benchmarks.tokenizer_benchmark            # tiktoken gpt-4o-mini
+"""
+import argparse
+import json
+import random
+import time
+
+from lightrag.prompt import PROMPTS
+from lightrag.utils import TiktokenTokenizer, Tokenizer, truncate_list_by_token_size
+
+TEXT = "物料编码 BOM 审核申请流程说明，采购类型修改需要提交变更单。Material review flow. "
+
+
+def build_pool(size: int, kind: str) -> list[dict]:
+    if kind == "entity":
+        return [
+            {
+                "entity": f"实体{i}",
+                "type": "category",
+                "description": TEXT * (2 + i % 5),
+                "file_path": f"doc_{i % 50}.md",
+            }
+            for i in range(size)
+        ]
+    if kind == "relation":
+        return [
+            {
+                "entity1": f"实体{i}",
+                "entity2": f"实体{i + 1}",
+                "description": TEXT * (1 + i % 4),
+                "keywords": "流程,审核",
+                "file_path": f"doc_{i % 50}.md",
+            }
+            for i in range(size)
+        ]
+    return [
+        {"content": TEXT * (20 + i % 30), "file_path": f"doc_{i % 50}.md"}
+        for i in range(size)
+    ]
+
+
+def account_query(
+    tokenizer, query: str, entities, relations, chunks, legacy: bool
+) -> None:
+    def truncate(items, key, limit):
+        if not legacy:
+            return truncate_list_by_token_size(items, key, limit, tokenizer)
+        tokens = 0
+        for i, data in enumerate(items):
+            tokens += len(tokenizer.encode(key(data)))
+            if tokens > limit:
+                return items[:i]
+        return items
+
+    entities = truncate(entities, lambda x: json.dumps(x, ensure_ascii=False), 10000)
+    relations = truncate(relations, lambda x: json.dumps(x, ensure_ascii=False), 10000)
+    kg_context = json.dumps(entities, ensure_ascii=False) + json.dumps(
+        relations, ensure_ascii=False
+    )
+    sys_prompt = PROMPTS["rag_response"].format(
+        history="", context_data="", response_type="Multiple Paragraphs", user_prompt=""
+    )
+    if legacy:
+        for text in (kg_context, sys_prompt, query):
+            len(tokenizer.encode(text))
+        # kg_query debug log
+        len(tokenizer.encode(query + sys_prompt))
+        len(tokenizer.encode(query))
+        len(tokenizer.encode(sys_prompt))
+    else:
+        tokenizer.count_tokens_many([kg_context, sys_prompt, query])
+        tokenizer.count_tokens_many([query, sys_prompt])
+    truncate(chunks, lambda x: x["content"], 20000)
+
+
+def run(tokenizer, queries, pools, legacy: bool) -> float:
+    entity_pool, relation_pool, chunk_pool = pools
+    start = time.perf_counter()
+    for seed, query in enumerate(queries):
+        rnd = random.Random(seed)
+        account_query(
+            tokenizer,
+            query,
+            rnd.sample(entity_pool, 40),
+            rnd.sample(relation_pool, 60),
+            rnd.sample(chunk_pool, 20),
+            legacy,
+        )
+    return time.perf_counter() - start
+
+
+def main(tokenizer_path: str | None, queries: int):
+    if tokenizer_path:
+        from transformers import AutoTokenizer
+
+        tokenizer = Tokenizer(tokenizer_path, AutoTokenizer.from_pretrained(tokenizer_path))
+    else:
+        tokenizer = TiktokenTokenizer()
+    # A knowledge graph neighbourhood shared by related questions
+    pools = (build_pool(120, "entity"), build_pool(200, "relation"), build_pool(60, "chunk"))
+    query_list = [f"采购类型修改需要哪些审核？ question {i}" for i in range(queries)]
+
+    legacy_time = run(tokenizer, query_list, pools, legacy=True)
+    cached_time = run(tokenizer, query_list, pools, legacy=False)
+    print(
+        f"queries={queries} encode-per-call={legacy_time / queries * 1000:.2f}ms/query "
+        f"count_tokens_many={cached_time / queries * 1000:.2f}ms/query "
+        f"({legacy_time / cached_time:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokenizer", default=None, help="HuggingFace tokenizer path")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    main(args.tokenizer, args.queries)
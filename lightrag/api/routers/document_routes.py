@@ -1455,8 +1455,14 @@ def create_document_routes(
                 DocStatus.FAILED,
             )
 
-            tasks = [rag.get_docs_by_status(status) for status in statuses]
-            results: List[Dict[str, DocProcessingStatus]] = await asyncio.gather(*tasks)
+            # Content-free listing, the response only needs the summaries
+            tasks = [
+                rag.doc_status.get_docs_paginated(status, page_size=None)
+                for status in statuses
+            ]
+            results: List[Dict[str, DocProcessingStatus]] = [
+                docs for docs, _ in await asyncio.gather(*tasks)
+            ]
 
             response = DocsStatusesResponse()
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from enum import Enum
 import os
@@ -260,7 +261,11 @@ class BaseKVStorage(StorageNameSpace, ABC):
 
     @abstractmethod
     async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
-        """Get values by ids"""
+        """Get values by ids with a single multi-get
+
+        Returns:
+            Values in the order of ids, None for ids that do not exist
+        """
 
     @abstractmethod
     async def filter_keys(self, keys: set[str]) -> set[str]:
@@ -551,6 +556,34 @@ class BaseGraphStorage(StorageNameSpace, ABC):
             edge_data: A dictionary of edge properties
         """
 
+    async def upsert_nodes_batch(self, nodes: dict[str, dict[str, str]]) -> None:
+        """Insert or update multiple nodes as a batch
+
+        Default implementation upserts nodes one by one.
+        Override this method for better performance in storage backends
+        that support batch operations.
+
+        Args:
+            nodes: A dictionary mapping each node ID to its node properties
+        """
+        for node_id, node_data in nodes.items():
+            await self.upsert_node(node_id, node_data)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """Insert or update multiple edges as a batch
+
+        Default implementation upserts edges one by one.
+        Override this method for better performance in storage backends
+        that support batch operations.
+
+        Args:
+            edges: A list of (source_node_id, target_node_id, edge_data) tuples
+        """
+        for source_node_id, target_node_id, edge_data in edges:
+            await self.upsert_edge(source_node_id, target_node_id, edge_data)
+
     @abstractmethod
     async def delete_node(self, node_id: str) -> None:
         """Delete a node from the graph.
@@ -629,8 +662,6 @@ class DocStatus(str, Enum):
 class DocProcessingStatus:
     """Document processing status data structure"""
 
-    content: str
-    """Original content of the document"""
     content_summary: str
     """First 100 chars of document content, used for preview"""
     content_length: int
@@ -651,6 +682,9 @@ class DocProcessingStatus:
     """Error message if failed"""
     metadata: dict[str, Any] = field(default_factory=dict)
     """Additional metadata"""
+    content: str | None = None
+    """Original content of the document, only set for records of older versions.
+    The content lives in full_docs under the same document id."""
 
 
 @dataclass
@@ -667,6 +701,46 @@ class DocStatusStorage(BaseKVStorage, ABC):
     ) -> dict[str, DocProcessingStatus]:
         """Get all documents with a specific status"""
 
+    async def get_doc_ids_by_status(self, status: DocStatus) -> list[str]:
+        """Get the ids of all documents with a specific status"""
+        return list((await self.get_docs_by_status(status)).keys())
+
+    async def get_docs_paginated(
+        self,
+        status: DocStatus | None = None,
+        page: int = 1,
+        page_size: int | None = 50,
+    ) -> tuple[dict[str, DocProcessingStatus], int]:
+        """Get one page of documents without their content
+
+        Documents are ordered by updated_at, newest first. The content field of
+        the returned records is None, load it with get_by_id when needed.
+
+        Args:
+            status: Only list documents with this status, all documents if None
+            page: 1-based page number
+            page_size: Number of documents per page, all documents if None
+
+        Returns:
+            Tuple of (documents of the requested page, total matching documents)
+        """
+        statuses = [status] if status is not None else list(DocStatus)
+        docs: dict[str, DocProcessingStatus] = {}
+        for docs_by_status in await asyncio.gather(
+            *(self.get_docs_by_status(s) for s in statuses)
+        ):
+            docs.update(docs_by_status)
+
+        ordered = sorted(
+            docs.items(), key=lambda item: item[1].updated_at or "", reverse=True
+        )
+        if page_size is not None:
+            start = (max(page, 1) - 1) * page_size
+            ordered = ordered[start : start + page_size]
+        for _, doc in ordered:
+            doc.content = None
+        return dict(ordered), len(docs)
+
     async def drop_cache_by_modes(self, modes: list[str] | None = None) -> bool:
         """Drop cache is not supported for Doc Status storage"""
         return False
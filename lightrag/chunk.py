@@ -19,9 +19,92 @@ from .utils import (
     remove_think_tags,
 )
 
-from typing import Any, AsyncIterator
+from typing import Any, AsyncIterator, Iterator
 
 
+def _encode_with_offsets(
+    tokenizer: Tokenizer, content: str
+) -> tuple[list[int], list[tuple[int, int]] | None]:
+    """Encode content once, returning character offsets when the tokenizer can provide them.
+
+    HuggingFace fast tokenizers (used directly or wrapped by `Tokenizer`) expose an
+    offset mapping, which lets windows be cut from the original text instead of being
+    decoded back from token ids. Other tokenizers fall back to plain `encode`.
+    """
+    backend = getattr(tokenizer, "tokenizer", tokenizer)
+    if getattr(backend, "is_fast", False):
+        encoding = backend(content, return_offsets_mapping=True)
+        return list(encoding["input_ids"]), list(encoding["offset_mapping"])
+    return tokenizer.encode(content), None
+
+
+def _window_text(
+    tokenizer: Tokenizer,
+    content: str,
+    tokens: list[int],
+    offsets: list[tuple[int, int]] | None,
+    start: int,
+    end: int,
+) -> str:
+    if offsets is not None:
+        # Special tokens map to empty (0, 0) spans and carry no text
+        spans = [span for span in offsets[start:end] if span[1] > span[0]]
+        if spans:
+            return content[spans[0][0] : spans[-1][1]]
+    return tokenizer.decode(tokens[start:end])
+
+
+def iter_chunks_by_token_size(
+    tokenizer: Tokenizer,
+    content: str,
+    split_by_character: str | None = None,
+    split_by_character_only: bool = False,
+    overlap_token_size: int = 128,
+    max_token_size: int = 1024,
+) -> Iterator[dict[str, Any]]:
+    """Single-pass, streaming variant of `chunking_by_token_size`.
+
+    Every piece of the document is tokenized exactly once and chunks are yielded
+    as soon as they are cut. Chunk boundaries are identical to the list-based
+    implementation; window text is sliced from the source via offset mappings
+    when available, otherwise decoded from the token window. Sliced text keeps the
+    original characters, so it can differ from the decoded text of tokenizers that
+    normalize input (e.g. whitespace cleanup or lowercasing).
+    """
+    pieces = content.split(split_by_character) if split_by_character else [content]
+    step = max_token_size - overlap_token_size
+    index = 0
+    for piece in pieces:
+        if split_by_character and split_by_character_only:
+            yield {
+                "tokens": len(tokenizer.encode(piece)),
+                "content": piece.strip(),
+                "chunk_order_index": index,
+            }
+            index += 1
+            continue
+
+        tokens, offsets = _encode_with_offsets(tokenizer, piece)
+        if split_by_character and len(tokens) <= max_token_size:
+            yield {
+                "tokens": len(tokens),
+                "content": piece.strip(),
+                "chunk_order_index": index,
+            }
+            index += 1
+            continue
+
+        for start in range(0, len(tokens), step):
+            end = start + max_token_size
+            yield {
+                "tokens": min(max_token_size, len(tokens) - start),
+                "content": _window_text(
+                    tokenizer, piece, tokens, offsets, start, end
+                ).strip(),
+                "chunk_order_index": index,
+            }
+            index += 1
+
 
 def custom_chunking(
     tokenizer: Tokenizer,
@@ -47,51 +130,17 @@ def custom_chunking(
     Returns:
 
     """
-    tokens = tokenizer.encode(content)
-    results: list[dict[str, Any]] = []
-    if split_by_character:
-        raw_chunks = content.split(split_by_character)
-        new_chunks = []
-        if split_by_character_only:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                new_chunks.append((len(_tokens), chunk))
-        else:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                if len(_tokens) > max_token_size:
-                    for start in range(
-                        0, len(_tokens), max_token_size - overlap_token_size
-                    ):
-                        chunk_content = tokenizer.decode(
-                            _tokens[start : start + max_token_size]
-                        )
-                        new_chunks.append(
-                            (min(max_token_size, len(_tokens) - start), chunk_content)
-                        )
-                else:
-                    new_chunks.append((len(_tokens), chunk))
-        for index, (_len, chunk) in enumerate(new_chunks):
-            results.append(
-                {
-                    "tokens": _len,
-                    "content": chunk.strip(),
-                    "chunk_order_index": index,
-                }
-            )
-    else:
-        for index, start in enumerate(
-            range(0, len(tokens), max_token_size - overlap_token_size)
-        ):
-            chunk_content = tokenizer.decode(tokens[start : start + max_token_size])
-            results.append(
-                {
-                    "tokens": min(max_token_size, len(tokens) - start),
-                    "content": chunk_content.strip(),
-                    "chunk_order_index": index,
-                }
-            )
-    return results
+    return list(
+        iter_chunks_by_token_size(
+            tokenizer,
+            content,
+            split_by_character,
+            split_by_character_only,
+            overlap_token_size,
+            max_token_size,
+        )
+    )
+
 
 def chunking_by_token_size(
     tokenizer: Tokenizer,
@@ -101,48 +150,13 @@ def chunking_by_token_size(
     overlap_token_size: int = 128,
     max_token_size: int = 1024,
 ) -> list[dict[str, Any]]:
-    tokens = tokenizer.encode(content)
-    results: list[dict[str, Any]] = []
-    if split_by_character:
-        raw_chunks = content.split(split_by_character)
-        new_chunks = []
-        if split_by_character_only:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                new_chunks.append((len(_tokens), chunk))
-        else:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                if len(_tokens) > max_token_size:
-                    for start in range(
-                        0, len(_tokens), max_token_size - overlap_token_size
-                    ):
-                        chunk_content = tokenizer.decode(
-                            _tokens[start : start + max_token_size]
-                        )
-                        new_chunks.append(
-                            (min(max_token_size, len(_tokens) - start), chunk_content)
-                        )
-                else:
-                    new_chunks.append((len(_tokens), chunk))
-        for index, (_len, chunk) in enumerate(new_chunks):
-            results.append(
-                {
-                    "tokens": _len,
-                    "content": chunk.strip(),
-                    "chunk_order_index": index,
-                }
-            )
-    else:
-        for index, start in enumerate(
-            range(0, len(tokens), max_token_size - overlap_token_size)
-        ):
-            chunk_content = tokenizer.decode(tokens[start : start + max_token_size])
-            results.append(
-                {
-                    "tokens": min(max_token_size, len(tokens) - start),
-                    "content": chunk_content.strip(),
-                    "chunk_order_index": index,
-                }
-            )
-    return results
+    return list(
+        iter_chunks_by_token_size(
+            tokenizer,
+            content,
+            split_by_character,
+            split_by_character_only,
+            overlap_token_size,
+            max_token_size,
+        )
+    )
@@ -22,10 +22,15 @@ DEFAULT_HISTORY_TURNS = 0
 DEFAULT_ENABLE_RERANK = True
 DEFAULT_COSINE_THRESHOLD = 0.2
 DEFAULT_RELATED_CHUNK_NUMBER = 10
+DEFAULT_KV_GET_BATCH_SIZE = 500  # Max ids per get_by_ids call when fetching chunks
+DEFAULT_TOKEN_COUNT_CACHE_SIZE = 8192  # Max cached token counts per tokenizer
 
 # Separator for graph fields
 GRAPH_FIELD_SEP = "<SEP>"
 
+# full_docs record marking that doc status records no longer carry content
+DOC_STATUS_CONTENT_MIGRATED_KEY = "__doc_status_content_migrated__"
+
 # Logging configuration defaults
 DEFAULT_LOG_MAX_BYTES = 10485760  # Default 10MB
 DEFAULT_LOG_BACKUP_COUNT = 5  # Default 5 backups
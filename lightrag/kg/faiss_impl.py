@@ -1,4 +1,5 @@
 import os
+import glob
 import time
 import asyncio
 from typing import Any, final
@@ -15,9 +16,19 @@ from .shared_storage import (
     set_all_update_flags,
 )
 
+import pipmaster as pm
+
+if not pm.is_installed("msgpack"):
+    pm.install("msgpack")
+
+import msgpack  # type: ignore
+
 # You must manually install faiss-cpu or faiss-gpu before using FAISS vector db
 import faiss  # type: ignore
 
+# Faiss ids per on-disk segment; only segments touched since the last save are rewritten
+SEGMENT_SIZE = 65536
+
 
 @final
 @dataclass
@@ -51,19 +62,30 @@ class FaissVectorDBStorage(BaseVectorStorage):
             self._faiss_index_file = os.path.join(
                 working_dir, f"faiss_index_{self.namespace}.index"
             )
+        # Legacy layout: faiss index file + JSON metadata
         self._meta_file = self._faiss_index_file + ".meta.json"
+        # Segmented layout: per segment sorted ids (.npy), float32 vectors (.npy)
+        # and metadata (msgpack), tied together by a small manifest
+        self._manifest_file = self._faiss_index_file + ".manifest.json"
 
         self._max_batch_size = self.global_config["embedding_batch_num"]
         # Embedding dimension (e.g. 768) must match your embedding function
         self._dim = self.embedding_func.embedding_dim
 
         # Create an empty Faiss index for inner product (useful for normalized vectors = cosine similarity).
-        # If you have a large number of vectors, you might want IVF or other indexes.
-        # For demonstration, we use a simple IndexFlatIP.
-        self._index = faiss.IndexFlatIP(self._dim)
+        # The flat index keeps all vectors in one contiguous float32 buffer, and the
+        # IndexIDMap2 wrapper gives every vector a stable id so it can be removed
+        # (and reconstructed) without rebuilding the index.
+        self._index = self._new_index()
         # Keep a local store for metadata, IDs, etc.
         # Maps <int faiss_id> → metadata (including your original ID).
         self._id_to_meta = {}
+        # Maps your original ID → <int faiss_id>
+        self._custom_id_to_fid = {}
+        self._next_fid = 0
+        # Maps segment number → faiss ids it holds, and segments changed since the last save
+        self._segments: dict[int, set[int]] = {}
+        self._dirty_segments: set[int] = set()
 
         self._load_faiss_index()
 
@@ -84,8 +106,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
                     f"Process {os.getpid()} FAISS reloading {self.namespace} due to update by another process"
                 )
                 # Reload data
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset()
                 self._load_faiss_index()
                 self.storage_updated.value = False
             return self._index
@@ -149,7 +170,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
         # 2. Remove them
         # 3. Add the new vectors
         existing_ids_to_remove = []
-        for meta, emb in zip(list_data, embeddings):
+        for meta in list_data:
             faiss_internal_id = self._find_faiss_id_by_custom_id(meta["__id__"])
             if faiss_internal_id is not None:
                 existing_ids_to_remove.append(faiss_internal_id)
@@ -157,17 +178,19 @@ class FaissVectorDBStorage(BaseVectorStorage):
         if existing_ids_to_remove:
             await self._remove_faiss_ids(existing_ids_to_remove)
 
-        # Step 2: Add new vectors
+        # Step 2: Add new vectors under fresh ids
         index = await self._get_index()
-        start_idx = index.ntotal
-        index.add(embeddings)
+        fids = np.arange(
+            self._next_fid, self._next_fid + len(list_data), dtype=np.int64
+        )
+        self._next_fid += len(list_data)
+        index.add_with_ids(embeddings, fids)
 
-        # Step 3: Store metadata + vector for each new ID
-        for i, meta in enumerate(list_data):
-            fid = start_idx + i
-            # Store the raw vector so we can rebuild if something is removed
-            meta["__vector__"] = embeddings[i].tolist()
-            self._id_to_meta.update({fid: meta})
+        # Step 3: Store metadata for each new ID, the vector lives in the index
+        for fid, meta in zip(fids.tolist(), list_data):
+            self._id_to_meta[fid] = meta
+            self._custom_id_to_fid[meta["__id__"]] = fid
+            self._track_fid(fid)
 
         logger.debug(f"Upserted {len(list_data)} vectors into Faiss index.")
         return [m["__id__"] for m in list_data]
@@ -202,7 +225,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
             if dist < self.cosine_better_than_threshold:
                 continue
 
-            meta = self._id_to_meta.get(idx, {})
+            meta = self._id_to_meta.get(int(idx), {})
             results.append(
                 {
                     **meta,
@@ -274,86 +297,177 @@ class FaissVectorDBStorage(BaseVectorStorage):
     # Internal helper methods
     # --------------------------------------------------------------------------------
 
+    def _new_index(self):
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(self._dim))
+
+    def _reset(self):
+        self._index = self._new_index()
+        self._id_to_meta = {}
+        self._custom_id_to_fid = {}
+        self._next_fid = 0
+        self._segments = {}
+        self._dirty_segments = set()
+
+    def _track_fid(self, fid: int, removed: bool = False):
+        seg = fid // SEGMENT_SIZE
+        if removed:
+            self._segments.get(seg, set()).discard(fid)
+        else:
+            self._segments.setdefault(seg, set()).add(fid)
+        self._dirty_segments.add(seg)
+
+    def _segment_file(self, seg: int, kind: str) -> str:
+        return f"{self._faiss_index_file}.seg{seg:05d}.{kind}"
+
     def _find_faiss_id_by_custom_id(self, custom_id: str):
         """
         Return the Faiss internal ID for a given custom ID, or None if not found.
         """
-        for fid, meta in self._id_to_meta.items():
-            if meta.get("__id__") == custom_id:
-                return fid
-        return None
+        return self._custom_id_to_fid.get(custom_id)
 
     async def _remove_faiss_ids(self, fid_list):
         """
         Remove a list of internal Faiss IDs from the index.
-        Because IndexFlatIP doesn't support 'removals',
-        we rebuild the index excluding those vectors.
+        The IndexIDMap2 removes them in place, no rebuild is needed.
         """
-        keep_fids = [fid for fid in self._id_to_meta if fid not in fid_list]
-
-        # Rebuild the index
-        vectors_to_keep = []
-        new_id_to_meta = {}
-        for new_fid, old_fid in enumerate(keep_fids):
-            vec_meta = self._id_to_meta[old_fid]
-            vectors_to_keep.append(vec_meta["__vector__"])  # stored as list
-            new_id_to_meta[new_fid] = vec_meta
-
         async with self._storage_lock:
-            # Re-init index
-            self._index = faiss.IndexFlatIP(self._dim)
-            if vectors_to_keep:
-                arr = np.array(vectors_to_keep, dtype=np.float32)
-                self._index.add(arr)
-
-            self._id_to_meta = new_id_to_meta
+            self._index.remove_ids(np.asarray(fid_list, dtype=np.int64))
+            for fid in fid_list:
+                meta = self._id_to_meta.pop(fid, None)
+                if meta is not None:
+                    self._custom_id_to_fid.pop(meta.get("__id__"), None)
+                    self._track_fid(fid, removed=True)
+
+    @staticmethod
+    def _write_atomic(path: str, write) -> None:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
 
     def _save_faiss_index(self):
         """
-        Save the current Faiss index + metadata to disk so it can persist across runs.
+        Save the segments changed since the last save, then the manifest.
+        Untouched segments are left as they are on disk.
         """
-        faiss.write_index(self._index, self._faiss_index_file)
+        for seg in sorted(self._dirty_segments):
+            fids = self._segments.get(seg)
+            if not fids:
+                self._segments.pop(seg, None)
+                for kind in ("ids.npy", "vectors.npy", "meta.msgpack"):
+                    path = self._segment_file(seg, kind)
+                    if os.path.exists(path):
+                        os.remove(path)
+                continue
 
-        # Save metadata dict to JSON. Convert all keys to strings for JSON storage.
-        # _id_to_meta is { int: { '__id__': doc_id, '__vector__': [float,...], ... } }
-        # We'll keep the int -> dict, but JSON requires string keys.
-        serializable_dict = {}
-        for fid, meta in self._id_to_meta.items():
-            serializable_dict[str(fid)] = meta
+            ids = np.array(sorted(fids), dtype=np.int64)
+            vectors = np.ascontiguousarray(
+                self._index.reconstruct_batch(ids), dtype=np.float32
+            )
+            metas = [self._id_to_meta[fid] for fid in ids.tolist()]
+            self._write_atomic(
+                self._segment_file(seg, "ids.npy"), lambda f: np.save(f, ids)
+            )
+            self._write_atomic(
+                self._segment_file(seg, "vectors.npy"), lambda f: np.save(f, vectors)
+            )
+            self._write_atomic(
+                self._segment_file(seg, "meta.msgpack"),
+                lambda f: f.write(msgpack.packb(metas, use_bin_type=True)),
+            )
+
+        manifest = {
+            "version": 1,
+            "dim": self._dim,
+            "segment_size": SEGMENT_SIZE,
+            "next_fid": self._next_fid,
+            "segments": sorted(self._segments),
+        }
+        self._write_atomic(
+            self._manifest_file,
+            lambda f: f.write(json.dumps(manifest).encode("utf-8")),
+        )
+        self._dirty_segments = set()
+
+        # Data now lives in segments, drop the legacy layout if it is still around
+        for path in (self._faiss_index_file, self._meta_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _load_segments(self):
+        with open(self._manifest_file, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest["segment_size"] != SEGMENT_SIZE:
+            raise ValueError(
+                f"segment size {manifest['segment_size']} does not match {SEGMENT_SIZE}"
+            )
 
-        with open(self._meta_file, "w", encoding="utf-8") as f:
-            json.dump(serializable_dict, f)
+        for seg in manifest["segments"]:
+            ids = np.load(self._segment_file(seg, "ids.npy"))
+            # add_with_ids copies the vectors into the index, read them in one pass
+            vectors = np.load(self._segment_file(seg, "vectors.npy"))
+            with open(self._segment_file(seg, "meta.msgpack"), "rb") as f:
+                metas = msgpack.unpackb(f.read(), raw=False)
+
+            self._index.add_with_ids(vectors, ids)
+            fids = ids.tolist()
+            for fid, meta in zip(fids, metas):
+                self._id_to_meta[fid] = meta
+                self._custom_id_to_fid[meta["__id__"]] = fid
+            self._segments[seg] = set(fids)
+        self._next_fid = manifest["next_fid"]
+
+    def _load_legacy_index(self):
+        # Load the Faiss index
+        index = faiss.read_index(self._faiss_index_file)
+        # Load metadata
+        with open(self._meta_file, "r", encoding="utf-8") as f:
+            stored_dict = json.load(f)
+
+        # Convert string keys back to int
+        for fid_str, meta in stored_dict.items():
+            fid = int(fid_str)
+            # Vectors were kept in the metadata by older versions
+            meta.pop("__vector__", None)
+            self._id_to_meta[fid] = meta
+            self._custom_id_to_fid[meta["__id__"]] = fid
+            self._track_fid(fid)
+        self._next_fid = max(self._id_to_meta, default=-1) + 1
+
+        if not isinstance(index, faiss.IndexIDMap2):
+            # Older files hold a bare IndexFlatIP whose ids are the row positions
+            id_map = self._new_index()
+            if index.ntotal:
+                id_map.add_with_ids(
+                    index.reconstruct_n(0, index.ntotal),
+                    np.arange(index.ntotal, dtype=np.int64),
+                )
+            index = id_map
+        self._index = index
 
     def _load_faiss_index(self):
         """
         Load the Faiss index + metadata from disk if it exists,
         and rebuild in-memory structures so we can query.
         """
-        if not os.path.exists(self._faiss_index_file):
+        if os.path.exists(self._manifest_file):
+            load, source = self._load_segments, self._manifest_file
+        elif os.path.exists(self._faiss_index_file):
+            # Every segment is dirty, so the next save converts to the new layout
+            load, source = self._load_legacy_index, self._faiss_index_file
+        else:
             logger.warning(f"No existing Faiss index file found for {self.namespace}")
             return
 
         try:
-            # Load the Faiss index
-            self._index = faiss.read_index(self._faiss_index_file)
-            # Load metadata
-            with open(self._meta_file, "r", encoding="utf-8") as f:
-                stored_dict = json.load(f)
-
-            # Convert string keys back to int
-            self._id_to_meta = {}
-            for fid_str, meta in stored_dict.items():
-                fid = int(fid_str)
-                self._id_to_meta[fid] = meta
-
+            load()
             logger.info(
-                f"Faiss index loaded with {self._index.ntotal} vectors from {self._faiss_index_file}"
+                f"Faiss index loaded with {self._index.ntotal} vectors from {source}"
             )
         except Exception as e:
             logger.error(f"Failed to load Faiss index or metadata: {e}")
             logger.warning("Starting with an empty Faiss index.")
-            self._index = faiss.IndexFlatIP(self._dim)
-            self._id_to_meta = {}
+            self._reset()
 
     async def index_done_callback(self) -> None:
         async with self._storage_lock:
@@ -363,8 +477,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 logger.warning(
                     f"Storage for FAISS {self.namespace} was updated by another process, reloading..."
                 )
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset()
                 self._load_faiss_index()
                 self.storage_updated.value = False
                 return False  # Return error
@@ -456,16 +569,18 @@ class FaissVectorDBStorage(BaseVectorStorage):
         try:
             async with self._storage_lock:
                 # Reset the index
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset()
 
                 # Remove storage files if they exist
-                if os.path.exists(self._faiss_index_file):
-                    os.remove(self._faiss_index_file)
-                if os.path.exists(self._meta_file):
-                    os.remove(self._meta_file)
+                for path in [
+                    self._faiss_index_file,
+                    self._meta_file,
+                    self._manifest_file,
+                    *glob.glob(glob.escape(self._faiss_index_file) + ".seg*"),
+                ]:
+                    if os.path.exists(path):
+                        os.remove(path)
 
-                self._id_to_meta = {}
                 self._load_faiss_index()
 
                 # Notify other processes
@@ -8,9 +8,8 @@ from lightrag.base import (
     DocStatusStorage,
 )
 from lightrag.utils import (
-    load_json,
+    JsonChangeLog,
     logger,
-    write_json,
 )
 from .shared_storage import (
     get_namespace_data,
@@ -45,6 +44,13 @@ class JsonDocStatusStorage(DocStatusStorage):
         self._data = None
         self._storage_lock = None
         self.storage_updated = None
+        self._change_log = JsonChangeLog(self._file_name)
+        # Per-process status -> doc ids index, rebuilt when another process
+        # changed the shared data since it was last synced
+        self._status_index: dict[str, set[str]] = {}
+        self._doc_status: dict[str, str] = {}
+        self._index_version = -1
+        self._index_meta = None
 
     async def initialize(self):
         """Initialize storage data"""
@@ -54,14 +60,70 @@ class JsonDocStatusStorage(DocStatusStorage):
             # check need_init must before get_namespace_data
             need_init = await try_initialize_namespace(self.namespace)
             self._data = await get_namespace_data(self.namespace)
+            self._index_meta = await get_namespace_data(
+                f"{self.namespace}_status_index"
+            )
             if need_init:
-                loaded_data = load_json(self._file_name) or {}
+                loaded_data = self._change_log.load()
                 async with self._storage_lock:
                     self._data.update(loaded_data)
+                    self._bump_index_version()
                     logger.info(
                         f"Process {os.getpid()} doc status load {self.namespace} with {len(loaded_data)} records"
                     )
 
+    def _bump_index_version(self) -> None:
+        """Mark the status index of all processes stale, caller must hold the storage lock"""
+        self._index_meta["version"] = self._index_meta.get("version", 0) + 1
+
+    def _sync_index(self) -> None:
+        """Rebuild the status index if the shared data changed, caller must hold the storage lock"""
+        version = self._index_meta.get("version", 0)
+        if self._index_version == version:
+            return
+        self._status_index = {status.value: set() for status in DocStatus}
+        self._doc_status = {}
+        for doc_id, doc in self._data.items():
+            self._index_doc(doc_id, doc.get("status"))
+        self._index_version = version
+
+    def _index_doc(self, doc_id: str, status: str | None) -> None:
+        old_status = self._doc_status.pop(doc_id, None)
+        if old_status is not None:
+            self._status_index[old_status].discard(doc_id)
+        if status is not None:
+            self._status_index.setdefault(status, set()).add(doc_id)
+            self._doc_status[doc_id] = status
+
+    def _update_index(self, changes: dict[str, str | None]) -> None:
+        """Apply local changes (doc id -> new status, None if deleted) to the index
+
+        Caller must hold the storage lock. If the index was already stale it is
+        rebuilt lazily on the next read instead.
+        """
+        in_sync = self._index_version == self._index_meta.get("version", 0)
+        self._bump_index_version()
+        if in_sync:
+            for doc_id, status in changes.items():
+                self._index_doc(doc_id, status)
+            self._index_version = self._index_meta["version"]
+
+    def _to_doc_status(
+        self, doc_id: str, doc: dict[str, Any], include_content: bool
+    ) -> DocProcessingStatus | None:
+        try:
+            # Make a copy of the data to avoid modifying the original
+            data = doc.copy()
+            if not include_content:
+                data.pop("content", None)
+            # If file_path is not in data, use document id as file path
+            if "file_path" not in data:
+                data["file_path"] = "no-file-path"
+            return DocProcessingStatus(**data)
+        except (KeyError, TypeError) as e:
+            logger.error(f"Missing required field for document {doc_id}: {e}")
+            return None
+
     async def filter_keys(self, keys: set[str]) -> set[str]:
         """Return keys that should be processed (not in storage or not successfully processed)"""
         async with self._storage_lock:
@@ -80,49 +142,78 @@ class JsonDocStatusStorage(DocStatusStorage):
         """Get counts of documents in each status"""
         counts = {status.value: 0 for status in DocStatus}
         async with self._storage_lock:
-            for doc in self._data.values():
-                counts[doc["status"]] += 1
+            self._sync_index()
+            for status, doc_ids in self._status_index.items():
+                counts[status] = len(doc_ids)
         return counts
 
+    async def get_doc_ids_by_status(self, status: DocStatus) -> list[str]:
+        """Get the ids of all documents with a specific status"""
+        async with self._storage_lock:
+            self._sync_index()
+            return list(self._status_index.get(status.value, ()))
+
     async def get_docs_by_status(
         self, status: DocStatus
     ) -> dict[str, DocProcessingStatus]:
         """Get all documents with a specific status"""
         result = {}
         async with self._storage_lock:
-            for k, v in self._data.items():
-                if v["status"] == status.value:
-                    try:
-                        # Make a copy of the data to avoid modifying the original
-                        data = v.copy()
-                        # If content is missing, use content_summary as content
-                        if "content" not in data and "content_summary" in data:
-                            data["content"] = data["content_summary"]
-                        # If file_path is not in data, use document id as file path
-                        if "file_path" not in data:
-                            data["file_path"] = "no-file-path"
-                        result[k] = DocProcessingStatus(**data)
-                    except KeyError as e:
-                        logger.error(f"Missing required field for document {k}: {e}")
-                        continue
+            self._sync_index()
+            for doc_id in self._status_index.get(status.value, ()):
+                doc = self._to_doc_status(doc_id, self._data[doc_id], True)
+                if doc is not None:
+                    result[doc_id] = doc
         return result
 
+    async def get_docs_paginated(
+        self,
+        status: DocStatus | None = None,
+        page: int = 1,
+        page_size: int | None = 50,
+    ) -> tuple[dict[str, DocProcessingStatus], int]:
+        """Get one page of documents without their content, newest first"""
+        async with self._storage_lock:
+            self._sync_index()
+            if status is not None:
+                doc_ids = list(self._status_index.get(status.value, ()))
+            else:
+                doc_ids = list(self._doc_status)
+            doc_ids.sort(
+                key=lambda doc_id: self._data[doc_id].get("updated_at") or "",
+                reverse=True,
+            )
+            total = len(doc_ids)
+            if page_size is not None:
+                start = (max(page, 1) - 1) * page_size
+                doc_ids = doc_ids[start : start + page_size]
+            result = {}
+            for doc_id in doc_ids:
+                doc = self._to_doc_status(doc_id, self._data[doc_id], False)
+                if doc is not None:
+                    result[doc_id] = doc
+        return result, total
+
     async def index_done_callback(self) -> None:
+        """Changes are already in the change log; compact it once it grows too large"""
+        snapshot = None
         async with self._storage_lock:
             if self.storage_updated.value:
-                data_dict = (
-                    dict(self._data) if hasattr(self._data, "_getvalue") else self._data
-                )
-                logger.debug(
-                    f"Process {os.getpid()} doc status writting {len(data_dict)} records to {self.namespace}"
-                )
-                write_json(data_dict, self._file_name)
+                if self._change_log.needs_compaction():
+                    snapshot = dict(self._data)
+                    self._change_log.rotate()
+                    logger.debug(
+                        f"Process {os.getpid()} doc status compacting {len(snapshot)} records of {self.namespace}"
+                    )
                 await clear_all_update_flags(self.namespace)
 
+        if snapshot is not None:
+            self._change_log.compact_in_background(snapshot)
+
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         """
         Importance notes for in-memory storage:
-        1. Changes will be persisted to disk during the next index_done_callback
+        1. Changes are appended to the change log immediately, index_done_callback compacts it
         2. update flags to notify other processes that data persistence is needed
         """
         if not data:
@@ -133,7 +224,12 @@ class JsonDocStatusStorage(DocStatusStorage):
             for doc_id, doc_data in data.items():
                 if "chunks_list" not in doc_data:
                     doc_data["chunks_list"] = []
+            record = self._change_log.encode_upsert(data)
             self._data.update(data)
+            self._update_index(
+                {doc_id: doc_data.get("status") for doc_id, doc_data in data.items()}
+            )
+            self._change_log.append(record)
             await set_all_update_flags(self.namespace)
 
         await self.index_done_callback()
@@ -156,13 +252,15 @@ class JsonDocStatusStorage(DocStatusStorage):
             None
         """
         async with self._storage_lock:
-            any_deleted = False
-            for doc_id in doc_ids:
-                result = self._data.pop(doc_id, None)
-                if result is not None:
-                    any_deleted = True
+            deleted_ids = [
+                doc_id
+                for doc_id in doc_ids
+                if self._data.pop(doc_id, None) is not None
+            ]
 
-            if any_deleted:
+            if deleted_ids:
+                self._update_index(dict.fromkeys(deleted_ids))
+                self._change_log.append_delete(deleted_ids)
                 await set_all_update_flags(self.namespace)
 
     async def drop(self) -> dict[str, str]:
@@ -171,7 +269,7 @@ class JsonDocStatusStorage(DocStatusStorage):
         This method will:
         1. Clear all document status data from memory
         2. Update flags to notify other processes
-        3. Trigger index_done_callback to save the empty state
+        3. Write the empty snapshot and discard the change log
 
         Returns:
             dict[str, str]: Operation status and message
@@ -179,8 +277,11 @@ class JsonDocStatusStorage(DocStatusStorage):
             - On failure: {"status": "error", "message": "<error details>"}
         """
         try:
+            await self._change_log.wait()
             async with self._storage_lock:
                 self._data.clear()
+                self._bump_index_version()
+                self._change_log.reset({})
                 await set_all_update_flags(self.namespace)
 
             await self.index_done_callback()
@@ -189,3 +290,7 @@ class JsonDocStatusStorage(DocStatusStorage):
         except Exception as e:
             logger.error(f"Error dropping {self.namespace}: {e}")
             return {"status": "error", "message": str(e)}
+
+    async def finalize(self):
+        """Wait for a running change log compaction before exiting"""
+        await self._change_log.wait()
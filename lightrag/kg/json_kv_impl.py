@@ -6,9 +6,8 @@ from lightrag.base import (
     BaseKVStorage,
 )
 from lightrag.utils import (
-    load_json,
+    JsonChangeLog,
     logger,
-    write_json,
 )
 from .shared_storage import (
     get_namespace_data,
@@ -41,6 +40,7 @@ class JsonKVStorage(BaseKVStorage):
         self._data = None
         self._storage_lock = None
         self.storage_updated = None
+        self._change_log = JsonChangeLog(self._file_name)
 
     async def initialize(self):
         """Initialize storage data"""
@@ -51,7 +51,7 @@ class JsonKVStorage(BaseKVStorage):
             need_init = await try_initialize_namespace(self.namespace)
             self._data = await get_namespace_data(self.namespace)
             if need_init:
-                loaded_data = load_json(self._file_name) or {}
+                loaded_data = self._change_log.load()
                 async with self._storage_lock:
                     # Migrate legacy cache structure if needed
                     if self.namespace.endswith("_cache"):
@@ -67,21 +67,21 @@ class JsonKVStorage(BaseKVStorage):
                     )
 
     async def index_done_callback(self) -> None:
+        """Changes are already in the change log; compact it once it grows too large"""
+        snapshot = None
         async with self._storage_lock:
             if self.storage_updated.value:
-                data_dict = (
-                    dict(self._data) if hasattr(self._data, "_getvalue") else self._data
-                )
-
-                # Calculate data count - all data is now flattened
-                data_count = len(data_dict)
-
-                logger.debug(
-                    f"Process {os.getpid()} KV writting {data_count} records to {self.namespace}"
-                )
-                write_json(data_dict, self._file_name)
+                if self._change_log.needs_compaction():
+                    snapshot = dict(self._data)
+                    self._change_log.rotate()
+                    logger.debug(
+                        f"Process {os.getpid()} KV compacting {len(snapshot)} records of {self.namespace}"
+                    )
                 await clear_all_update_flags(self.namespace)
 
+        if snapshot is not None:
+            self._change_log.compact_in_background(snapshot)
+
     async def get_all(self) -> dict[str, Any]:
         """Get all data from storage
 
@@ -140,7 +140,7 @@ class JsonKVStorage(BaseKVStorage):
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         """
         Importance notes for in-memory storage:
-        1. Changes will be persisted to disk during the next index_done_callback
+        1. Changes are appended to the change log immediately, index_done_callback compacts it
         2. update flags to notify other processes that data persistence is needed
         """
         if not data:
@@ -168,7 +168,9 @@ class JsonKVStorage(BaseKVStorage):
 
                 v["_id"] = k
 
+            record = self._change_log.encode_upsert(data)
             self._data.update(data)
+            self._change_log.append(record)
             await set_all_update_flags(self.namespace)
 
     async def delete(self, ids: list[str]) -> None:
@@ -185,13 +187,12 @@ class JsonKVStorage(BaseKVStorage):
             None
         """
         async with self._storage_lock:
-            any_deleted = False
-            for doc_id in ids:
-                result = self._data.pop(doc_id, None)
-                if result is not None:
-                    any_deleted = True
+            deleted_ids = [
+                doc_id for doc_id in ids if self._data.pop(doc_id, None) is not None
+            ]
 
-            if any_deleted:
+            if deleted_ids:
+                self._change_log.append_delete(deleted_ids)
                 await set_all_update_flags(self.namespace)
 
     async def drop_cache_by_modes(self, modes: list[str] | None = None) -> bool:
@@ -227,6 +228,7 @@ class JsonKVStorage(BaseKVStorage):
                     self._data.pop(key, None)
 
                 if keys_to_delete:
+                    self._change_log.append_delete(keys_to_delete)
                     await set_all_update_flags(self.namespace)
                     logger.info(
                         f"Dropped {len(keys_to_delete)} cache entries for modes: {modes}"
@@ -291,7 +293,7 @@ class JsonKVStorage(BaseKVStorage):
         This method will:
         1. Clear all data from memory
         2. Update flags to notify other processes
-        3. Trigger index_done_callback to save the empty state
+        3. Write the empty snapshot and discard the change log
 
         Returns:
             dict[str, str]: Operation status and message
@@ -299,8 +301,10 @@ class JsonKVStorage(BaseKVStorage):
             - On failure: {"status": "error", "message": "<error details>"}
         """
         try:
+            await self._change_log.wait()
             async with self._storage_lock:
                 self._data.clear()
+                self._change_log.reset({})
                 await set_all_update_flags(self.namespace)
 
             await self.index_done_callback()
@@ -354,8 +358,8 @@ class JsonKVStorage(BaseKVStorage):
             logger.info(
                 f"Migrated {migration_count} legacy cache entries to flattened structure"
             )
-            # Persist migrated data immediately
-            write_json(migrated_data, self._file_name)
+            # Persist migrated data immediately, it supersedes any change log
+            self._change_log.reset(migrated_data)
 
         return migrated_data
 
@@ -365,3 +369,4 @@ class JsonKVStorage(BaseKVStorage):
         """
         if self.namespace.endswith("_cache"):
             await self.index_done_callback()
+        await self._change_log.wait()
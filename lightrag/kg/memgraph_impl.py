@@ -753,6 +753,225 @@ class MemgraphStorage(BaseGraphStorage):
         degrees = int(src_degree) + int(trg_degree)
         return degrees
 
+    async def get_nodes_batch(self, node_ids: list[str]) -> dict[str, dict]:
+        """
+        Retrieve multiple nodes in one query using UNWIND.
+
+        Args:
+            node_ids: List of node entity IDs to fetch.
+
+        Returns:
+            A dictionary mapping each found node_id to its node properties.
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        if not node_ids:
+            return {}
+        workspace_label = self._get_workspace_label()
+        async with self._driver.session(
+            database=self._DATABASE, default_access_mode="READ"
+        ) as session:
+            query = f"""
+            UNWIND $node_ids AS id
+            MATCH (n:`{workspace_label}` {{entity_id: id}})
+            RETURN n.entity_id AS entity_id, n
+            """
+            result = await session.run(query, node_ids=node_ids)
+            try:
+                nodes = {}
+                async for record in result:
+                    entity_id = record["entity_id"]
+                    if entity_id in nodes:
+                        logger.warning(
+                            f"Multiple nodes found with label '{entity_id}'. Using first node."
+                        )
+                        continue
+                    node_dict = dict(record["n"])
+                    # Remove workspace label from labels list if it exists
+                    if "labels" in node_dict:
+                        node_dict["labels"] = [
+                            label
+                            for label in node_dict["labels"]
+                            if label != workspace_label
+                        ]
+                    nodes[entity_id] = node_dict
+                return nodes
+            finally:
+                await result.consume()  # Ensure result is fully consumed
+
+    async def node_degrees_batch(self, node_ids: list[str]) -> dict[str, int]:
+        """
+        Retrieve the degree for multiple nodes in a single query using UNWIND.
+
+        Args:
+            node_ids: List of node labels (entity_id values) to look up.
+
+        Returns:
+            A dictionary mapping each node_id to its degree (number of relationships).
+            If a node is not found, its degree will be set to 0.
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        if not node_ids:
+            return {}
+        workspace_label = self._get_workspace_label()
+        async with self._driver.session(
+            database=self._DATABASE, default_access_mode="READ"
+        ) as session:
+            query = f"""
+                UNWIND $node_ids AS id
+                MATCH (n:`{workspace_label}` {{entity_id: id}})
+                OPTIONAL MATCH (n)-[r]-()
+                RETURN id AS entity_id, COUNT(r) AS degree
+            """
+            result = await session.run(query, node_ids=node_ids)
+            try:
+                degrees = {}
+                async for record in result:
+                    degrees[record["entity_id"]] = record["degree"]
+            finally:
+                await result.consume()  # Ensure result is fully consumed
+
+        # For any node_id that did not return a record, set degree to 0.
+        for node_id in node_ids:
+            if node_id not in degrees:
+                logger.warning(f"No node found with label '{node_id}'")
+                degrees[node_id] = 0
+        return degrees
+
+    async def edge_degrees_batch(
+        self, edge_pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], int]:
+        """
+        Calculate the combined degree for each edge (sum of the source and target node degrees)
+        in batch using node_degrees_batch.
+
+        Args:
+            edge_pairs: List of (src, tgt) tuples.
+
+        Returns:
+            A dictionary mapping each (src, tgt) tuple to the sum of their degrees.
+        """
+        # Collect unique node IDs from all edge pairs.
+        unique_node_ids = {src for src, _ in edge_pairs}
+        unique_node_ids.update(tgt for _, tgt in edge_pairs)
+
+        # Get degrees for all nodes in one go.
+        degrees = await self.node_degrees_batch(list(unique_node_ids))
+
+        return {
+            (src, tgt): degrees.get(src, 0) + degrees.get(tgt, 0)
+            for src, tgt in edge_pairs
+        }
+
+    async def get_edges_batch(
+        self, pairs: list[dict[str, str]]
+    ) -> dict[tuple[str, str], dict]:
+        """
+        Retrieve edge properties for multiple (src, tgt) pairs in one query.
+
+        Args:
+            pairs: List of dictionaries, e.g. [{"src": "node1", "tgt": "node2"}, ...]
+
+        Returns:
+            A dictionary mapping (src, tgt) tuples of existing edges to their properties.
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        if not pairs:
+            return {}
+        workspace_label = self._get_workspace_label()
+        async with self._driver.session(
+            database=self._DATABASE, default_access_mode="READ"
+        ) as session:
+            query = f"""
+            UNWIND $pairs AS pair
+            MATCH (start:`{workspace_label}` {{entity_id: pair.src}})-[r]-(end:`{workspace_label}` {{entity_id: pair.tgt}})
+            RETURN pair.src AS src_id, pair.tgt AS tgt_id, collect(properties(r)) AS edges
+            """
+            result = await session.run(query, pairs=pairs)
+            try:
+                edges_dict = {}
+                async for record in result:
+                    edges = record["edges"]
+                    if not edges:
+                        continue
+                    src = record["src_id"]
+                    tgt = record["tgt_id"]
+                    edge_props = dict(edges[0])  # choose the first if multiple exist
+                    for key, default_value in {
+                        "weight": 1.0,
+                        "source_id": None,
+                        "description": None,
+                        "keywords": None,
+                    }.items():
+                        if key not in edge_props:
+                            edge_props[key] = default_value
+                            logger.warning(
+                                f"Edge between {src} and {tgt} is missing property: {key}. Using default value: {default_value}"
+                            )
+                    edges_dict[(src, tgt)] = edge_props
+                return edges_dict
+            finally:
+                await result.consume()  # Ensure result is fully consumed
+
+    async def get_nodes_edges_batch(
+        self, node_ids: list[str]
+    ) -> dict[str, list[tuple[str, str]]]:
+        """
+        Batch retrieve edges for multiple nodes in one query using UNWIND.
+        Edges are returned the same way as get_node_edges: (queried_node, connected_node)
+        for both outgoing and incoming relationships.
+
+        Args:
+            node_ids: List of node IDs (entity_id) for which to retrieve edges.
+
+        Returns:
+            A dictionary mapping each node ID to its list of (queried_node, connected_node) tuples.
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        # Initialize the dictionary with empty lists for each node ID
+        edges_dict = {node_id: [] for node_id in node_ids}
+        if not node_ids:
+            return edges_dict
+        workspace_label = self._get_workspace_label()
+        async with self._driver.session(
+            database=self._DATABASE, default_access_mode="READ"
+        ) as session:
+            query = f"""
+                UNWIND $node_ids AS id
+                MATCH (n:`{workspace_label}` {{entity_id: id}})
+                OPTIONAL MATCH (n)-[r]-(connected:`{workspace_label}`)
+                WHERE connected.entity_id IS NOT NULL
+                RETURN id AS queried_id, n.entity_id AS node_entity_id,
+                       connected.entity_id AS connected_entity_id
+            """
+            result = await session.run(query, node_ids=node_ids)
+            try:
+                async for record in result:
+                    node_entity_id = record["node_entity_id"]
+                    connected_entity_id = record["connected_entity_id"]
+
+                    # Skip nodes without edges
+                    if not node_entity_id or not connected_entity_id:
+                        continue
+
+                    edges_dict[record["queried_id"]].append(
+                        (node_entity_id, connected_entity_id)
+                    )
+                return edges_dict
+            finally:
+                await result.consume()  # Ensure result is fully consumed
+
     async def get_nodes_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
         """Get all nodes that are associated with the given chunk_ids.
 
@@ -137,13 +137,15 @@ class MongoKVStorage(BaseKVStorage):
         return doc
 
     async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        """Get values by ids in one query, aligned with ids (None for missing ids)"""
         cursor = self._data.find({"_id": {"$in": ids}})
-        docs = await cursor.to_list()
-        # Ensure time fields are present for all documents
-        for doc in docs:
+        docs_by_id = {}
+        async for doc in cursor:
+            # Ensure time fields are present for all documents
             doc.setdefault("create_time", 0)
             doc.setdefault("update_time", 0)
-        return docs
+            docs_by_id[doc["_id"]] = doc
+        return [docs_by_id.get(id) for id in ids]
 
     async def filter_keys(self, keys: set[str]) -> set[str]:
         cursor = self._data.find({"_id": {"$in": list(keys)}}, {"_id": 1})
@@ -374,7 +376,7 @@ class MongoDocStatusStorage(DocStatusStorage):
         result = await cursor.to_list()
         return {
             doc["_id"]: DocProcessingStatus(
-                content=doc["content"],
+                content=doc.get("content"),
                 content_summary=doc.get("content_summary"),
                 content_length=doc["content_length"],
                 status=doc["status"],
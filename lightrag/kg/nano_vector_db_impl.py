@@ -1,5 +1,6 @@
 import asyncio
 import os
+from collections import defaultdict
 from typing import Any, final
 from dataclasses import dataclass
 import numpy as np
@@ -8,7 +9,9 @@ import time
 from lightrag.utils import (
     logger,
     compute_mdhash_id,
+    split_string_by_multi_markers,
 )
+from lightrag.constants import GRAPH_FIELD_SEP
 import pipmaster as pm
 from lightrag.base import BaseVectorStorage
 
@@ -22,6 +25,126 @@ from .shared_storage import (
     set_all_update_flags,
 )
 
+# Rows scored per block when the search matrix is stored as float16
+SEARCH_BLOCK_ROWS = 65536
+# Max number of cached id filter masks per storage
+MAX_CACHED_FILTER_MASKS = 32
+# Background snapshot builds to retry before building on the event loop
+MAX_SEARCH_INDEX_BUILD_ATTEMPTS = 3
+
+
+@dataclass
+class _SearchIndex:
+    """Immutable snapshot of a NanoVectorDB used for searching off the event loop
+
+    matrix holds the L2-normalized vectors (rows aligned with data) and filter_rows
+    maps a record id, full_doc_id or source chunk id to the rows it selects.
+    """
+
+    matrix: np.ndarray
+    data: list[dict[str, Any]]
+    filter_rows: dict[str, list[int]]
+
+    @classmethod
+    def build(cls, storage: dict[str, Any], dtype: np.dtype) -> "_SearchIndex":
+        data = list(storage["data"])
+        matrix = np.array(storage["matrix"], dtype=dtype, order="C", copy=True)
+        filter_rows = defaultdict(list)
+        for row, dp in enumerate(data):
+            keys = {dp["__id__"]}
+            if dp.get("full_doc_id"):
+                keys.add(dp["full_doc_id"])
+            if dp.get("source_id"):
+                keys.update(
+                    split_string_by_multi_markers(dp["source_id"], [GRAPH_FIELD_SEP])
+                )
+            for key in keys:
+                filter_rows[key].append(row)
+        return cls(matrix, data, dict(filter_rows))
+
+    def filter_mask(self, ids: list[str]) -> np.ndarray:
+        """Boolean row mask selecting rows whose id, document or chunk is in ids"""
+        mask = np.zeros(len(self.data), dtype=bool)
+        for key in ids:
+            rows = self.filter_rows.get(key)
+            if rows:
+                mask[rows] = True
+        return mask
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        better_than_threshold: float | None,
+        mask: np.ndarray | None = None,
+    ) -> list[dict[str, Any]]:
+        """Brute-force cosine search returning the top_k rows above the threshold"""
+        if mask is None:
+            rows = None
+            matrix = self.matrix
+        else:
+            rows = np.flatnonzero(mask)
+            matrix = self.matrix[rows]
+        if top_k <= 0 or len(matrix) == 0:
+            return []
+
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        query = query / np.linalg.norm(query)
+        if matrix.dtype == np.float32:
+            scores = matrix @ query
+        else:
+            # float16 matmul has no BLAS path, score in float32 blocks instead
+            scores = np.empty(len(matrix), dtype=np.float32)
+            for start in range(0, len(matrix), SEARCH_BLOCK_ROWS):
+                block = matrix[start : start + SEARCH_BLOCK_ROWS]
+                scores[start : start + len(block)] = block.astype(np.float32) @ query
+
+        candidates = np.arange(len(scores))
+        if better_than_threshold is not None:
+            candidates = np.flatnonzero(scores >= better_than_threshold)
+        if len(candidates) > top_k:
+            top = np.argpartition(scores[candidates], -top_k)[-top_k:]
+            candidates = candidates[top]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        results = []
+        for i in candidates:
+            row = i if rows is None else rows[i]
+            results.append({**self.data[row], "__metrics__": float(scores[i])})
+        return results
+
+
+class _RelationIndex:
+    """Entity name -> ids of the relations it takes part in
+
+    Built from the record metadata only and kept up to date on upsert and delete,
+    so deleting the relations of an entity needs no search snapshot.
+    """
+
+    def __init__(self, data: list[dict[str, Any]]):
+        self.relation_ids: dict[str, set[str]] = defaultdict(set)
+        self._endpoints: dict[str, tuple[str, ...]] = {}
+        for dp in data:
+            self.add(dp)
+
+    def add(self, dp: dict[str, Any]) -> None:
+        self.remove(dp["__id__"])
+        endpoints = tuple(
+            name for name in (dp.get("src_id"), dp.get("tgt_id")) if name is not None
+        )
+        if endpoints:
+            self._endpoints[dp["__id__"]] = endpoints
+            for name in endpoints:
+                self.relation_ids[name].add(dp["__id__"])
+
+    def remove(self, id: str) -> None:
+        for name in self._endpoints.pop(id, ()):
+            ids = self.relation_ids.get(name)
+            if ids is not None:
+                ids.discard(id)
+                if not ids:
+                    del self.relation_ids[name]
+
 
 @final
 @dataclass
@@ -40,6 +163,17 @@ class NanoVectorDBStorage(BaseVectorStorage):
                 "cosine_better_than_threshold must be specified in vector_db_storage_cls_kwargs"
             )
         self.cosine_better_than_threshold = cosine_threshold
+        # float16 halves search memory at a small precision cost
+        self._search_dtype = np.dtype(kwargs.get("search_dtype", "float32"))
+        if self._search_dtype not in (np.float32, np.float16):
+            raise ValueError("search_dtype must be float32 or float16")
+        self._search_index: _SearchIndex | None = None
+        # Bumped on every data change, a snapshot built across a change is discarded
+        self._search_generation = 0
+        self._search_build: tuple[int, asyncio.Future] | None = None
+        self._filter_masks: dict[tuple[str, ...], np.ndarray] = {}
+        # Built lazily, then maintained on upsert and delete
+        self._relation_index: _RelationIndex | None = None
 
         working_dir = self.global_config["working_dir"]
         if self.workspace:
@@ -82,11 +216,78 @@ class NanoVectorDBStorage(BaseVectorStorage):
                     self.embedding_func.embedding_dim,
                     storage_file=self._client_file_name,
                 )
+                self._invalidate_search_index()
+                self._relation_index = None
                 # Reset update flag
                 self.storage_updated.value = False
 
             return self._client
 
+    def _invalidate_search_index(self) -> None:
+        """Drop the search snapshot after the client data changed"""
+        self._search_index = None
+        self._search_generation += 1
+        self._filter_masks = {}
+
+    async def _get_search_index(self) -> _SearchIndex:
+        """Get the search snapshot of the current client, rebuilding it if stale
+
+        The snapshot is built in a worker thread shared by concurrent queries. A
+        build that overlapped an upsert/delete may have copied torn data, so it is
+        discarded and retried; after repeated overlaps it is built on the event loop,
+        where no change can interleave with the copy.
+        """
+        for _ in range(MAX_SEARCH_INDEX_BUILD_ATTEMPTS):
+            client = await self._get_client()
+            if self._search_index is not None:
+                return self._search_index
+            generation = self._search_generation
+            if self._search_build is None or self._search_build[0] != generation:
+                build = asyncio.ensure_future(
+                    asyncio.to_thread(
+                        _SearchIndex.build,
+                        getattr(client, "_NanoVectorDB__storage"),
+                        self._search_dtype,
+                    )
+                )
+                self._search_build = (generation, build)
+            try:
+                index = await self._search_build[1]
+            except Exception:
+                if generation == self._search_generation:
+                    raise
+                # Data changed under the build, e.g. matrix and data lengths diverged
+                continue
+            finally:
+                if self._search_build and self._search_build[0] == generation:
+                    self._search_build = None
+            if generation == self._search_generation:
+                self._search_index = index
+                return index
+
+        client = await self._get_client()
+        if self._search_index is None:
+            self._search_index = _SearchIndex.build(
+                getattr(client, "_NanoVectorDB__storage"), self._search_dtype
+            )
+        return self._search_index
+
+    def _get_relation_index(self, client) -> _RelationIndex:
+        if self._relation_index is None:
+            self._relation_index = _RelationIndex(
+                getattr(client, "_NanoVectorDB__storage")["data"]
+            )
+        return self._relation_index
+
+    def _get_filter_mask(self, index: _SearchIndex, ids: list[str]) -> np.ndarray:
+        key = tuple(sorted(set(ids)))
+        mask = self._filter_masks.get(key)
+        if mask is None:
+            if len(self._filter_masks) >= MAX_CACHED_FILTER_MASKS:
+                self._filter_masks.pop(next(iter(self._filter_masks)))
+            mask = self._filter_masks[key] = index.filter_mask(key)
+        return mask
+
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         """
         Importance notes:
@@ -124,6 +325,10 @@ class NanoVectorDBStorage(BaseVectorStorage):
                 d["__vector__"] = embeddings[i]
             client = await self._get_client()
             results = client.upsert(datas=list_data)
+            self._invalidate_search_index()
+            if self._relation_index is not None:
+                for d in list_data:
+                    self._relation_index.add(d)
             return results
         else:
             # sometimes the embedding is not returned correctly. just log it.
@@ -140,11 +345,15 @@ class NanoVectorDBStorage(BaseVectorStorage):
         )  # higher priority for query
         embedding = embedding[0]
 
-        client = await self._get_client()
-        results = client.query(
-            query=embedding,
-            top_k=top_k,
-            better_than_threshold=self.cosine_better_than_threshold,
+        index = await self._get_search_index()
+        mask = self._get_filter_mask(index, ids) if ids else None
+        # The matrix scan releases the GIL, run it off the event loop
+        results = await asyncio.to_thread(
+            index.search,
+            embedding,
+            top_k,
+            self.cosine_better_than_threshold,
+            mask,
         )
         results = [
             {
@@ -176,6 +385,10 @@ class NanoVectorDBStorage(BaseVectorStorage):
         try:
             client = await self._get_client()
             client.delete(ids)
+            self._invalidate_search_index()
+            if self._relation_index is not None:
+                for id in ids:
+                    self._relation_index.remove(id)
             logger.debug(
                 f"Successfully deleted {len(ids)} vectors from {self.namespace}"
             )
@@ -200,6 +413,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
             client = await self._get_client()
             if client.get([entity_id]):
                 client.delete([entity_id])
+                self._invalidate_search_index()
                 logger.debug(f"Successfully deleted entity {entity_name}")
             else:
                 logger.debug(f"Entity {entity_name} not found in storage")
@@ -216,18 +430,17 @@ class NanoVectorDBStorage(BaseVectorStorage):
 
         try:
             client = await self._get_client()
-            storage = getattr(client, "_NanoVectorDB__storage")
-            relations = [
-                dp
-                for dp in storage["data"]
-                if dp["src_id"] == entity_name or dp["tgt_id"] == entity_name
-            ]
-            logger.debug(f"Found {len(relations)} relations for entity {entity_name}")
-            ids_to_delete = [relation["__id__"] for relation in relations]
+            relation_index = self._get_relation_index(client)
+            ids_to_delete = list(relation_index.relation_ids.get(entity_name, ()))
+            logger.debug(
+                f"Found {len(ids_to_delete)} relations for entity {entity_name}"
+            )
 
             if ids_to_delete:
-                client = await self._get_client()
                 client.delete(ids_to_delete)
+                self._invalidate_search_index()
+                for id in ids_to_delete:
+                    relation_index.remove(id)
                 logger.debug(
                     f"Deleted {len(ids_to_delete)} relations for {entity_name}"
                 )
@@ -249,6 +462,8 @@ class NanoVectorDBStorage(BaseVectorStorage):
                     self.embedding_func.embedding_dim,
                     storage_file=self._client_file_name,
                 )
+                self._invalidate_search_index()
+                self._relation_index = None
                 # Reset update flag
                 self.storage_updated.value = False
                 return False  # Return error
@@ -338,6 +553,8 @@ class NanoVectorDBStorage(BaseVectorStorage):
                     self.embedding_func.embedding_dim,
                     storage_file=self._client_file_name,
                 )
+                self._invalidate_search_index()
+                self._relation_index = None
 
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace)
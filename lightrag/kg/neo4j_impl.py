@@ -43,6 +43,13 @@ config.read("config.ini", "utf-8")
 # Set neo4j logger level to ERROR to suppress warning logs
 logging.getLogger("neo4j").setLevel(logging.ERROR)
 
+# Rows sent per UNWIND statement by the batch upserts
+UPSERT_BATCH_SIZE = int(os.getenv("NEO4J_UPSERT_BATCH_SIZE", 500))
+# Chunk ids per fulltext query, Lucene limits a query to 1024 clauses
+CHUNK_ID_QUERY_BATCH_SIZE = 500
+# Fulltext index over source_id of all DIRECTED relationships
+EDGE_CHUNK_INDEX_NAME = "directed_source_id_fulltext"
+
 
 @final
 @dataclass
@@ -195,6 +202,20 @@ class Neo4JStorage(BaseGraphStorage):
                             await result.consume()
                 except Exception as e:
                     logger.warning(f"Failed to create index: {str(e)}")
+
+                # Fulltext indexes over source_id back the lookups by chunk id
+                try:
+                    async with self._driver.session(database=database) as session:
+                        for query in (
+                            f"CREATE FULLTEXT INDEX `{self._get_node_chunk_index_name()}` IF NOT EXISTS "
+                            f"FOR (n:`{workspace_label}`) ON EACH [n.source_id]",
+                            f"CREATE FULLTEXT INDEX `{EDGE_CHUNK_INDEX_NAME}` IF NOT EXISTS "
+                            f"FOR ()-[r:DIRECTED]-() ON EACH [r.source_id]",
+                        ):
+                            result = await session.run(query)
+                            await result.consume()
+                except Exception as e:
+                    logger.warning(f"Failed to create chunk id index: {str(e)}")
                 break
 
     async def finalize(self):
@@ -749,7 +770,91 @@ class Neo4JStorage(BaseGraphStorage):
             await result.consume()  # Ensure results are fully consumed
             return edges_dict
 
+    def _get_node_chunk_index_name(self) -> str:
+        safe_label = re.sub(r"[^a-zA-Z0-9_]", "_", self._get_workspace_label())
+        return f"{safe_label}_source_id_fulltext"
+
+    @staticmethod
+    def _chunk_id_search_batches(chunk_ids: list[str]) -> list[tuple[set[str], str]]:
+        """Split chunk ids into (id set, fulltext phrase query) batches"""
+        batches = []
+        for i in range(0, len(chunk_ids), CHUNK_ID_QUERY_BATCH_SIZE):
+            batch = chunk_ids[i : i + CHUNK_ID_QUERY_BATCH_SIZE]
+            search = " OR ".join(
+                '"' + chunk_id.replace("\\", "\\\\").replace('"', '\\"') + '"'
+                for chunk_id in batch
+            )
+            batches.append((set(batch), search))
+        return batches
+
     async def get_nodes_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
+        """Find nodes by chunk id through the fulltext index over source_id
+
+        The analyzer tokenizes source_id, so index hits are checked against the
+        exact chunk ids before they are returned.
+        """
+        workspace_label = self._get_workspace_label()
+        nodes = {}
+        try:
+            async with self._driver.session(
+                database=self._DATABASE, default_access_mode="READ"
+            ) as session:
+                query = f"""
+                CALL db.index.fulltext.queryNodes($index, $search) YIELD node
+                WHERE node:`{workspace_label}`
+                RETURN node AS n
+                """
+                for batch, search in self._chunk_id_search_batches(chunk_ids):
+                    result = await session.run(
+                        query, index=self._get_node_chunk_index_name(), search=search
+                    )
+                    async for record in result:
+                        node_dict = dict(record["n"])
+                        source_id = node_dict.get("source_id") or ""
+                        if batch.isdisjoint(source_id.split(GRAPH_FIELD_SEP)):
+                            continue
+                        # Add node id (entity_id) to the dictionary for easier access
+                        node_dict["id"] = node_dict.get("entity_id")
+                        nodes[node_dict["id"]] = node_dict
+                    await result.consume()
+        except neo4jExceptions.ClientError as e:
+            logger.warning(f"Indexed chunk id lookup failed, scanning graph: {e}")
+            return await self._scan_nodes_by_chunk_ids(chunk_ids)
+        return list(nodes.values())
+
+    async def get_edges_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
+        """Find edges by chunk id through the fulltext index over source_id"""
+        workspace_label = self._get_workspace_label()
+        edges = {}
+        try:
+            async with self._driver.session(
+                database=self._DATABASE, default_access_mode="READ"
+            ) as session:
+                query = f"""
+                CALL db.index.fulltext.queryRelationships($index, $search) YIELD relationship AS r
+                WITH r, startNode(r) AS a, endNode(r) AS b
+                WHERE a:`{workspace_label}` AND b:`{workspace_label}`
+                RETURN a.entity_id AS source, b.entity_id AS target, properties(r) AS properties
+                """
+                for batch, search in self._chunk_id_search_batches(chunk_ids):
+                    result = await session.run(
+                        query, index=EDGE_CHUNK_INDEX_NAME, search=search
+                    )
+                    async for record in result:
+                        edge_properties = record["properties"]
+                        source_id = edge_properties.get("source_id") or ""
+                        if batch.isdisjoint(source_id.split(GRAPH_FIELD_SEP)):
+                            continue
+                        edge_properties["source"] = record["source"]
+                        edge_properties["target"] = record["target"]
+                        edges[(record["source"], record["target"])] = edge_properties
+                    await result.consume()
+        except neo4jExceptions.ClientError as e:
+            logger.warning(f"Indexed chunk id lookup failed, scanning graph: {e}")
+            return await self._scan_edges_by_chunk_ids(chunk_ids)
+        return list(edges.values())
+
+    async def _scan_nodes_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
         workspace_label = self._get_workspace_label()
         async with self._driver.session(
             database=self._DATABASE, default_access_mode="READ"
@@ -771,7 +876,7 @@ class Neo4JStorage(BaseGraphStorage):
             await result.consume()
             return nodes
 
-    async def get_edges_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
+    async def _scan_edges_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
         workspace_label = self._get_workspace_label()
         async with self._driver.session(
             database=self._DATABASE, default_access_mode="READ"
@@ -895,6 +1000,109 @@ class Neo4JStorage(BaseGraphStorage):
             logger.error(f"Error during edge upsert: {str(e)}")
             raise
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(
+            (
+                neo4jExceptions.ServiceUnavailable,
+                neo4jExceptions.TransientError,
+                neo4jExceptions.WriteServiceUnavailable,
+                neo4jExceptions.ClientError,
+            )
+        ),
+    )
+    async def upsert_nodes_batch(self, nodes: dict[str, dict[str, str]]) -> None:
+        """
+        Upsert multiple nodes with UNWIND, one statement per entity type and batch.
+
+        Args:
+            nodes: Dictionary mapping node_id to its node properties
+        """
+        workspace_label = self._get_workspace_label()
+        rows_by_type: dict[str, list[dict]] = {}
+        for node_id, properties in nodes.items():
+            if "entity_id" not in properties:
+                raise ValueError(
+                    "Neo4j: node properties must contain an 'entity_id' field"
+                )
+            rows_by_type.setdefault(properties["entity_type"], []).append(
+                {"entity_id": node_id, "properties": properties}
+            )
+
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+
+                async def execute_upsert(tx: AsyncManagedTransaction):
+                    # Labels cannot be parameterized, so rows are grouped by entity type
+                    for entity_type, rows in rows_by_type.items():
+                        query = f"""
+                        UNWIND $rows AS row
+                        MERGE (n:`{workspace_label}` {{entity_id: row.entity_id}})
+                        SET n += row.properties
+                        SET n:`{entity_type}`
+                        """
+                        for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+                            result = await tx.run(
+                                query, rows=rows[i : i + UPSERT_BATCH_SIZE]
+                            )
+                            await result.consume()
+
+                await session.execute_write(execute_upsert)
+        except Exception as e:
+            logger.error(f"Error during batch upsert: {str(e)}")
+            raise
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(
+            (
+                neo4jExceptions.ServiceUnavailable,
+                neo4jExceptions.TransientError,
+                neo4jExceptions.WriteServiceUnavailable,
+                neo4jExceptions.ClientError,
+            )
+        ),
+    )
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """
+        Upsert multiple edges with UNWIND. Edges whose endpoints do not exist are skipped,
+        matching the MATCH semantics of upsert_edge.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+        """
+        workspace_label = self._get_workspace_label()
+        rows = [
+            {"source": source, "target": target, "properties": edge_data}
+            for source, target, edge_data in edges
+        ]
+        query = f"""
+        UNWIND $rows AS row
+        MATCH (source:`{workspace_label}` {{entity_id: row.source}})
+        WITH source, row
+        MATCH (target:`{workspace_label}` {{entity_id: row.target}})
+        MERGE (source)-[r:DIRECTED]-(target)
+        SET r += row.properties
+        """
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+
+                async def execute_upsert(tx: AsyncManagedTransaction):
+                    for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+                        result = await tx.run(
+                            query, rows=rows[i : i + UPSERT_BATCH_SIZE]
+                        )
+                        await result.consume()
+
+                await session.execute_write(execute_upsert)
+        except Exception as e:
+            logger.error(f"Error during batch edge upsert: {str(e)}")
+            raise
+
     async def get_knowledge_graph(
         self,
         node_label: str,
@@ -1,6 +1,12 @@
+import heapq
 import os
+import time
+from collections import deque
 from dataclasses import dataclass
-from typing import final
+from operator import itemgetter
+from typing import Any, final
+
+import numpy as np
 
 from lightrag.types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
 from lightrag.utils import logger
@@ -12,7 +18,11 @@ import pipmaster as pm
 if not pm.is_installed("networkx"):
     pm.install("networkx")
 
+if not pm.is_installed("msgpack"):
+    pm.install("msgpack")
+
 import networkx as nx
+import msgpack  # type: ignore
 from .shared_storage import (
     get_storage_lock,
     get_update_flag,
@@ -26,50 +36,379 @@ from dotenv import load_dotenv
 # the OS environment variables take precedence over the .env file
 load_dotenv(dotenv_path=".env", override=False)
 
+GRAPH_SNAPSHOT_VERSION = 1
+# The delta file is folded into a new snapshot once it is larger than this
+# and larger than the snapshot itself
+DELTA_COMPACT_BYTES = int(
+    os.getenv("NETWORKX_DELTA_COMPACT_BYTES", str(16 * 1024 * 1024))
+)
+
+
+def _pack_columns(rows: list[dict[str, Any]]) -> dict[str, list]:
+    """Store attribute dicts column-wise, so every key is written only once"""
+    keys: dict[str, None] = {}
+    for row in rows:
+        keys.update(dict.fromkeys(row))
+    return {key: [row.get(key) for row in rows] for key in keys}
+
+
+def _unpack_columns(columns: dict[str, list], count: int) -> list[dict[str, Any]]:
+    if not columns:
+        return [{} for _ in range(count)]
+    keys = list(columns)
+    return [
+        {key: value for key, value in zip(keys, values) if value is not None}
+        for values in zip(*columns.values())
+    ]
+
 
 @final
 @dataclass
 class NetworkXStorage(BaseGraphStorage):
+    """NetworkX graph kept in memory and persisted as a binary snapshot plus delta file
+
+    The snapshot (msgpack) stores node ids once as a string pool, edges as two
+    uint32 arrays of node positions and attributes column-wise. Changes made
+    since the snapshot are appended to the delta file on every
+    index_done_callback, so other processes only replay the new records.
+    """
+
     @staticmethod
     def load_nx_graph(file_name) -> nx.Graph:
+        """Read a GraphML file, used for graphs stored by older versions"""
         if os.path.exists(file_name):
             return nx.read_graphml(file_name)
         return None
 
     @staticmethod
     def write_nx_graph(graph: nx.Graph, file_name):
+        """Export the graph as GraphML"""
         logger.info(
             f"Writing graph with {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges"
         )
         nx.write_graphml(graph, file_name)
 
+    @staticmethod
+    def write_graph_snapshot(graph: nx.Graph, file_name: str, generation: int):
+        nodes = list(graph.nodes)
+        position = {node: i for i, node in enumerate(nodes)}
+        edge_count = graph.number_of_edges()
+        edge_src = np.empty(edge_count, dtype="<u4")
+        edge_tgt = np.empty(edge_count, dtype="<u4")
+        edge_attrs = []
+        for i, (u, v, data) in enumerate(graph.edges(data=True)):
+            edge_src[i] = position[u]
+            edge_tgt[i] = position[v]
+            edge_attrs.append(data)
+
+        payload = {
+            "version": GRAPH_SNAPSHOT_VERSION,
+            "generation": generation,
+            "graph_attrs": dict(graph.graph),
+            "nodes": nodes,
+            "node_attrs": _pack_columns([graph.nodes[node] for node in nodes]),
+            "edge_src": edge_src.tobytes(),
+            "edge_tgt": edge_tgt.tobytes(),
+            "edge_attrs": _pack_columns(edge_attrs),
+        }
+        tmp_file = file_name + ".tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(msgpack.packb(payload, use_bin_type=True))
+        os.replace(tmp_file, file_name)
+        logger.info(
+            f"Writing graph snapshot with {len(nodes)} nodes, {edge_count} edges"
+        )
+
+    @staticmethod
+    def load_graph_snapshot(file_name: str) -> tuple[nx.Graph, int] | None:
+        """Read a snapshot, returns (graph, generation) or None if it does not exist"""
+        if not os.path.exists(file_name):
+            return None
+        with open(file_name, "rb") as f:
+            payload = msgpack.unpackb(f.read(), raw=False)
+
+        nodes = payload["nodes"]
+        edge_src = np.frombuffer(payload["edge_src"], dtype="<u4")
+        edge_tgt = np.frombuffer(payload["edge_tgt"], dtype="<u4")
+        graph = nx.Graph(**payload.get("graph_attrs", {}))
+        graph.add_nodes_from(
+            zip(nodes, _unpack_columns(payload["node_attrs"], len(nodes)))
+        )
+        graph.add_edges_from(
+            zip(
+                (nodes[i] for i in edge_src.tolist()),
+                (nodes[i] for i in edge_tgt.tolist()),
+                _unpack_columns(payload["edge_attrs"], len(edge_src)),
+            )
+        )
+        return graph, payload["generation"]
+
+    @staticmethod
+    def replay_graph_delta(
+        graph: nx.Graph, file_name: str, generation: int, offset: int = 0
+    ) -> int | None:
+        """Apply the delta records of a snapshot generation to the graph
+
+        Returns the offset after the last complete record, or None if the delta
+        file is missing or belongs to another snapshot generation.
+        """
+        if not os.path.exists(file_name):
+            return None
+        with open(file_name, "rb") as f:
+            unpacker = msgpack.Unpacker(f, raw=False)
+            header = next(unpacker, None)
+            if header != ["g", generation]:
+                return None
+            end = unpacker.tell()
+            if offset:
+                # Positions reported by the new unpacker are relative to offset
+                f.seek(offset)
+                unpacker = msgpack.Unpacker(f, raw=False)
+                end = 0
+            for record in unpacker:
+                op = record[0]
+                if op == "n":
+                    graph.add_node(record[1], **record[2])
+                elif op == "e":
+                    graph.add_edge(record[1], record[2], **record[3])
+                elif op == "dn":
+                    if graph.has_node(record[1]):
+                        graph.remove_node(record[1])
+                elif op == "de":
+                    if graph.has_edge(record[1], record[2]):
+                        graph.remove_edge(record[1], record[2])
+                # tell() after the loop would include the bytes of a torn last record
+                end = unpacker.tell()
+            return offset + end
+
     def __post_init__(self):
         working_dir = self.global_config["working_dir"]
         if self.workspace:
             # Include workspace in the file path for data isolation
             workspace_dir = os.path.join(working_dir, self.workspace)
             os.makedirs(workspace_dir, exist_ok=True)
-            self._graphml_xml_file = os.path.join(
-                workspace_dir, f"graph_{self.namespace}.graphml"
-            )
         else:
             # Default behavior when workspace is empty
-            self._graphml_xml_file = os.path.join(
-                working_dir, f"graph_{self.namespace}.graphml"
-            )
+            workspace_dir = working_dir
+        self._graphml_xml_file = os.path.join(
+            workspace_dir, f"graph_{self.namespace}.graphml"
+        )
+        self._snapshot_file = os.path.join(
+            workspace_dir, f"graph_{self.namespace}.msgpack"
+        )
+        self._delta_file = os.path.join(
+            workspace_dir, f"graph_{self.namespace}.delta.msgpack"
+        )
         self._storage_lock = None
         self.storage_updated = None
         self._graph = None
+        # Snapshot generation the graph is based on and the delta file offset replayed so far
+        self._generation = None
+        self._delta_offset = 0
+        # Changes not yet appended to the delta file
+        self._pending_ops: list[list] = []
+        # Inverted index chunk id -> node ids / edge keys, built lazily on first use
+        self._node_chunk_index: dict[str, set[str]] | None = None
+        self._edge_chunk_index: dict[str, set[tuple[str, str]]] | None = None
 
         # Load initial graph
-        preloaded_graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
-        if preloaded_graph is not None:
-            logger.info(
-                f"Loaded graph from {self._graphml_xml_file} with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
+        self._load_graph()
+        logger.info(
+            f"Loaded graph {self.namespace} with {self._graph.number_of_nodes()} nodes, {self._graph.number_of_edges()} edges"
+        )
+
+    def _load_graph(self):
+        """Load snapshot and delta, falling back to a GraphML file of older versions"""
+        self._pending_ops = []
+        self._node_chunk_index = None
+        self._edge_chunk_index = None
+        loaded = NetworkXStorage.load_graph_snapshot(self._snapshot_file)
+        if loaded is not None:
+            self._graph, self._generation = loaded
+            self._delta_offset = (
+                NetworkXStorage.replay_graph_delta(
+                    self._graph, self._delta_file, self._generation
+                )
+                or 0
             )
-        else:
-            logger.info("Created new empty graph")
-        self._graph = preloaded_graph or nx.Graph()
+            return
+
+        # No snapshot yet, the next index_done_callback writes one
+        self._generation = None
+        self._delta_offset = 0
+        self._graph = (
+            NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
+        )
+
+    def _reload_graph(self):
+        """Pick up changes of another process, replaying only new delta records if possible"""
+        # Unsaved local changes are discarded, which needs a full reload
+        if (
+            self._generation is not None
+            and self._delta_offset
+            and not self._pending_ops
+        ):
+            offset = NetworkXStorage.replay_graph_delta(
+                self._graph, self._delta_file, self._generation, self._delta_offset
+            )
+            if offset is not None:
+                self._delta_offset = offset
+                self._node_chunk_index = None
+                self._edge_chunk_index = None
+                return
+        self._load_graph()
+
+    def _persist(self):
+        """Append pending changes to the delta file, or write a new snapshot"""
+        delta_size = (
+            os.path.getsize(self._delta_file) if os.path.exists(self._delta_file) else 0
+        )
+        if self._generation is not None and not self._delta_offset:
+            # The delta file is missing or belongs to another generation, e.g. after a
+            # crash between writing the snapshot and its delta header, start it afresh
+            self._write_delta_header(self._generation)
+            delta_size = self._delta_offset
+        elif self._generation is not None and delta_size > self._delta_offset:
+            # Drop the tail of an interrupted append
+            with open(self._delta_file, "r+b") as f:
+                f.truncate(self._delta_offset)
+            delta_size = self._delta_offset
+
+        if self._generation is not None and (
+            delta_size < DELTA_COMPACT_BYTES
+            or delta_size < os.path.getsize(self._snapshot_file)
+        ):
+            if self._pending_ops:
+                packer = msgpack.Packer(use_bin_type=True)
+                with open(self._delta_file, "ab") as f:
+                    for op in self._pending_ops:
+                        f.write(packer.pack(op))
+                    self._delta_offset = f.tell()
+            self._pending_ops = []
+            return
+
+        generation = time.time_ns()
+        NetworkXStorage.write_graph_snapshot(
+            self._graph, self._snapshot_file, generation
+        )
+        self._write_delta_header(generation)
+        self._generation = generation
+        self._pending_ops = []
+
+    def _write_delta_header(self, generation: int):
+        """Atomically replace the delta file with an empty one for generation"""
+        tmp_file = self._delta_file + ".tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(msgpack.packb(["g", generation], use_bin_type=True))
+            self._delta_offset = f.tell()
+        os.replace(tmp_file, self._delta_file)
+
+    @staticmethod
+    def _edge_key(source: str, target: str) -> tuple[str, str]:
+        return (source, target) if source <= target else (target, source)
+
+    @staticmethod
+    def _index_chunks(index: dict, key, source_id: str | None, add: bool):
+        if not source_id:
+            return
+        for chunk_id in source_id.split(GRAPH_FIELD_SEP):
+            if add:
+                index.setdefault(chunk_id, set()).add(key)
+            else:
+                keys = index.get(chunk_id)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del index[chunk_id]
+
+    def _build_chunk_index(self):
+        self._node_chunk_index = {}
+        self._edge_chunk_index = {}
+        for node_id, data in self._graph.nodes(data=True):
+            self._index_chunks(
+                self._node_chunk_index, node_id, data.get("source_id"), True
+            )
+        for source, target, data in self._graph.edges(data=True):
+            self._index_chunks(
+                self._edge_chunk_index,
+                self._edge_key(source, target),
+                data.get("source_id"),
+                True,
+            )
+
+    def _node_source_ids(self, node_ids) -> dict[str, str | None]:
+        """Current source_id of nodes, taken before they change"""
+        if self._node_chunk_index is None:
+            return {}
+        nodes = self._graph.nodes
+        return {
+            node_id: nodes[node_id].get("source_id") if node_id in nodes else None
+            for node_id in node_ids
+        }
+
+    def _edge_source_ids(self, edges) -> dict[tuple[str, str], str | None]:
+        """Current source_id of edges, taken before they change"""
+        if self._edge_chunk_index is None:
+            return {}
+        result = {}
+        for source, target in edges:
+            data = self._graph.edges.get((source, target))
+            result[self._edge_key(source, target)] = (
+                data.get("source_id") if data else None
+            )
+        return result
+
+    def _reindex_nodes(self, old_source_ids: dict[str, str | None]):
+        if self._node_chunk_index is None:
+            return
+        nodes = self._graph.nodes
+        for node_id, old_source_id in old_source_ids.items():
+            new_source_id = (
+                nodes[node_id].get("source_id") if node_id in nodes else None
+            )
+            if new_source_id != old_source_id:
+                self._index_chunks(
+                    self._node_chunk_index, node_id, old_source_id, False
+                )
+                self._index_chunks(self._node_chunk_index, node_id, new_source_id, True)
+
+    def _reindex_edges(self, old_source_ids: dict[tuple[str, str], str | None]):
+        if self._edge_chunk_index is None:
+            return
+        for key, old_source_id in old_source_ids.items():
+            data = self._graph.edges.get(key)
+            new_source_id = data.get("source_id") if data else None
+            if new_source_id != old_source_id:
+                self._index_chunks(self._edge_chunk_index, key, old_source_id, False)
+                self._index_chunks(self._edge_chunk_index, key, new_source_id, True)
+
+    def _remove_node(self, node_id: str):
+        """Remove a node with its edges, keeping the chunk index in sync"""
+        if self._edge_chunk_index is not None:
+            old_edges = self._edge_source_ids(
+                (node_id, neighbor) for neighbor in self._graph.neighbors(node_id)
+            )
+        old_nodes = self._node_source_ids([node_id])
+        self._graph.remove_node(node_id)
+        self._reindex_nodes(old_nodes)
+        if self._edge_chunk_index is not None:
+            self._reindex_edges(old_edges)
+        self._pending_ops.append(["dn", node_id])
+
+    async def export_graphml(self, file_name: str | None = None) -> str:
+        """Export the graph as GraphML, e.g. for the graph visualizer
+
+        Args:
+            file_name: Target file, defaults to graph_<namespace>.graphml in the working directory
+
+        Returns:
+            Path of the written file
+        """
+        file_name = file_name or self._graphml_xml_file
+        graph = await self._get_graph()
+        async with self._storage_lock:
+            NetworkXStorage.write_nx_graph(graph, file_name)
+        return file_name
 
     async def initialize(self):
         """Initialize storage data"""
@@ -88,9 +427,7 @@ class NetworkXStorage(BaseGraphStorage):
                     f"Process {os.getpid()} reloading graph {self.namespace} due to update by another process"
                 )
                 # Reload data
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
+                self._reload_graph()
                 # Reset update flag
                 self.storage_updated.value = False
 
@@ -110,7 +447,7 @@ class NetworkXStorage(BaseGraphStorage):
 
     async def node_degree(self, node_id: str) -> int:
         graph = await self._get_graph()
-        return graph.degree(node_id)
+        return graph.degree(node_id) if graph.has_node(node_id) else 0
 
     async def edge_degree(self, src_id: str, tgt_id: str) -> int:
         graph = await self._get_graph()
@@ -138,7 +475,10 @@ class NetworkXStorage(BaseGraphStorage):
            KG-storage-log should be used to avoid data corruption
         """
         graph = await self._get_graph()
+        old_source_ids = self._node_source_ids([node_id])
         graph.add_node(node_id, **node_data)
+        self._reindex_nodes(old_source_ids)
+        self._pending_ops.append(["n", node_id, node_data])
 
     async def upsert_edge(
         self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
@@ -150,7 +490,38 @@ class NetworkXStorage(BaseGraphStorage):
            KG-storage-log should be used to avoid data corruption
         """
         graph = await self._get_graph()
+        old_source_ids = self._edge_source_ids([(source_node_id, target_node_id)])
         graph.add_edge(source_node_id, target_node_id, **edge_data)
+        self._reindex_edges(old_source_ids)
+        self._pending_ops.append(["e", source_node_id, target_node_id, edge_data])
+
+    async def upsert_nodes_batch(self, nodes: dict[str, dict[str, str]]) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        graph = await self._get_graph()
+        old_source_ids = self._node_source_ids(nodes)
+        graph.add_nodes_from(nodes.items())
+        self._reindex_nodes(old_source_ids)
+        self._pending_ops.extend(["n", node_id, data] for node_id, data in nodes.items())
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        graph = await self._get_graph()
+        old_source_ids = self._edge_source_ids((src, tgt) for src, tgt, _ in edges)
+        graph.add_edges_from(edges)
+        self._reindex_edges(old_source_ids)
+        self._pending_ops.extend(["e", src, tgt, data] for src, tgt, data in edges)
 
     async def delete_node(self, node_id: str) -> None:
         """
@@ -161,7 +532,7 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         if graph.has_node(node_id):
-            graph.remove_node(node_id)
+            self._remove_node(node_id)
             logger.debug(f"Node {node_id} deleted from the graph.")
         else:
             logger.warning(f"Node {node_id} not found in the graph for deletion.")
@@ -180,7 +551,7 @@ class NetworkXStorage(BaseGraphStorage):
         graph = await self._get_graph()
         for node in nodes:
             if graph.has_node(node):
-                graph.remove_node(node)
+                self._remove_node(node)
 
     async def remove_edges(self, edges: list[tuple[str, str]]):
         """Delete multiple edges
@@ -196,7 +567,10 @@ class NetworkXStorage(BaseGraphStorage):
         graph = await self._get_graph()
         for source, target in edges:
             if graph.has_edge(source, target):
+                old_source_ids = self._edge_source_ids([(source, target)])
                 graph.remove_edge(source, target)
+                self._reindex_edges(old_source_ids)
+                self._pending_ops.append(["de", source, target])
 
     async def get_all_labels(self) -> list[str]:
         """
@@ -212,6 +586,59 @@ class NetworkXStorage(BaseGraphStorage):
         # Return sorted list
         return sorted(list(labels))
 
+    @staticmethod
+    def select_subgraph_nodes(
+        graph: nx.Graph, node_label: str, max_depth: int, max_nodes: int
+    ) -> tuple[list[str], bool]:
+        """Select the nodes of the subgraph returned by get_knowledge_graph
+
+        For "*" these are the max_nodes nodes of highest degree. Otherwise a
+        breadth-first search from node_label visits each level in descending
+        degree order until max_nodes nodes are collected.
+
+        Returns:
+            Tuple of (selected nodes in selection order, whether nodes were left out)
+        """
+        if node_label == "*":
+            # Top-k selection, ties keep graph order like a stable sort would
+            selected = [
+                node
+                for node, _ in heapq.nlargest(
+                    max_nodes, graph.degree(), key=itemgetter(1)
+                )
+            ]
+            return selected, graph.number_of_nodes() > max_nodes
+
+        degrees: dict[str, int] = {}
+
+        def degree(node: str) -> int:
+            if node not in degrees:
+                degrees[node] = graph.degree(node)
+            return degrees[node]
+
+        selected = []
+        # Nodes are marked visited when enqueued, so each one is queued only once
+        visited = {node_label}
+        queue = deque([(node_label, 0)])
+        while queue:
+            depth = queue[0][1]
+            level = []
+            while queue and queue[0][1] == depth:
+                level.append(queue.popleft()[0])
+            # Stable sort keeps discovery order among nodes of equal degree
+            level.sort(key=degree, reverse=True)
+
+            for node in level:
+                if len(selected) >= max_nodes:
+                    return selected, True
+                selected.append(node)
+                if depth < max_depth:
+                    for neighbor in graph.neighbors(node):
+                        if neighbor not in visited:
+                            visited.add(neighbor)
+                            queue.append((neighbor, depth + 1))
+        return selected, False
+
     async def get_knowledge_graph(
         self,
         node_label: str,
@@ -241,81 +668,16 @@ class NetworkXStorage(BaseGraphStorage):
 
         result = KnowledgeGraph()
 
-        # Handle special case for "*" label
-        if node_label == "*":
-            # Get degrees of all nodes
-            degrees = dict(graph.degree())
-            # Sort nodes by degree in descending order and take top max_nodes
-            sorted_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)
-
-            # Check if graph is truncated
-            if len(sorted_nodes) > max_nodes:
-                result.is_truncated = True
-                logger.info(
-                    f"Graph truncated: {len(sorted_nodes)} nodes found, limited to {max_nodes}"
-                )
-
-            limited_nodes = [node for node, _ in sorted_nodes[:max_nodes]]
-            # Create subgraph with the highest degree nodes
-            subgraph = graph.subgraph(limited_nodes)
-        else:
-            # Check if node exists
-            if node_label not in graph:
-                logger.warning(f"Node {node_label} not found in the graph")
-                return KnowledgeGraph()  # Return empty graph
-
-            # Use modified BFS to get nodes, prioritizing high-degree nodes at the same depth
-            bfs_nodes = []
-            visited = set()
-            # Store (node, depth, degree) in the queue
-            queue = [(node_label, 0, graph.degree(node_label))]
-
-            # Modified breadth-first search with degree-based prioritization
-            while queue and len(bfs_nodes) < max_nodes:
-                # Get the current depth from the first node in queue
-                current_depth = queue[0][1]
-
-                # Collect all nodes at the current depth
-                current_level_nodes = []
-                while queue and queue[0][1] == current_depth:
-                    current_level_nodes.append(queue.pop(0))
-
-                # Sort nodes at current depth by degree (highest first)
-                current_level_nodes.sort(key=lambda x: x[2], reverse=True)
-
-                # Process all nodes at current depth in order of degree
-                for current_node, depth, degree in current_level_nodes:
-                    if current_node not in visited:
-                        visited.add(current_node)
-                        bfs_nodes.append(current_node)
-
-                        # Only explore neighbors if we haven't reached max_depth
-                        if depth < max_depth:
-                            # Add neighbor nodes to queue with incremented depth
-                            neighbors = list(graph.neighbors(current_node))
-                            # Filter out already visited neighbors
-                            unvisited_neighbors = [
-                                n for n in neighbors if n not in visited
-                            ]
-                            # Add neighbors to the queue with their degrees
-                            for neighbor in unvisited_neighbors:
-                                neighbor_degree = graph.degree(neighbor)
-                                queue.append((neighbor, depth + 1, neighbor_degree))
-
-                    # Check if we've reached max_nodes
-                    if len(bfs_nodes) >= max_nodes:
-                        break
-
-            # Check if graph is truncated - if we still have nodes in the queue
-            # and we've reached max_nodes, then the graph is truncated
-            if queue and len(bfs_nodes) >= max_nodes:
-                result.is_truncated = True
-                logger.info(
-                    f"Graph truncated: breadth-first search limited to {max_nodes} nodes"
-                )
+        if node_label != "*" and node_label not in graph:
+            logger.warning(f"Node {node_label} not found in the graph")
+            return KnowledgeGraph()  # Return empty graph
 
-            # Create subgraph with BFS discovered nodes
-            subgraph = graph.subgraph(bfs_nodes)
+        selected_nodes, result.is_truncated = NetworkXStorage.select_subgraph_nodes(
+            graph, node_label, max_depth, max_nodes
+        )
+        if result.is_truncated:
+            logger.info(f"Graph truncated: limited to {max_nodes} nodes")
+        subgraph = graph.subgraph(selected_nodes)
 
         # Add nodes to result
         seen_nodes = set()
@@ -373,30 +735,34 @@ class NetworkXStorage(BaseGraphStorage):
         return result
 
     async def get_nodes_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
-        chunk_ids_set = set(chunk_ids)
         graph = await self._get_graph()
+        async with self._storage_lock:
+            if self._node_chunk_index is None:
+                self._build_chunk_index()
+            node_ids = set()
+            for chunk_id in chunk_ids:
+                node_ids.update(self._node_chunk_index.get(chunk_id, ()))
         matching_nodes = []
-        for node_id, node_data in graph.nodes(data=True):
-            if "source_id" in node_data:
-                node_source_ids = set(node_data["source_id"].split(GRAPH_FIELD_SEP))
-                if not node_source_ids.isdisjoint(chunk_ids_set):
-                    node_data_with_id = node_data.copy()
-                    node_data_with_id["id"] = node_id
-                    matching_nodes.append(node_data_with_id)
+        for node_id in node_ids:
+            node_data_with_id = graph.nodes[node_id].copy()
+            node_data_with_id["id"] = node_id
+            matching_nodes.append(node_data_with_id)
         return matching_nodes
 
     async def get_edges_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
-        chunk_ids_set = set(chunk_ids)
         graph = await self._get_graph()
+        async with self._storage_lock:
+            if self._edge_chunk_index is None:
+                self._build_chunk_index()
+            edge_keys = set()
+            for chunk_id in chunk_ids:
+                edge_keys.update(self._edge_chunk_index.get(chunk_id, ()))
         matching_edges = []
-        for u, v, edge_data in graph.edges(data=True):
-            if "source_id" in edge_data:
-                edge_source_ids = set(edge_data["source_id"].split(GRAPH_FIELD_SEP))
-                if not edge_source_ids.isdisjoint(chunk_ids_set):
-                    edge_data_with_nodes = edge_data.copy()
-                    edge_data_with_nodes["source"] = u
-                    edge_data_with_nodes["target"] = v
-                    matching_edges.append(edge_data_with_nodes)
+        for u, v in edge_keys:
+            edge_data_with_nodes = graph.edges[u, v].copy()
+            edge_data_with_nodes["source"] = u
+            edge_data_with_nodes["target"] = v
+            matching_edges.append(edge_data_with_nodes)
         return matching_edges
 
     async def index_done_callback(self) -> bool:
@@ -408,9 +774,7 @@ class NetworkXStorage(BaseGraphStorage):
                 logger.info(
                     f"Graph for {self.namespace} was updated by another process, reloading..."
                 )
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
+                self._reload_graph()
                 # Reset update flag
                 self.storage_updated.value = False
                 return False  # Return error
@@ -419,7 +783,7 @@ class NetworkXStorage(BaseGraphStorage):
         async with self._storage_lock:
             try:
                 # Save data to disk
-                NetworkXStorage.write_nx_graph(self._graph, self._graphml_xml_file)
+                self._persist()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace)
                 # Reset own update flag to avoid self-reloading
@@ -435,7 +799,7 @@ class NetworkXStorage(BaseGraphStorage):
         """Drop all graph data from storage and clean up resources
 
         This method will:
-        1. Remove the graph storage file if it exists
+        1. Remove the graph storage files if they exist
         2. Reset the graph to an empty state
         3. Update flags to notify other processes
         4. Changes is persisted to disk immediately
@@ -447,16 +811,25 @@ class NetworkXStorage(BaseGraphStorage):
         """
         try:
             async with self._storage_lock:
-                # delete _client_file_name
-                if os.path.exists(self._graphml_xml_file):
-                    os.remove(self._graphml_xml_file)
+                for file_name in (
+                    self._snapshot_file,
+                    self._delta_file,
+                    self._graphml_xml_file,
+                ):
+                    if os.path.exists(file_name):
+                        os.remove(file_name)
                 self._graph = nx.Graph()
+                self._generation = None
+                self._delta_offset = 0
+                self._pending_ops = []
+                self._node_chunk_index = None
+                self._edge_chunk_index = None
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace)
                 # Reset own update flag to avoid self-reloading
                 self.storage_updated.value = False
                 logger.info(
-                    f"Process {os.getpid()} drop graph {self.namespace} (file:{self._graphml_xml_file})"
+                    f"Process {os.getpid()} drop graph {self.namespace} (file:{self._snapshot_file})"
                 )
             return {"status": "success", "message": "data dropped"}
         except Exception as e:
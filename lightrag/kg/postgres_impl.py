@@ -9,6 +9,7 @@ from typing import Any, Union, final
 import numpy as np
 import configparser
 import ssl
+import struct
 
 from lightrag.types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
 
@@ -47,6 +48,29 @@ from dotenv import load_dotenv
 load_dotenv(dotenv_path=".env", override=False)
 
 
+def _encode_vector(value: Any) -> bytes:
+    """Encode a vector in pgvector's binary format: dim, unused, float32[dim] (big-endian)"""
+    if isinstance(value, str):
+        value = json.loads(value)
+    vector = np.asarray(value, dtype=">f4")
+    return struct.pack(">HH", vector.shape[0], 0) + vector.tobytes()
+
+
+def _decode_vector(data: bytes) -> np.ndarray:
+    dim, _ = struct.unpack_from(">HH", data)
+    return np.frombuffer(data, dtype=">f4", count=dim, offset=4).astype(np.float32)
+
+
+def _source_chunk_ids_sql(properties: str) -> str:
+    """SQL expression for the chunk ids in the source_id property of an AGE vertex or edge
+
+    The same expression backs the GIN indexes created by PGGraphStorage, so
+    lookups by chunk id use the index instead of scanning the graph.
+    """
+    source_id = f"ag_catalog.agtype_access_operator({properties}, '\"source_id\"'::agtype)"
+    return f"string_to_array(btrim({source_id}::text, '\"'), '{GRAPH_FIELD_SEP}')"
+
+
 class PostgreSQLDB:
     def __init__(self, config: dict[str, Any], **kwargs: Any):
         self.host = config["host"]
@@ -58,6 +82,8 @@ class PostgreSQLDB:
         self.max = int(config["max_connections"])
         self.increment = 1
         self.pool: Pool | None = None
+        # Set once the binary pgvector codec is registered on pool connections
+        self.vector_codec = False
 
         # SSL configuration
         self.ssl_mode = config.get("ssl_mode")
@@ -165,11 +191,16 @@ class PostgreSQLDB:
                     connection_params["ssl"] = False
                 logger.info(f"PostgreSQL, SSL mode set to: {self.ssl_mode}")
 
-            self.pool = await asyncpg.create_pool(**connection_params)  # type: ignore
+            self.pool = await asyncpg.create_pool(  # type: ignore
+                **connection_params, init=self._init_connection
+            )
 
             # Ensure VECTOR extension is available
             async with self.pool.acquire() as connection:
                 await self.configure_vector_extension(connection)
+            if not self.vector_codec:
+                # Connections opened before the extension existed lack the codec
+                await self.pool.expire_connections()
 
             ssl_status = "with SSL" if connection_params.get("ssl") else "without SSL"
             logger.info(
@@ -181,6 +212,30 @@ class PostgreSQLDB:
             )
             raise
 
+    async def _init_connection(self, connection: asyncpg.Connection) -> None:
+        """Register the binary pgvector codec, so vectors travel as packed float32"""
+        schema = await connection.fetchval(
+            """SELECT n.nspname FROM pg_type t
+               JOIN pg_namespace n ON n.oid = t.typnamespace
+               WHERE t.typname = 'vector' LIMIT 1"""
+        )
+        if schema is None:
+            return
+        await connection.set_type_codec(
+            "vector",
+            schema=schema,
+            encoder=_encode_vector,
+            decoder=_decode_vector,
+            format="binary",
+        )
+        self.vector_codec = True
+
+    def vector_param(self, embedding: Any) -> Any:
+        """Query/insert parameter for a vector column, binary if the codec is available"""
+        if self.vector_codec:
+            return np.asarray(embedding, dtype=np.float32)
+        return "[" + ",".join(map(str, embedding)) + "]"
+
     @staticmethod
     async def configure_vector_extension(connection: asyncpg.Connection) -> None:
         """Create VECTOR extension if it doesn't exist for vector similarity operations."""
@@ -867,6 +922,67 @@ class PostgreSQLDB:
             logger.error(f"PostgreSQL database,\nsql:{sql},\ndata:{data},\nerror:{e}")
             raise
 
+    async def executemany(
+        self,
+        sql: str,
+        data: list[dict[str, Any]],
+        batch_size: int = 1000,
+    ) -> None:
+        """Run one parameterized statement for many rows, pipelined in few round trips
+
+        Rows are sent `batch_size` at a time with asyncpg's executemany, each batch
+        in its own transaction.
+        """
+        if not data:
+            return
+        try:
+            async with self.pool.acquire() as connection:  # type: ignore
+                for i in range(0, len(data), batch_size):
+                    args = [tuple(row.values()) for row in data[i : i + batch_size]]
+                    async with connection.transaction():
+                        await connection.executemany(sql, args)
+        except Exception as e:
+            logger.error(
+                f"PostgreSQL database,\nsql:{sql},\nrows:{len(data)},\nerror:{e}"
+            )
+            raise
+
+    async def execute_statements(
+        self,
+        statements: list[str],
+        batch_size: int = 200,
+        with_age: bool = False,
+        graph_name: str | None = None,
+    ) -> None:
+        """Run parameterless statements in as few round trips as possible
+
+        Statements are sent `batch_size` at a time as one multi-statement script
+        inside a transaction. If a batch hits a duplicate-key race it is replayed
+        statement by statement, so one conflicting MERGE does not drop the others.
+        """
+        async with self.pool.acquire() as connection:  # type: ignore
+            if with_age and graph_name:
+                await self.configure_age(connection, graph_name)
+            elif with_age and not graph_name:
+                raise ValueError("Graph name is required when with_age is True")
+
+            for i in range(0, len(statements), batch_size):
+                batch = statements[i : i + batch_size]
+                try:
+                    async with connection.transaction():
+                        await connection.execute(";\n".join(batch))
+                except asyncpg.exceptions.UniqueViolationError:
+                    for statement in batch:
+                        try:
+                            await connection.execute(statement)
+                        except asyncpg.exceptions.UniqueViolationError:
+                            pass
+                except Exception as e:
+                    logger.error(
+                        f"PostgreSQL database, batch of {len(batch)} statements failed, error:{e}"
+                    )
+                    raise
+
 
 class ClientManager:
     _instances: dict[str, Any] = {"db": None, "ref_count": 0}
@@ -1089,11 +1205,11 @@ class PGKVStorage(BaseKVStorage):
 
     # Query by id
     async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
-        """Get data by ids"""
-        sql = SQL_TEMPLATES["get_by_ids_" + self.namespace].format(
-            ids=",".join([f"'{id}'" for id in ids])
-        )
-        params = {"workspace": self.db.workspace}
+        """Get data by ids in one query, aligned with ids (None for missing ids)"""
+        if not ids:
+            return []
+        sql = SQL_TEMPLATES["get_by_ids_" + self.namespace]
+        params = {"workspace": self.db.workspace, "ids": list(ids)}
         results = await self.db.query(sql, params, multirows=True)
 
         if results and is_namespace(self.namespace, NameSpace.KV_STORE_TEXT_CHUNKS):
@@ -1131,9 +1247,10 @@ class PGKVStorage(BaseKVStorage):
                     "update_time": create_time if update_time == 0 else update_time,
                 }
                 processed_results.append(processed_row)
-            return processed_results
+            results = processed_results
 
-        return results if results else []
+        rows_by_id = {row["id"]: row for row in results or []}
+        return [rows_by_id.get(id) for id in ids]
 
     async def filter_keys(self, keys: set[str]) -> set[str]:
         """Filter out duplicated content"""
@@ -1165,9 +1282,9 @@ class PGKVStorage(BaseKVStorage):
         if is_namespace(self.namespace, NameSpace.KV_STORE_TEXT_CHUNKS):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
-            for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_text_chunk"]
-                _data = {
+            upsert_sql = SQL_TEMPLATES["upsert_text_chunk"]
+            rows = [
+                {
                     "workspace": self.db.workspace,
                     "id": k,
                     "tokens": v["tokens"],
@@ -1179,20 +1296,24 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                for k, v in data.items()
+            ]
+            await self.db.executemany(upsert_sql, rows)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_FULL_DOCS):
-            for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_doc_full"]
-                _data = {
+            upsert_sql = SQL_TEMPLATES["upsert_doc_full"]
+            rows = [
+                {
                     "id": k,
                     "content": v["content"],
                     "workspace": self.db.workspace,
                 }
-                await self.db.execute(upsert_sql, _data)
+                for k, v in data.items()
+            ]
+            await self.db.executemany(upsert_sql, rows)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_LLM_RESPONSE_CACHE):
-            for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_llm_response_cache"]
-                _data = {
+            upsert_sql = SQL_TEMPLATES["upsert_llm_response_cache"]
+            rows = [
+                {
                     "workspace": self.db.workspace,
                     "id": k,  # Use flattened key as id
                     "original_prompt": v["original_prompt"],
@@ -1203,8 +1324,9 @@ class PGKVStorage(BaseKVStorage):
                         "cache_type", "extract"
                     ),  # Get cache_type from data
                 }
-
-                await self.db.execute(upsert_sql, _data)
+                for k, v in data.items()
+            ]
+            await self.db.executemany(upsert_sql, rows)
 
     async def index_done_callback(self) -> None:
         # PG handles persistence automatically
@@ -1339,7 +1461,7 @@ class PGVectorStorage(BaseVectorStorage):
                 "chunk_order_index": item["chunk_order_index"],
                 "full_doc_id": item["full_doc_id"],
                 "content": item["content"],
-                "content_vector": json.dumps(item["__vector__"].tolist()),
+                "content_vector": self.db.vector_param(item["__vector__"]),
                 "file_path": item["file_path"],
                 "create_time": current_time,
                 "update_time": current_time,
@@ -1365,7 +1487,7 @@ class PGVectorStorage(BaseVectorStorage):
             "id": item["__id__"],
             "entity_name": item["entity_name"],
             "content": item["content"],
-            "content_vector": json.dumps(item["__vector__"].tolist()),
+            "content_vector": self.db.vector_param(item["__vector__"]),
             "chunk_ids": chunk_ids,
             "file_path": item.get("file_path", None),
             "create_time": current_time,
@@ -1389,7 +1511,7 @@ class PGVectorStorage(BaseVectorStorage):
             "source_id": item["src_id"],
             "target_id": item["tgt_id"],
             "content": item["content"],
-            "content_vector": json.dumps(item["__vector__"].tolist()),
+            "content_vector": self.db.vector_param(item["__vector__"]),
             "chunk_ids": chunk_ids,
             "file_path": item.get("file_path", None),
             "create_time": current_time,
@@ -1423,17 +1545,21 @@ class PGVectorStorage(BaseVectorStorage):
         embeddings = np.concatenate(embeddings_list)
         for i, d in enumerate(list_data):
             d["__vector__"] = embeddings[i]
-        for item in list_data:
-            if is_namespace(self.namespace, NameSpace.VECTOR_STORE_CHUNKS):
-                upsert_sql, data = self._upsert_chunks(item, current_time)
-            elif is_namespace(self.namespace, NameSpace.VECTOR_STORE_ENTITIES):
-                upsert_sql, data = self._upsert_entities(item, current_time)
-            elif is_namespace(self.namespace, NameSpace.VECTOR_STORE_RELATIONSHIPS):
-                upsert_sql, data = self._upsert_relationships(item, current_time)
-            else:
-                raise ValueError(f"{self.namespace} is not supported")
 
-            await self.db.execute(upsert_sql, data)
+        if is_namespace(self.namespace, NameSpace.VECTOR_STORE_CHUNKS):
+            prepare = self._upsert_chunks
+        elif is_namespace(self.namespace, NameSpace.VECTOR_STORE_ENTITIES):
+            prepare = self._upsert_entities
+        elif is_namespace(self.namespace, NameSpace.VECTOR_STORE_RELATIONSHIPS):
+            prepare = self._upsert_relationships
+        else:
+            raise ValueError(f"{self.namespace} is not supported")
+
+        rows = []
+        for item in list_data:
+            upsert_sql, row = prepare(item, current_time)
+            rows.append(row)
+        await self.db.executemany(upsert_sql, rows)
 
     #################### query method ###############
     async def query(
@@ -1443,14 +1569,14 @@ class PGVectorStorage(BaseVectorStorage):
             [query], _priority=5
         )  # higher priority for query
         embedding = embeddings[0]
-        embedding_string = ",".join(map(str, embedding))
         # Use parameterized document IDs (None means search across all documents)
-        sql = SQL_TEMPLATES[self.namespace].format(embedding_string=embedding_string)
+        sql = SQL_TEMPLATES[self.namespace]
         params = {
             "workspace": self.db.workspace,
             "doc_ids": ids,
             "better_than_threshold": self.cosine_better_than_threshold,
             "top_k": top_k,
+            "embedding": self.db.vector_param(embedding),
         }
         results = await self.db.query(sql, params=params, multirows=True)
         return results
@@ -1868,7 +1994,7 @@ class PGDocStatusStorage(DocStatusStorage):
                 {
                     "workspace": self.db.workspace,
                     "id": k,
-                    "content": v["content"],
+                    "content": v.get("content"),
                     "content_summary": v["content_summary"],
                     "content_length": v["content_length"],
                     "chunks_count": v["chunks_count"] if "chunks_count" in v else -1,
@@ -2016,6 +2142,11 @@ class PGGraphStorage(BaseGraphStorage):
             f'CREATE INDEX CONCURRENTLY entity_node_id_gin_idx ON {self.graph_name}."base" using gin(properties)',
             f'ALTER TABLE {self.graph_name}."DIRECTED" CLUSTER ON directed_sid_idx',
         ]
+        # Inverted chunk id indexes used by get_nodes_by_chunk_ids / get_edges_by_chunk_ids
+        chunk_index_queries = [
+            f'CREATE INDEX CONCURRENTLY entity_source_chunk_ids_idx ON {self.graph_name}."base" USING gin({_source_chunk_ids_sql("properties")})',
+            f'CREATE INDEX CONCURRENTLY directed_source_chunk_ids_idx ON {self.graph_name}."DIRECTED" USING gin({_source_chunk_ids_sql("properties")})',
+        ]
 
         for query in queries:
             # Use the new flag to silently ignore "already exists" errors
@@ -2028,6 +2159,19 @@ class PGGraphStorage(BaseGraphStorage):
                 graph_name=self.graph_name,
             )
 
+        for query in chunk_index_queries:
+            try:
+                await self.db.execute(
+                    query,
+                    upsert=True,
+                    ignore_if_exists=True,
+                    with_age=True,
+                    graph_name=self.graph_name,
+                )
+            except Exception as e:
+                # Lookups by chunk id still work without the index, just slower
+                logger.warning(f"Failed to create chunk id index: {e}")
+
     async def finalize(self):
         if self.db is not None:
             await ClientManager.release_client(self.db)
@@ -2441,6 +2585,79 @@ class PGGraphStorage(BaseGraphStorage):
             )
             raise
 
+    async def upsert_nodes_batch(self, nodes: dict[str, dict[str, str]]) -> None:
+        """
+        Upsert multiple nodes, pipelining the MERGE statements over one connection.
+
+        Args:
+            nodes: Dictionary mapping node_id to its node properties
+        """
+        statements = []
+        for node_id, node_data in nodes.items():
+            if "entity_id" not in node_data:
+                raise ValueError(
+                    "PostgreSQL: node properties must contain an 'entity_id' field"
+                )
+            statements.append(
+                """SELECT * FROM cypher('%s', $$
+                     MERGE (n:base {entity_id: "%s"})
+                     SET n += %s
+                     RETURN n
+                   $$) AS (n agtype)"""
+                % (
+                    self.graph_name,
+                    self._normalize_node_id(node_id),
+                    self._format_properties(node_data),
+                )
+            )
+
+        try:
+            await self.db.execute_statements(
+                statements, with_age=True, graph_name=self.graph_name
+            )
+        except Exception:
+            logger.error(f"POSTGRES, upsert_nodes_batch error on {len(nodes)} nodes")
+            raise
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """
+        Upsert multiple edges, pipelining the MERGE statements over one connection.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+        """
+        statements = []
+        for source_node_id, target_node_id, edge_data in edges:
+            edge_properties = self._format_properties(edge_data)
+            statements.append(
+                """SELECT * FROM cypher('%s', $$
+                     MATCH (source:base {entity_id: "%s"})
+                     WITH source
+                     MATCH (target:base {entity_id: "%s"})
+                     MERGE (source)-[r:DIRECTED]-(target)
+                     SET r += %s
+                     SET r += %s
+                     RETURN r
+                   $$) AS (r agtype)"""
+                % (
+                    self.graph_name,
+                    self._normalize_node_id(source_node_id),
+                    self._normalize_node_id(target_node_id),
+                    edge_properties,
+                    edge_properties,  # see upsert_edge
+                )
+            )
+
+        try:
+            await self.db.execute_statements(
+                statements, with_age=True, graph_name=self.graph_name
+            )
+        except Exception:
+            logger.error(f"POSTGRES, upsert_edges_batch error on {len(edges)} edges")
+            raise
+
     async def delete_node(self, node_id: str) -> None:
         """
         Delete a node from the graph.
@@ -2815,6 +3032,34 @@ class PGGraphStorage(BaseGraphStorage):
         return labels
 
     async def get_nodes_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
+        """
+        Retrieves nodes from the graph that are associated with a given list of chunk IDs.
+        Uses the GIN index over the chunk ids in `source_id`, so the cost is
+        proportional to the number of matching nodes.
+        """
+        sql = f"""SELECT properties::text AS properties
+                  FROM {self.graph_name}."base"
+                  WHERE {_source_chunk_ids_sql("properties")} && $1::text[]"""
+        try:
+            results = await self.db.query(
+                sql,
+                {"chunk_ids": chunk_ids},
+                multirows=True,
+                with_age=True,
+                graph_name=self.graph_name,
+            )
+        except Exception as e:
+            logger.warning(f"Indexed chunk id lookup failed, scanning graph: {e}")
+            return await self._scan_nodes_by_chunk_ids(chunk_ids)
+
+        nodes = []
+        for result in results or []:
+            node_dict = json.loads(result["properties"])
+            node_dict["id"] = node_dict["entity_id"]
+            nodes.append(node_dict)
+        return nodes
+
+    async def _scan_nodes_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
         """
         Retrieves nodes from the graph that are associated with a given list of chunk IDs.
         This method uses a Cypher query with UNWIND to efficiently find all nodes
@@ -2854,6 +3099,39 @@ class PGGraphStorage(BaseGraphStorage):
         return nodes
 
     async def get_edges_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
+        """
+        Retrieves edges from the graph that are associated with a given list of chunk IDs.
+        Uses the GIN index over the chunk ids in `source_id`, so the cost is
+        proportional to the number of matching edges.
+        """
+        sql = f"""SELECT e.properties::text AS edge,
+                         ag_catalog.agtype_access_operator(s.properties, '"entity_id"'::agtype)::text AS source,
+                         ag_catalog.agtype_access_operator(t.properties, '"entity_id"'::agtype)::text AS target
+                  FROM {self.graph_name}."DIRECTED" e
+                  JOIN {self.graph_name}."base" s ON s.id = e.start_id
+                  JOIN {self.graph_name}."base" t ON t.id = e.end_id
+                  WHERE {_source_chunk_ids_sql("e.properties")} && $1::text[]"""
+        try:
+            results = await self.db.query(
+                sql,
+                {"chunk_ids": chunk_ids},
+                multirows=True,
+                with_age=True,
+                graph_name=self.graph_name,
+            )
+        except Exception as e:
+            logger.warning(f"Indexed chunk id lookup failed, scanning graph: {e}")
+            return await self._scan_edges_by_chunk_ids(chunk_ids)
+
+        edges = []
+        for result in results or []:
+            edge_properties = json.loads(result["edge"])
+            edge_properties["source"] = json.loads(result["source"])
+            edge_properties["target"] = json.loads(result["target"])
+            edges.append(edge_properties)
+        return edges
+
+    async def _scan_edges_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
         """
         Retrieves edges from the graph that are associated with a given list of chunk IDs.
         This method uses a Cypher query with UNWIND to efficiently find all edges
@@ -3404,19 +3682,19 @@ SQL_TEMPLATES = {
                            FROM LIGHTRAG_LLM_CACHE WHERE workspace=$1 AND mode=$2 AND id=$3
                           """,
     "get_by_ids_full_docs": """SELECT id, COALESCE(content, '') as content
-                                 FROM LIGHTRAG_DOC_FULL WHERE workspace=$1 AND id IN ({ids})
+                                 FROM LIGHTRAG_DOC_FULL WHERE workspace=$1 AND id = ANY($2)
                             """,
     "get_by_ids_text_chunks": """SELECT id, tokens, COALESCE(content, '') as content,
                                   chunk_order_index, full_doc_id, file_path,
                                   COALESCE(llm_cache_list, '[]'::jsonb) as llm_cache_list,
                                   EXTRACT(EPOCH FROM create_time)::BIGINT as create_time,
                                   EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
-                                   FROM LIGHTRAG_DOC_CHUNKS WHERE workspace=$1 AND id IN ({ids})
+                                   FROM LIGHTRAG_DOC_CHUNKS WHERE workspace=$1 AND id = ANY($2)
                                 """,
     "get_by_ids_llm_response_cache": """SELECT id, original_prompt, return_value, mode, chunk_id, cache_type,
                                  EXTRACT(EPOCH FROM create_time)::BIGINT as create_time,
                                  EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
-                                 FROM LIGHTRAG_LLM_CACHE WHERE workspace=$1 AND id IN ({ids})
+                                 FROM LIGHTRAG_LLM_CACHE WHERE workspace=$1 AND id = ANY($2)
                                 """,
     "filter_keys": "SELECT id FROM {table_name} WHERE workspace=$1 AND id IN ({ids})",
     "upsert_doc_full": """INSERT INTO LIGHTRAG_DOC_FULL (id, content, workspace)
@@ -3492,7 +3770,7 @@ SQL_TEMPLATES = {
     )
     SELECT source_id as src_id, target_id as tgt_id, EXTRACT(EPOCH FROM create_time)::BIGINT as created_at
     FROM (
-        SELECT r.id, r.source_id, r.target_id, r.create_time, 1 - (r.content_vector <=> '[{embedding_string}]'::vector) as distance
+        SELECT r.id, r.source_id, r.target_id, r.create_time, 1 - (r.content_vector <=> $5::vector) as distance
         FROM LIGHTRAG_VDB_RELATION r
         JOIN relevant_chunks c ON c.chunk_id = ANY(r.chunk_ids)
         WHERE r.workspace=$1
@@ -3509,7 +3787,7 @@ SQL_TEMPLATES = {
         )
         SELECT entity_name, EXTRACT(EPOCH FROM create_time)::BIGINT as created_at FROM
             (
-                SELECT e.id, e.entity_name, e.create_time, 1 - (e.content_vector <=> '[{embedding_string}]'::vector) as distance
+                SELECT e.id, e.entity_name, e.create_time, 1 - (e.content_vector <=> $5::vector) as distance
                 FROM LIGHTRAG_VDB_ENTITY e
                 JOIN relevant_chunks c ON c.chunk_id = ANY(e.chunk_ids)
                 WHERE e.workspace=$1
@@ -3526,7 +3804,7 @@ SQL_TEMPLATES = {
         )
         SELECT id, content, file_path, EXTRACT(EPOCH FROM create_time)::BIGINT as created_at FROM
             (
-                SELECT id, content, file_path, create_time, 1 - (content_vector <=> '[{embedding_string}]'::vector) as distance
+                SELECT id, content, file_path, create_time, 1 - (content_vector <=> $5::vector) as distance
                 FROM LIGHTRAG_VDB_CHUNKS
                 WHERE workspace=$1
                 AND id IN (SELECT chunk_id FROM relevant_chunks)
@@ -259,12 +259,11 @@ class RedisKVStorage(BaseKVStorage):
 
     @redis_retry
     async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        if not ids:
+            return []
         async with self._get_redis_connection() as redis:
             try:
-                pipe = redis.pipeline()
-                for id in ids:
-                    pipe.get(f"{self.namespace}:{id}")
-                results = await pipe.execute()
+                results = await redis.mget([f"{self.namespace}:{id}" for id in ids])
 
                 processed_results = []
                 for result in results:
@@ -701,12 +700,11 @@ class RedisDocStatusStorage(DocStatusStorage):
 
     async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
         result: list[dict[str, Any]] = []
+        if not ids:
+            return result
         async with self._get_redis_connection() as redis:
             try:
-                pipe = redis.pipeline()
-                for id in ids:
-                    pipe.get(f"{self.namespace}:{id}")
-                results = await pipe.execute()
+                results = await redis.mget([f"{self.namespace}:{id}" for id in ids])
 
                 for result_data in results:
                     if result_data:
@@ -786,12 +784,6 @@ class RedisDocStatusStorage(DocStatusStorage):
 
                                         # Make a copy of the data to avoid modifying the original
                                         data = doc_data.copy()
-                                        # If content is missing, use content_summary as content
-                                        if (
-                                            "content" not in data
-                                            and "content_summary" in data
-                                        ):
-                                            data["content"] = data["content_summary"]
                                         # If file_path is not in data, use document id as file path
                                         if "file_path" not in data:
                                             data["file_path"] = "no-file-path"
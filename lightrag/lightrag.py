@@ -4,6 +4,7 @@ import traceback
 import asyncio
 import configparser
 import os
+import sys
 import time
 import warnings
 from dataclasses import asdict, dataclass, field
@@ -31,6 +32,7 @@ from lightrag.constants import (
     DEFAULT_MAX_TOTAL_TOKENS,
     DEFAULT_COSINE_THRESHOLD,
     DEFAULT_RELATED_CHUNK_NUMBER,
+    DOC_STATUS_CONTENT_MIGRATED_KEY,
 )
 from lightrag.utils import get_env_value
 
@@ -66,6 +68,7 @@ from .operate import (
     kg_query,
     naive_query,
     query_with_keywords,
+    warm_prompt_token_counts,
     _rebuild_knowledge_from_chunks,
 )
 from .constants import GRAPH_FIELD_SEP
@@ -73,6 +76,9 @@ from .utils import (
     Tokenizer,
     TiktokenTokenizer,
     EmbeddingFunc,
+    EmbeddingBatcher,
+    EmbeddingCache,
+    SemanticQueryCache,
     always_get_an_event_loop,
     compute_mdhash_id,
     convert_response_to_json,
@@ -245,6 +251,11 @@ class LightRAG:
     embedding_batch_num: int = field(default=int(os.getenv("EMBEDDING_BATCH_NUM", 10)))
     """Batch size for embedding computations."""
 
+    embedding_batch_wait_ms: float = field(
+        default=float(os.getenv("EMBEDDING_BATCH_WAIT_MS", 5))
+    )
+    """Time window in milliseconds for coalescing concurrent embedding calls into one batch of up to embedding_batch_num texts. 0 disables coalescing."""
+
     embedding_func_max_async: int = field(
         default=int(os.getenv("EMBEDDING_FUNC_MAX_ASYNC", 8))
     )
@@ -255,12 +266,23 @@ class LightRAG:
             "enabled": False,
             "similarity_threshold": 0.95,
             "use_llm_check": False,
+            "max_entries": 100_000,
+            "precision": "int8",
+            "query_cache_enabled": False,
+            "query_cache_ttl": 0,
+            "query_cache_max_entries": 10_000,
         }
     )
     """Configuration for embedding cache.
     - enabled: If True, enables caching to avoid redundant computations.
     - similarity_threshold: Minimum similarity score to use cached embeddings.
     - use_llm_check: If True, validates cached embeddings using an LLM.
+    - max_entries: Maximum number of cached vectors, least recently used ones are evicted.
+    - precision: Storage format of cached vectors, "int8" (quantized) or "float16".
+    - model_name: Embedding model identity used in cache keys, derived from embedding_func when unset (lambdas wrapping the model call should set it).
+    - query_cache_enabled: If True, near-duplicate queries (above similarity_threshold) are answered from the LLM response cache.
+    - query_cache_ttl: Seconds before a cached query response expires, 0 disables expiry.
+    - query_cache_max_entries: Maximum number of cached queries indexed per query mode.
     """
 
     # LLM Configuration
@@ -396,6 +418,13 @@ class LightRAG:
                 self.tokenizer = TiktokenTokenizer(self.tiktoken_model_name)
             else:
                 self.tokenizer = TiktokenTokenizer()
+        elif not isinstance(self.tokenizer, Tokenizer):
+            # Wrap bare tokenizers (e.g. HuggingFace) to get cached token counting
+            self.tokenizer = Tokenizer(
+                model_name=getattr(self.tokenizer, "name_or_path", "custom"),
+                tokenizer=self.tokenizer,
+            )
+        warm_prompt_token_counts(self.tokenizer)
 
         # Fix global_config now
         global_config = asdict(self)
@@ -408,6 +437,16 @@ class LightRAG:
             self.embedding_func_max_async
         )(self.embedding_func)
 
+        # Coalesce the many single-text calls made while merging entities and relations
+        self.embedding_batcher: EmbeddingBatcher | None = None
+        if self.embedding_batch_wait_ms > 0:
+            self.embedding_batcher = EmbeddingBatcher(
+                self.embedding_func,
+                batch_size=self.embedding_batch_num,
+                wait_ms=self.embedding_batch_wait_ms,
+            )
+            self.embedding_func = self.embedding_batcher.wrap()
+
         # Initialize all storages
         self.key_string_value_json_storage_cls: type[BaseKVStorage] = (
             self._get_storage_class(self.kv_storage)
@@ -438,6 +477,34 @@ class LightRAG:
             embedding_func=self.embedding_func,
         )
 
+        # Init Embedding Cache, stored in the LLM response cache so any KV backend works
+        self.embedding_cache: EmbeddingCache | None = None
+        if self.embedding_cache_config.get("enabled"):
+            self.embedding_cache = EmbeddingCache(
+                self.embedding_func,
+                self.llm_response_cache,
+                max_entries=self.embedding_cache_config.get("max_entries", 100_000),
+                precision=self.embedding_cache_config.get("precision", "int8"),
+                model_name=self.embedding_cache_config.get("model_name"),
+            )
+            self.embedding_func = self.embedding_cache.wrap()
+
+        # Init Semantic Query Cache, looked up by handle_cache through the LLM response cache
+        self.semantic_query_cache: SemanticQueryCache | None = None
+        if self.embedding_cache_config.get("query_cache_enabled"):
+            self.semantic_query_cache = SemanticQueryCache(
+                self.embedding_func,
+                self.llm_response_cache,
+                similarity_threshold=self.embedding_cache_config.get(
+                    "similarity_threshold", 0.95
+                ),
+                ttl=self.embedding_cache_config.get("query_cache_ttl", 0),
+                max_entries=self.embedding_cache_config.get(
+                    "query_cache_max_entries", 10_000
+                ),
+            )
+            self.llm_response_cache.semantic_cache = self.semantic_query_cache
+
         self.full_docs: BaseKVStorage = self.key_string_value_json_storage_cls(  # type: ignore
             namespace=NameSpace.KV_STORE_FULL_DOCS,
             workspace=self.workspace,
@@ -550,12 +617,68 @@ class LightRAG:
 
             await asyncio.gather(*tasks)
 
+            await self._migrate_doc_status_content()
+
+            if self.semantic_query_cache is not None:
+                await self.semantic_query_cache.initialize()
+
             self._storages_status = StoragesStatus.INITIALIZED
             logger.debug("Initialized Storages")
 
+    async def _migrate_doc_status_content(self):
+        """Move document content out of doc status records into full_docs
+
+        Older versions kept a full copy of the content in every doc status record.
+        Records now hold metadata only and reference full_docs by document id. The
+        scan over all doc status records runs once, a marker record in full_docs
+        skips it on later startups.
+        """
+        if await self.full_docs.get_by_id(DOC_STATUS_CONTENT_MIGRATED_KEY):
+            return
+
+        legacy_docs: dict[str, DocProcessingStatus] = {}
+        for docs in await asyncio.gather(
+            *(self.doc_status.get_docs_by_status(status) for status in DocStatus)
+        ):
+            legacy_docs.update(
+                {doc_id: doc for doc_id, doc in docs.items() if doc.content}
+            )
+        if not legacy_docs:
+            await self._mark_doc_status_content_migrated()
+            return
+
+        missing_ids = await self.full_docs.filter_keys(set(legacy_docs))
+        if missing_ids:
+            await self.full_docs.upsert(
+                {
+                    doc_id: {"content": legacy_docs[doc_id].content}
+                    for doc_id in missing_ids
+                }
+            )
+        await self.doc_status.upsert(
+            {
+                doc_id: {k: v for k, v in asdict(doc).items() if k != "content"}
+                for doc_id, doc in legacy_docs.items()
+            }
+        )
+        await self.full_docs.index_done_callback()
+        await self.doc_status.index_done_callback()
+        # Marked only after the records were rewritten, an interrupted run repeats
+        await self._mark_doc_status_content_migrated()
+        logger.info(
+            f"Moved content of {len(legacy_docs)} doc status records to full_docs"
+        )
+
+    async def _mark_doc_status_content_migrated(self):
+        await self.full_docs.upsert({DOC_STATUS_CONTENT_MIGRATED_KEY: {"content": ""}})
+        await self.full_docs.index_done_callback()
+
     async def finalize_storages(self):
         """Asynchronously finalize the storages"""
         if self._storages_status == StoragesStatus.INITIALIZED:
+            if self.embedding_cache is not None:
+                await self.embedding_cache.index_done_callback()
+
             tasks = []
 
             for storage in (
@@ -573,6 +696,14 @@ class LightRAG:
 
             await asyncio.gather(*tasks)
 
+            # Release pooled LLM clients only if the binding was actually loaded
+            openai_binding = sys.modules.get("lightrag.llm.openai")
+            if openai_binding is not None:
+                await openai_binding.close_openai_async_clients()
+            rerank_module = sys.modules.get("lightrag.rerank")
+            if rerank_module is not None:
+                await rerank_module.close_rerank_sessions()
+
             self._storages_status = StoragesStatus.FINALIZED
             logger.debug("Finalized Storages")
 
@@ -827,7 +958,6 @@ class LightRAG:
         new_docs: dict[str, Any] = {
             id_: {
                 "status": DocStatus.PENDING,
-                "content": content_data["content"],
                 "content_summary": get_content_summary(content_data["content"]),
                 "content_length": len(content_data["content"]),
                 "created_at": datetime.now(timezone.utc).isoformat(),
@@ -867,7 +997,10 @@ class LightRAG:
             logger.info("No new unique documents were found.")
             return
 
-        # 5. Store status document
+        # 5. Store content in full_docs first, status documents only reference it by id
+        await self.full_docs.upsert(
+            {doc_id: {"content": contents[doc_id]["content"]} for doc_id in new_docs}
+        )
         await self.doc_status.upsert(new_docs)
         logger.info(f"Stored {len(new_docs)} new unique documents")
 
@@ -895,16 +1028,7 @@ class LightRAG:
         async with pipeline_status_lock:
             # Ensure only one worker is processing documents
             if not pipeline_status.get("busy", False):
-                processing_docs, failed_docs, pending_docs = await asyncio.gather(
-                    self.doc_status.get_docs_by_status(DocStatus.PROCESSING),
-                    self.doc_status.get_docs_by_status(DocStatus.FAILED),
-                    self.doc_status.get_docs_by_status(DocStatus.PENDING),
-                )
-
-                to_process_docs: dict[str, DocProcessingStatus] = {}
-                to_process_docs.update(processing_docs)
-                to_process_docs.update(failed_docs)
-                to_process_docs.update(pending_docs)
+                to_process_docs = await self._get_docs_to_process()
 
                 if not to_process_docs:
                     logger.info("No documents to process")
@@ -987,12 +1111,20 @@ class LightRAG:
                     async with semaphore:
                         nonlocal processed_count
                         current_file_number = 0
+                        first_stage_tasks = []
+                        entity_relation_task = None
                         try:
                             # Get file path from status document
                             file_path = getattr(
                                 status_doc, "file_path", "unknown_source"
                             )
 
+                            # Content is not part of the listing, load it only now
+                            if status_doc.content is None:
+                                status_doc.content = await self._get_doc_content(
+                                    doc_id
+                                )
+
                             async with pipeline_status_lock:
                                 # Update processed file count and save current file number
                                 processed_count += 1
@@ -1042,7 +1174,6 @@ class LightRAG:
                                             "chunks_list": list(
                                                 chunks.keys()
                                             ),  # Save chunks list
-                                            "content": status_doc.content,
                                             "content_summary": status_doc.content_summary,
                                             "content_length": status_doc.content_length,
                                             "created_at": status_doc.created_at,
@@ -1057,11 +1188,6 @@ class LightRAG:
                             chunks_vdb_task = asyncio.create_task(
                                 self.chunks_vdb.upsert(chunks)
                             )
-                            full_docs_task = asyncio.create_task(
-                                self.full_docs.upsert(
-                                    {doc_id: {"content": status_doc.content}}
-                                )
-                            )
                             text_chunks_task = asyncio.create_task(
                                 self.text_chunks.upsert(chunks)
                             )
@@ -1070,7 +1196,6 @@ class LightRAG:
                             first_stage_tasks = [
                                 doc_status_task,
                                 chunks_vdb_task,
-                                full_docs_task,
                                 text_chunks_task,
                             ]
                             entity_relation_task = None
@@ -1119,7 +1244,6 @@ class LightRAG:
                                     doc_id: {
                                         "status": DocStatus.FAILED,
                                         "error": str(e),
-                                        "content": status_doc.content,
                                         "content_summary": status_doc.content_summary,
                                         "content_length": status_doc.content_length,
                                         "created_at": status_doc.created_at,
@@ -1158,7 +1282,6 @@ class LightRAG:
                                             "chunks_list": list(
                                                 chunks.keys()
                                             ),  # 保留 chunks_list
-                                            "content": status_doc.content,
                                             "content_summary": status_doc.content_summary,
                                             "content_length": status_doc.content_length,
                                             "created_at": status_doc.created_at,
@@ -1205,7 +1328,6 @@ class LightRAG:
                                         doc_id: {
                                             "status": DocStatus.FAILED,
                                             "error": str(e),
-                                            "content": status_doc.content,
                                             "content_summary": status_doc.content_summary,
                                             "content_length": status_doc.content_length,
                                             "created_at": status_doc.created_at,
@@ -1250,16 +1372,7 @@ class LightRAG:
                 pipeline_status["history_messages"].append(log_message)
 
                 # Check for pending documents again
-                processing_docs, failed_docs, pending_docs = await asyncio.gather(
-                    self.doc_status.get_docs_by_status(DocStatus.PROCESSING),
-                    self.doc_status.get_docs_by_status(DocStatus.FAILED),
-                    self.doc_status.get_docs_by_status(DocStatus.PENDING),
-                )
-
-                to_process_docs = {}
-                to_process_docs.update(processing_docs)
-                to_process_docs.update(failed_docs)
-                to_process_docs.update(pending_docs)
+                to_process_docs = await self._get_docs_to_process()
 
         finally:
             log_message = "Document processing pipeline completed"
@@ -1270,6 +1383,36 @@ class LightRAG:
                 pipeline_status["latest_message"] = log_message
                 pipeline_status["history_messages"].append(log_message)
 
+    async def _get_docs_to_process(self) -> dict[str, DocProcessingStatus]:
+        """List processing, failed and pending documents without their content"""
+        processing_docs, failed_docs, pending_docs = await asyncio.gather(
+            *(
+                self.doc_status.get_docs_paginated(status, page_size=None)
+                for status in (
+                    DocStatus.PROCESSING,
+                    DocStatus.FAILED,
+                    DocStatus.PENDING,
+                )
+            )
+        )
+
+        to_process_docs: dict[str, DocProcessingStatus] = {}
+        to_process_docs.update(processing_docs[0])
+        to_process_docs.update(failed_docs[0])
+        to_process_docs.update(pending_docs[0])
+        return to_process_docs
+
+    async def _get_doc_content(self, doc_id: str) -> str:
+        """Load the full content of a document from full_docs"""
+        full_doc = await self.full_docs.get_by_id(doc_id)
+        if full_doc and full_doc.get("content") is not None:
+            return full_doc["content"]
+        # Records of older versions may still carry the content themselves
+        status_record = await self.doc_status.get_by_id(doc_id)
+        if status_record and status_record.get("content"):
+            return status_record["content"]
+        raise ValueError(f"Content of document {doc_id} not found")
+
     async def _process_entity_relation_graph(
         self, chunk: dict[str, Any], pipeline_status=None, pipeline_status_lock=None
     ) -> list:
@@ -1294,6 +1437,9 @@ class LightRAG:
     async def _insert_done(
         self, pipeline_status=None, pipeline_status_lock=None
     ) -> None:
+        if self.embedding_cache is not None:
+            await self.embedding_cache.index_done_callback()
+
         tasks = [
             cast(StorageNameSpace, storage_inst).index_done_callback()
             for storage_inst in [  # type: ignore
@@ -1637,14 +1783,16 @@ class LightRAG:
         return response
 
     async def _query_done(self):
+        if self.embedding_cache is not None:
+            await self.embedding_cache.index_done_callback()
         await self.llm_response_cache.index_done_callback()
 
     async def aclear_cache(self, modes: list[str] | None = None) -> None:
         """Clear cache data from the LLM response cache storage.
 
         Args:
-            modes (list[str] | None): Modes of cache to clear. Options: ["default", "naive", "local", "global", "hybrid", "mix"].
-                             "default" represents extraction cache.
+            modes (list[str] | None): Modes of cache to clear. Options: ["default", "naive", "local", "global", "hybrid", "mix", "embedding"].
+                             "default" represents extraction cache, "embedding" the embedding cache.
                              If None, clears all cache.
 
         Example:
@@ -1661,7 +1809,15 @@ class LightRAG:
             logger.warning("No cache storage configured")
             return
 
-        valid_modes = ["default", "naive", "local", "global", "hybrid", "mix"]
+        valid_modes = [
+            "default",
+            "naive",
+            "local",
+            "global",
+            "hybrid",
+            "mix",
+            EmbeddingCache.MODE,
+        ]
 
         # Validate input
         if modes and not all(mode in valid_modes for mode in modes):
@@ -1702,6 +1858,20 @@ class LightRAG:
         """
         return await self.doc_status.get_docs_by_status(status)
 
+    async def aget_docs_paginated(
+        self,
+        status: DocStatus | None = None,
+        page: int = 1,
+        page_size: int | None = 50,
+    ) -> tuple[dict[str, DocProcessingStatus], int]:
+        """Get one page of documents without their content, newest first
+
+        Returns:
+            Tuple of (dict with document id as keys and document status as values,
+            total number of matching documents)
+        """
+        return await self.doc_status.get_docs_paginated(status, page, page_size)
+
     async def aget_docs_by_ids(
         self, ids: str | list[str]
     ) -> dict[str, DocProcessingStatus]:
@@ -26,6 +26,7 @@ from lightrag.utils import (
     locate_json_string_body_from_string,
     safe_unicode_decode,
 )
+from lightrag.llm.openai import create_embeddings
 
 import numpy as np
 
@@ -135,6 +136,7 @@ async def azure_openai_embed(
     base_url: str | None = None,
     api_key: str | None = None,
     api_version: str | None = None,
+    encoding_format: str | None = None,
 ) -> np.ndarray:
     deployment = (
         os.getenv("AZURE_EMBEDDING_DEPLOYMENT")
@@ -164,7 +166,6 @@ async def azure_openai_embed(
         api_version=api_version,
     )
 
-    response = await openai_async_client.embeddings.create(
-        model=model, input=texts, encoding_format="float"
+    return await create_embeddings(
+        openai_async_client, texts, model, encoding_format=encoding_format
     )
-    return np.array([dp.embedding for dp in response.data])
@@ -28,6 +28,7 @@ from tenacity import (
 from lightrag.utils import (
     wrap_embedding_func_with_attrs,
 )
+from lightrag.llm.openai import create_embeddings
 
 
 import numpy as np
@@ -49,7 +50,7 @@ async def nvidia_openai_embed(
     api_key: str = None,
     input_type: str = "passage",  # query for retrieval, passage for embedding
     trunc: str = "NONE",  # NONE or START or END
-    encode: str = "float",  # float or base64
+    encode: str | None = None,  # float or base64, EMBEDDING_ENCODING_FORMAT if None
 ) -> np.ndarray:
     if api_key:
         os.environ["OPENAI_API_KEY"] = api_key
@@ -57,10 +58,10 @@ async def nvidia_openai_embed(
     openai_async_client = (
         AsyncOpenAI() if base_url is None else AsyncOpenAI(base_url=base_url)
     )
-    response = await openai_async_client.embeddings.create(
-        model=model,
-        input=texts,
+    return await create_embeddings(
+        openai_async_client,
+        texts,
+        model,
         encoding_format=encode,
         extra_body={"input_type": input_type, "truncate": trunc},
     )
-    return np.array([dp.embedding for dp in response.data])
@@ -1,6 +1,7 @@
 from ..utils import verbose_debug, VERBOSE_DEBUG
 import sys
 import os
+import asyncio
 import logging
 
 if sys.version_info < (3, 9):
@@ -13,8 +14,11 @@ import pipmaster as pm  # Pipmaster for dynamic library install
 if not pm.is_installed("openai"):
     pm.install("openai")
 
+import httpx
 from openai import (
     AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    BadRequestError,
     APIConnectionError,
     RateLimitError,
     APITimeoutError,
@@ -29,6 +33,8 @@ from lightrag.utils import (
     wrap_embedding_func_with_attrs,
     locate_json_string_body_from_string,
     safe_unicode_decode,
+    decode_embeddings,
+    get_env_value,
     logger,
 )
 from lightrag.types import GPTKeywordExtractionFormat
@@ -96,6 +102,92 @@ def create_openai_async_client(
     return AsyncOpenAI(**merged_configs)
 
 
+# Long-lived clients keyed by (event loop, base_url, api_key, client_configs)
+_openai_async_clients: dict[
+    tuple, tuple[asyncio.AbstractEventLoop, AsyncOpenAI]
+] = {}
+
+
+def _create_pooled_http_client() -> httpx.AsyncClient:
+    """HTTP client with connection-pool limits tunable from the environment"""
+    limits = httpx.Limits(
+        max_connections=get_env_value("OPENAI_MAX_CONNECTIONS", 100, int),
+        max_keepalive_connections=get_env_value(
+            "OPENAI_MAX_KEEPALIVE_CONNECTIONS", 20, int
+        ),
+        keepalive_expiry=get_env_value("OPENAI_KEEPALIVE_EXPIRY", 30.0, float),
+    )
+    return DefaultAsyncHttpxClient(
+        limits=limits, http2=get_env_value("OPENAI_HTTP2", False, bool)
+    )
+
+
+def get_openai_async_client(
+    api_key: str | None = None,
+    base_url: str | None = None,
+    client_configs: dict[str, Any] = None,
+) -> AsyncOpenAI:
+    """Return a pooled AsyncOpenAI client, creating it on first use.
+
+    Clients are reused across calls so HTTP keep-alive, TLS sessions and HTTP/2
+    streams survive between requests. They are bound to the running event loop
+    and released by `close_openai_async_clients`.
+
+    Args:
+        api_key: OpenAI API key. If None, uses the OPENAI_API_KEY environment variable.
+        base_url: Base URL for the OpenAI API. If None, uses the default OpenAI API URL.
+        client_configs: Additional configuration options for the AsyncOpenAI client.
+
+    Returns:
+        A shared AsyncOpenAI client instance.
+    """
+    loop = asyncio.get_running_loop()
+    client_configs = client_configs or {}
+    key = (
+        id(loop),
+        base_url or os.environ.get("OPENAI_API_BASE", "https://api.openai.com/v1"),
+        api_key or os.environ.get("OPENAI_API_KEY"),
+        repr(sorted(client_configs.items())),
+    )
+
+    # Drop clients whose event loop is gone, their connections cannot be reused
+    stale_keys = [
+        k
+        for k, (client_loop, _) in _openai_async_clients.items()
+        if client_loop.is_closed()
+    ]
+    for stale_key in stale_keys:
+        _openai_async_clients.pop(stale_key, None)
+
+    entry = _openai_async_clients.get(key)
+    if entry is not None and not entry[1].is_closed():
+        return entry[1]
+
+    if "http_client" not in client_configs:
+        client_configs = {
+            **client_configs,
+            "http_client": _create_pooled_http_client(),
+        }
+    client = create_openai_async_client(
+        api_key=api_key, base_url=base_url, client_configs=client_configs
+    )
+    _openai_async_clients[key] = (loop, client)
+    return client
+
+
+async def close_openai_async_clients() -> None:
+    """Close every pooled client created on the running event loop"""
+    loop = asyncio.get_running_loop()
+    for key, (client_loop, client) in list(_openai_async_clients.items()):
+        if client_loop is not loop:
+            continue
+        _openai_async_clients.pop(key, None)
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning(f"Failed to close OpenAI client: {e}")
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -152,8 +244,8 @@ async def openai_complete_if_cache(
     # Extract client configuration options
     client_configs = kwargs.pop("openai_client_configs", {})
 
-    # Create the OpenAI client
-    openai_async_client = create_openai_async_client(
+    # Reuse the pooled OpenAI client
+    openai_async_client = get_openai_async_client(
         api_key=api_key, base_url=base_url, client_configs=client_configs
     )
 
@@ -190,21 +282,17 @@ async def openai_complete_if_cache(
             )
     except APIConnectionError as e:
         logger.error(f"OpenAI API Connection Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except RateLimitError as e:
         logger.error(f"OpenAI API Rate Limit Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except APITimeoutError as e:
         logger.error(f"OpenAI API Timeout Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except Exception as e:
         logger.error(
             f"OpenAI API Call Failed,\nModel: {model},\nParams: {kwargs}, Got: {e}"
         )
-        await openai_async_client.close()  # Ensure client is closed
         raise
 
     if hasattr(response, "__aiter__"):
@@ -273,8 +361,6 @@ async def openai_complete_if_cache(
                         logger.warning(
                             f"Failed to close stream response: {close_error}"
                         )
-                # Ensure client is closed in case of exception
-                await openai_async_client.close()
                 raise
             finally:
                 # Ensure resources are released even if no exception occurs
@@ -291,58 +377,39 @@ async def openai_complete_if_cache(
                             f"Failed to close stream response in finally block: {close_error}"
                         )
 
-                # This prevents resource leaks since the caller doesn't handle closing
-                try:
-                    await openai_async_client.close()
-                    logger.debug(
-                        "Successfully closed OpenAI client for streaming response"
-                    )
-                except Exception as client_close_error:
-                    logger.warning(
-                        f"Failed to close OpenAI client in streaming finally block: {client_close_error}"
-                    )
-
         return inner()
 
     else:
-        try:
-            if (
-                not response
-                or not response.choices
-                or not hasattr(response.choices[0], "message")
-                or not hasattr(response.choices[0].message, "content")
-            ):
-                logger.error("Invalid response from OpenAI API")
-                await openai_async_client.close()  # Ensure client is closed
-                raise InvalidResponseError("Invalid response from OpenAI API")
-
-            content = response.choices[0].message.content
-
-            if not content or content.strip() == "":
-                logger.error("Received empty content from OpenAI API")
-                await openai_async_client.close()  # Ensure client is closed
-                raise InvalidResponseError("Received empty content from OpenAI API")
-
-            if r"\u" in content:
-                content = safe_unicode_decode(content.encode("utf-8"))
-
-            if token_tracker and hasattr(response, "usage"):
-                token_counts = {
-                    "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
-                    "completion_tokens": getattr(
-                        response.usage, "completion_tokens", 0
-                    ),
-                    "total_tokens": getattr(response.usage, "total_tokens", 0),
-                }
-                token_tracker.add_usage(token_counts)
-
-            logger.debug(f"Response content len: {len(content)}")
-            verbose_debug(f"Response: {response}")
-
-            return content
-        finally:
-            # Ensure client is closed in all cases for non-streaming responses
-            await openai_async_client.close()
+        if (
+            not response
+            or not response.choices
+            or not hasattr(response.choices[0], "message")
+            or not hasattr(response.choices[0].message, "content")
+        ):
+            logger.error("Invalid response from OpenAI API")
+            raise InvalidResponseError("Invalid response from OpenAI API")
+
+        content = response.choices[0].message.content
+
+        if not content or content.strip() == "":
+            logger.error("Received empty content from OpenAI API")
+            raise InvalidResponseError("Received empty content from OpenAI API")
+
+        if r"\u" in content:
+            content = safe_unicode_decode(content.encode("utf-8"))
+
+        if token_tracker and hasattr(response, "usage"):
+            token_counts = {
+                "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
+                "completion_tokens": getattr(response.usage, "completion_tokens", 0),
+                "total_tokens": getattr(response.usage, "total_tokens", 0),
+            }
+            token_tracker.add_usage(token_counts)
+
+        logger.debug(f"Response content len: {len(content)}")
+        verbose_debug(f"Response: {response}")
+
+        return content
 
 
 async def openai_complete(
@@ -432,6 +499,62 @@ async def nvidia_openai_complete(
     return result
 
 
+# Base URLs that rejected encoding_format="base64"; they are served in float mode
+_base64_unsupported_endpoints: set[str] = set()
+
+
+async def create_embeddings(
+    client: Any,
+    texts: list[str],
+    model: str,
+    encoding_format: str | None = None,
+    **kwargs: Any,
+) -> np.ndarray:
+    """Call `client.embeddings.create` and decode the result into a float32 matrix.
+
+    With encoding_format="base64" the vectors travel as packed float32 and are
+    decoded with np.frombuffer instead of parsing JSON floats. Endpoints that
+    refuse base64 are remembered and retried in float mode.
+
+    Args:
+        client: An AsyncOpenAI compatible client (OpenAI, Azure, NVIDIA, ...).
+        texts: List of texts to embed.
+        model: The embedding model to use.
+        encoding_format: "base64" or "float". If None, uses the
+            EMBEDDING_ENCODING_FORMAT environment variable (default "float").
+        **kwargs: Additional keyword arguments passed to `embeddings.create`.
+
+    Returns:
+        A numpy array of embeddings, one per input text.
+    """
+    encoding_format = encoding_format or get_env_value(
+        "EMBEDDING_ENCODING_FORMAT", "float"
+    )
+    endpoint = str(client.base_url)
+    if encoding_format == "base64" and endpoint in _base64_unsupported_endpoints:
+        encoding_format = "float"
+
+    try:
+        response = await client.embeddings.create(
+            model=model, input=texts, encoding_format=encoding_format, **kwargs
+        )
+    except BadRequestError as e:
+        # Only a rejected encoding falls back, other bad requests are genuine errors
+        message = str(e).lower()
+        if encoding_format != "base64" or not (
+            "encoding_format" in message or "base64" in message
+        ):
+            raise
+        logger.warning(
+            f"Embedding endpoint {endpoint} rejected base64 encoding, falling back to float"
+        )
+        _base64_unsupported_endpoints.add(endpoint)
+        response = await client.embeddings.create(
+            model=model, input=texts, encoding_format="float", **kwargs
+        )
+    return decode_embeddings([dp.embedding for dp in response.data])
+
+
 @wrap_embedding_func_with_attrs(embedding_dim=1536, max_token_size=8192)
 @retry(
     stop=stop_after_attempt(3),
@@ -448,6 +571,7 @@ async def openai_embed(
     base_url: str = None,
     api_key: str = None,
     client_configs: dict[str, Any] = None,
+    encoding_format: str | None = None,
 ) -> np.ndarray:
     """Generate embeddings for a list of texts using OpenAI's API.
 
@@ -459,6 +583,8 @@ async def openai_embed(
         client_configs: Additional configuration options for the AsyncOpenAI client.
             These will override any default configurations but will be overridden by
             explicit parameters (api_key, base_url).
+        encoding_format: "base64" to receive packed float32 vectors, or "float".
+            If None, uses the EMBEDDING_ENCODING_FORMAT environment variable.
 
     Returns:
         A numpy array of embeddings, one per input text.
@@ -468,13 +594,11 @@ async def openai_embed(
         RateLimitError: If the OpenAI API rate limit is exceeded.
         APITimeoutError: If the OpenAI API request times out.
     """
-    # Create the OpenAI client
-    openai_async_client = create_openai_async_client(
+    # Reuse the pooled OpenAI client
+    openai_async_client = get_openai_async_client(
         api_key=api_key, base_url=base_url, client_configs=client_configs
     )
 
-    async with openai_async_client:
-        response = await openai_async_client.embeddings.create(
-            model=model, input=texts, encoding_format="float"
-        )
-        return np.array([dp.embedding for dp in response.data])
+    return await create_embeddings(
+        openai_async_client, texts, model, encoding_format=encoding_format
+    )
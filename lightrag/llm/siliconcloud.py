@@ -25,8 +25,8 @@ from tenacity import (
 
 import numpy as np
 import aiohttp
-import base64
-import struct
+
+from lightrag.utils import decode_embeddings
 
 
 @retry(
@@ -52,18 +52,11 @@ async def siliconcloud_embedding(
 
     payload = {"model": model, "input": truncate_texts, "encoding_format": "base64"}
 
-    base64_strings = []
     async with aiohttp.ClientSession() as session:
         async with session.post(base_url, headers=headers, json=payload) as response:
             content = await response.json()
             if "code" in content:
                 raise ValueError(content)
-            base64_strings = [item["embedding"] for item in content["data"]]
 
-    embeddings = []
-    for string in base64_strings:
-        decode_bytes = base64.b64decode(string)
-        n = len(decode_bytes) // 4
-        float_array = struct.unpack("<" + "f" * n, decode_bytes)
-        embeddings.append(float_array)
-    return np.array(embeddings)
+    # Items are base64 float32, or float lists if the server ignored the format
+    return decode_embeddings([item["embedding"] for item in content["data"]])
@@ -35,6 +35,7 @@ from .base import (
     TextChunkSchema,
     QueryParam,
 )
+from .chunk import chunking_by_token_size
 from .prompt import PROMPTS
 from .constants import (
     GRAPH_FIELD_SEP,
@@ -42,6 +43,7 @@ from .constants import (
     DEFAULT_MAX_RELATION_TOKENS,
     DEFAULT_MAX_TOTAL_TOKENS,
     DEFAULT_RELATED_CHUNK_NUMBER,
+    DEFAULT_KV_GET_BATCH_SIZE,
 )
 from .kg.shared_storage import get_storage_keyed_lock
 import time
@@ -53,59 +55,30 @@ from dotenv import load_dotenv
 load_dotenv(dotenv_path=".env", override=False)
 
 
-def chunking_by_token_size(
-    tokenizer: Tokenizer,
-    content: str,
-    split_by_character: str | None = None,
-    split_by_character_only: bool = False,
-    overlap_token_size: int = 128,
-    max_token_size: int = 1024,
-) -> list[dict[str, Any]]:
-    tokens = tokenizer.encode(content)
-    results: list[dict[str, Any]] = []
-    if split_by_character:
-        raw_chunks = content.split(split_by_character)
-        new_chunks = []
-        if split_by_character_only:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                new_chunks.append((len(_tokens), chunk))
-        else:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                if len(_tokens) > max_token_size:
-                    for start in range(
-                        0, len(_tokens), max_token_size - overlap_token_size
-                    ):
-                        chunk_content = tokenizer.decode(
-                            _tokens[start : start + max_token_size]
-                        )
-                        new_chunks.append(
-                            (min(max_token_size, len(_tokens) - start), chunk_content)
-                        )
-                else:
-                    new_chunks.append((len(_tokens), chunk))
-        for index, (_len, chunk) in enumerate(new_chunks):
-            results.append(
-                {
-                    "tokens": _len,
-                    "content": chunk.strip(),
-                    "chunk_order_index": index,
-                }
-            )
-    else:
-        for index, start in enumerate(
-            range(0, len(tokens), max_token_size - overlap_token_size)
-        ):
-            chunk_content = tokenizer.decode(tokens[start : start + max_token_size])
-            results.append(
-                {
-                    "tokens": min(max_token_size, len(tokens) - start),
-                    "content": chunk_content.strip(),
-                    "chunk_order_index": index,
-                }
-            )
-    return results
+async def _get_by_ids_batched(
+    kv_storage: BaseKVStorage,
+    ids: list[str],
+    batch_size: int = DEFAULT_KV_GET_BATCH_SIZE,
+) -> list[dict[str, Any] | None]:
+    """Fetch ids with as few get_by_ids calls as possible
+
+    Ids are split into batches of at most batch_size to keep each multi-get
+    request bounded; batches are fetched concurrently.
+
+    Returns:
+        Values aligned with ids, None for ids that do not exist
+    """
+    if not ids:
+        return []
+    if len(ids) <= batch_size:
+        return list(await kv_storage.get_by_ids(ids))
+    batch_results = await asyncio.gather(
+        *[
+            kv_storage.get_by_ids(ids[i : i + batch_size])
+            for i in range(0, len(ids), batch_size)
+        ]
+    )
+    return [data for batch in batch_results for data in batch]
 
 
 async def _handle_entity_relation_summary(
@@ -332,6 +305,18 @@ async def _rebuild_knowledge_from_chunks(
                 pipeline_status["history_messages"].append(status_message)
         return
 
+    # Fetch file paths of all cached chunks at once instead of once per extraction result
+    cached_chunk_ids = list(cached_results.keys())
+    cached_chunk_data = await _get_by_ids_batched(text_chunks_storage, cached_chunk_ids)
+    chunk_file_paths = {
+        chunk_id: (
+            chunk_data.get("file_path", "unknown_source")
+            if chunk_data
+            else "unknown_source"
+        )
+        for chunk_id, chunk_data in zip(cached_chunk_ids, cached_chunk_data)
+    }
+
     # Process cached results to get entities and relationships for each chunk
     chunk_entities = {}  # chunk_id -> {entity_name: [entity_data]}
     chunk_relationships = {}  # chunk_id -> {(src, tgt): [relationship_data]}
@@ -348,6 +333,7 @@ async def _rebuild_knowledge_from_chunks(
                     text_chunks_storage=text_chunks_storage,
                     extraction_result=extraction_result,
                     chunk_id=chunk_id,
+                    file_path=chunk_file_paths[chunk_id],
                 )
 
                 # Merge entities and relationships from this extraction result
@@ -538,8 +524,9 @@ async def _get_cached_extraction_results(
     all_cache_ids = set()
 
     # Read from storage
-    chunk_data_list = await text_chunks_storage.get_by_ids(list(chunk_ids))
-    for chunk_id, chunk_data in zip(chunk_ids, chunk_data_list):
+    chunk_id_list = list(chunk_ids)
+    chunk_data_list = await _get_by_ids_batched(text_chunks_storage, chunk_id_list)
+    for chunk_id, chunk_data in zip(chunk_id_list, chunk_data_list):
         if chunk_data and isinstance(chunk_data, dict):
             llm_cache_list = chunk_data.get("llm_cache_list", [])
             if llm_cache_list:
@@ -554,7 +541,8 @@ async def _get_cached_extraction_results(
         return cached_results
 
     # Batch get LLM cache entries
-    cache_data_list = await llm_response_cache.get_by_ids(list(all_cache_ids))
+    all_cache_ids = list(all_cache_ids)
+    cache_data_list = await _get_by_ids_batched(llm_response_cache, all_cache_ids)
 
     # Process cache entries and group by chunk_id
     valid_entries = 0
@@ -591,7 +579,10 @@ async def _get_cached_extraction_results(
 
 
 async def _parse_extraction_result(
-    text_chunks_storage: BaseKVStorage, extraction_result: str, chunk_id: str
+    text_chunks_storage: BaseKVStorage,
+    extraction_result: str,
+    chunk_id: str,
+    file_path: str | None = None,
 ) -> tuple[dict, dict]:
     """Parse cached extraction result using the same logic as extract_entities
 
@@ -599,18 +590,20 @@ async def _parse_extraction_result(
         text_chunks_storage: Text chunks storage to get chunk data
         extraction_result: The cached LLM extraction result
         chunk_id: The chunk ID for source tracking
+        file_path: File path of the chunk, looked up from storage when None
 
     Returns:
         Tuple of (entities_dict, relationships_dict)
     """
 
-    # Get chunk data for file_path from storage
-    chunk_data = await text_chunks_storage.get_by_id(chunk_id)
-    file_path = (
-        chunk_data.get("file_path", "unknown_source")
-        if chunk_data
-        else "unknown_source"
-    )
+    if file_path is None:
+        # Get chunk data for file_path from storage
+        chunk_data = await text_chunks_storage.get_by_id(chunk_id)
+        file_path = (
+            chunk_data.get("file_path", "unknown_source")
+            if chunk_data
+            else "unknown_source"
+        )
     context_base = dict(
         tuple_delimiter=PROMPTS["DEFAULT_TUPLE_DELIMITER"],
         record_delimiter=PROMPTS["DEFAULT_RECORD_DELIMITER"],
@@ -928,22 +921,21 @@ async def _rebuild_single_relationship(
     )
 
 
-async def _merge_nodes_then_upsert(
+async def _merge_nodes(
     entity_name: str,
     nodes_data: list[dict],
-    knowledge_graph_inst: BaseGraphStorage,
+    already_node: dict | None,
     global_config: dict,
     pipeline_status: dict = None,
     pipeline_status_lock=None,
     llm_response_cache: BaseKVStorage | None = None,
 ):
-    """Get existing nodes from knowledge graph use name,if exists, merge data, else create, then upsert."""
+    """Merge new entity data with the existing node (if any) into the node record to upsert."""
     already_entity_types = []
     already_source_ids = []
     already_description = []
     already_file_paths = []
 
-    already_node = await knowledge_graph_inst.get_node(entity_name)
     if already_node:
         already_entity_types.append(already_node["entity_type"])
         already_source_ids.extend(
@@ -1013,67 +1005,58 @@ async def _merge_nodes_then_upsert(
         file_path=file_path,
         created_at=int(time.time()),
     )
-    await knowledge_graph_inst.upsert_node(
-        entity_name,
-        node_data=node_data,
-    )
-    node_data["entity_name"] = entity_name
     return node_data
 
 
-async def _merge_edges_then_upsert(
+async def _merge_edges(
     src_id: str,
     tgt_id: str,
     edges_data: list[dict],
-    knowledge_graph_inst: BaseGraphStorage,
+    already_edge: dict | None,
     global_config: dict,
     pipeline_status: dict = None,
     pipeline_status_lock=None,
     llm_response_cache: BaseKVStorage | None = None,
 ):
-    if src_id == tgt_id:
-        return None
-
+    """Merge new relation data with the existing edge (if any) into the edge record to upsert."""
     already_weights = []
     already_source_ids = []
     already_description = []
     already_keywords = []
     already_file_paths = []
 
-    if await knowledge_graph_inst.has_edge(src_id, tgt_id):
-        already_edge = await knowledge_graph_inst.get_edge(src_id, tgt_id)
-        # Handle the case where get_edge returns None or missing fields
-        if already_edge:
-            # Get weight with default 1.0 if missing
-            already_weights.append(already_edge.get("weight", 1.0))
-
-            # Get source_id with empty string default if missing or None
-            if already_edge.get("source_id") is not None:
-                already_source_ids.extend(
-                    split_string_by_multi_markers(
-                        already_edge["source_id"], [GRAPH_FIELD_SEP]
-                    )
+    # Handle the case where the edge is missing or has missing fields
+    if already_edge:
+        # Get weight with default 1.0 if missing
+        already_weights.append(already_edge.get("weight", 1.0))
+
+        # Get source_id with empty string default if missing or None
+        if already_edge.get("source_id") is not None:
+            already_source_ids.extend(
+                split_string_by_multi_markers(
+                    already_edge["source_id"], [GRAPH_FIELD_SEP]
                 )
+            )
 
-            # Get file_path with empty string default if missing or None
-            if already_edge.get("file_path") is not None:
-                already_file_paths.extend(
-                    split_string_by_multi_markers(
-                        already_edge["file_path"], [GRAPH_FIELD_SEP]
-                    )
+        # Get file_path with empty string default if missing or None
+        if already_edge.get("file_path") is not None:
+            already_file_paths.extend(
+                split_string_by_multi_markers(
+                    already_edge["file_path"], [GRAPH_FIELD_SEP]
                 )
+            )
 
-            # Get description with empty string default if missing or None
-            if already_edge.get("description") is not None:
-                already_description.append(already_edge["description"])
+        # Get description with empty string default if missing or None
+        if already_edge.get("description") is not None:
+            already_description.append(already_edge["description"])
 
-            # Get keywords with empty string default if missing or None
-            if already_edge.get("keywords") is not None:
-                already_keywords.extend(
-                    split_string_by_multi_markers(
-                        already_edge["keywords"], [GRAPH_FIELD_SEP]
-                    )
+        # Get keywords with empty string default if missing or None
+        if already_edge.get("keywords") is not None:
+            already_keywords.extend(
+                split_string_by_multi_markers(
+                    already_edge["keywords"], [GRAPH_FIELD_SEP]
                 )
+            )
 
     # Process edges_data with None checks
     weight = sum([dp["weight"] for dp in edges_data] + already_weights)
@@ -1114,20 +1097,6 @@ async def _merge_edges_then_upsert(
         )
     )
 
-    for need_insert_id in [src_id, tgt_id]:
-        if not (await knowledge_graph_inst.has_node(need_insert_id)):
-            await knowledge_graph_inst.upsert_node(
-                need_insert_id,
-                node_data={
-                    "entity_id": need_insert_id,
-                    "source_id": source_id,
-                    "description": description,
-                    "entity_type": "UNKNOWN",
-                    "file_path": file_path,
-                    "created_at": int(time.time()),
-                },
-            )
-
     force_llm_summary_on_merge = global_config["force_llm_summary_on_merge"]
 
     num_fragment = description.count(GRAPH_FIELD_SEP) + 1
@@ -1157,29 +1126,14 @@ async def _merge_edges_then_upsert(
                     pipeline_status["latest_message"] = status_message
                     pipeline_status["history_messages"].append(status_message)
 
-    await knowledge_graph_inst.upsert_edge(
-        src_id,
-        tgt_id,
-        edge_data=dict(
-            weight=weight,
-            description=description,
-            keywords=keywords,
-            source_id=source_id,
-            file_path=file_path,
-            created_at=int(time.time()),
-        ),
-    )
-
     edge_data = dict(
-        src_id=src_id,
-        tgt_id=tgt_id,
+        weight=weight,
         description=description,
         keywords=keywords,
         source_id=source_id,
         file_path=file_path,
         created_at=int(time.time()),
     )
-
     return edge_data
 
 
@@ -1245,109 +1199,184 @@ async def merge_nodes_and_edges(
         pipeline_status["latest_message"] = log_message
         pipeline_status["history_messages"].append(log_message)
 
-    async def _locked_process_entity_name(entity_name, entities):
-        async with semaphore:
-            workspace = global_config.get("workspace", "")
-            namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
-            async with get_storage_keyed_lock(
-                [entity_name], namespace=namespace, enable_logging=False
-            ):
-                entity_data = await _merge_nodes_then_upsert(
-                    entity_name,
-                    entities,
-                    knowledge_graph_inst,
-                    global_config,
-                    pipeline_status,
-                    pipeline_status_lock,
-                    llm_response_cache,
-                )
-                if entity_vdb is not None:
-                    data_for_vdb = {
-                        compute_mdhash_id(entity_data["entity_name"], prefix="ent-"): {
-                            "entity_name": entity_data["entity_name"],
-                            "entity_type": entity_data["entity_type"],
-                            "content": f"{entity_data['entity_name']}\n{entity_data['description']}",
-                            "source_id": entity_data["source_id"],
-                            "file_path": entity_data.get("file_path", "unknown_source"),
-                        }
-                    }
-                    await entity_vdb.upsert(data_for_vdb)
-                return entity_data
-
-    async def _locked_process_edges(edge_key, edges):
-        async with semaphore:
-            workspace = global_config.get("workspace", "")
-            namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
-            # Sort the edge_key components to ensure consistent lock key generation
-            sorted_edge_key = sorted([edge_key[0], edge_key[1]])
-            # logger.info(f"Processing edge: {sorted_edge_key[0]} - {sorted_edge_key[1]}")
-            async with get_storage_keyed_lock(
-                sorted_edge_key,
-                namespace=namespace,
-                enable_logging=False,
-            ):
-                edge_data = await _merge_edges_then_upsert(
-                    edge_key[0],
-                    edge_key[1],
-                    edges,
-                    knowledge_graph_inst,
-                    global_config,
-                    pipeline_status,
-                    pipeline_status_lock,
-                    llm_response_cache,
-                )
-                if edge_data is None:
-                    return None
-
-                if relationships_vdb is not None:
-                    data_for_vdb = {
-                        compute_mdhash_id(
-                            edge_data["src_id"] + edge_data["tgt_id"], prefix="rel-"
-                        ): {
-                            "src_id": edge_data["src_id"],
-                            "tgt_id": edge_data["tgt_id"],
-                            "keywords": edge_data["keywords"],
-                            "content": f"{edge_data['src_id']}\t{edge_data['tgt_id']}\n{edge_data['keywords']}\n{edge_data['description']}",
-                            "source_id": edge_data["source_id"],
-                            "file_path": edge_data.get("file_path", "unknown_source"),
-                            "weight": edge_data.get("weight", 1.0),
-                        }
-                    }
-                    await relationships_vdb.upsert(data_for_vdb)
-                return edge_data
+    workspace = global_config.get("workspace", "")
+    namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
 
-    # Create a single task queue for both entities and edges
-    tasks = []
+    async def _run_all(coros: list) -> list:
+        """Run merge coroutines under the semaphore, cancelling the rest on first failure"""
 
-    # Add entity processing tasks
-    for entity_name, entities in all_nodes.items():
-        tasks.append(
-            asyncio.create_task(_locked_process_entity_name(entity_name, entities))
-        )
+        async def _bounded(coro):
+            async with semaphore:
+                return await coro
 
-    # Add edge processing tasks
-    for edge_key, edges in all_edges.items():
-        tasks.append(asyncio.create_task(_locked_process_edges(edge_key, edges)))
-
-    # Execute all tasks in parallel with semaphore control and early failure detection
-    done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        tasks = [asyncio.create_task(_bounded(coro)) for coro in coros]
+        if not tasks:
+            return []
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            if task.exception():
+                # If a task failed, cancel all pending tasks
+                for pending_task in pending:
+                    pending_task.cancel()
+
+                # Wait for cancellation to complete
+                if pending:
+                    await asyncio.wait(pending)
+
+                # Re-raise the exception to notify the caller
+                raise task.exception()
+        return [task.result() for task in tasks]
+
+    # Merges, including LLM summaries, run without locks against a prefetched copy
+    # of the stored data. The keyed locks are only held to re-read and write back,
+    # entries changed by a concurrent document meanwhile are merged again.
+    def _merge_node_tasks(entity_names: list[str], already_nodes: dict) -> list:
+        return [
+            _merge_nodes(
+                entity_name,
+                all_nodes[entity_name],
+                already_nodes.get(entity_name),
+                global_config,
+                pipeline_status,
+                pipeline_status_lock,
+                llm_response_cache,
+            )
+            for entity_name in entity_names
+        ]
 
-    # Check if any task raised an exception
-    for task in done:
-        if task.exception():
-            # If a task failed, cancel all pending tasks
-            for pending_task in pending:
-                pending_task.cancel()
+    def _merge_edge_tasks(edge_keys: list[tuple[str, str]], already_edges: dict) -> list:
+        return [
+            _merge_edges(
+                src_id,
+                tgt_id,
+                all_edges[(src_id, tgt_id)],
+                already_edges.get((src_id, tgt_id)),
+                global_config,
+                pipeline_status,
+                pipeline_status_lock,
+                llm_response_cache,
+            )
+            for src_id, tgt_id in edge_keys
+        ]
 
-            # Wait for cancellation to complete
-            if pending:
-                await asyncio.wait(pending)
+    # Entities
+    entity_names = list(all_nodes.keys())
+    # Copied as in-memory backends return their live attribute dicts
+    already_nodes = {
+        entity_name: dict(node)
+        for entity_name, node in (
+            await knowledge_graph_inst.get_nodes_batch(entity_names)
+        ).items()
+    }
+    nodes_to_upsert = dict(
+        zip(entity_names, await _run_all(_merge_node_tasks(entity_names, already_nodes)))
+    )
+    async with get_storage_keyed_lock(
+        entity_names, namespace=namespace, enable_logging=False
+    ):
+        current_nodes = await knowledge_graph_inst.get_nodes_batch(entity_names)
+        stale_names = [
+            entity_name
+            for entity_name in entity_names
+            if current_nodes.get(entity_name) != already_nodes.get(entity_name)
+        ]
+        if stale_names:
+            nodes_to_upsert.update(
+                zip(
+                    stale_names,
+                    await _run_all(_merge_node_tasks(stale_names, current_nodes)),
+                )
+            )
+        if nodes_to_upsert:
+            await knowledge_graph_inst.upsert_nodes_batch(nodes_to_upsert)
 
-            # Re-raise the exception to notify the caller
-            raise task.exception()
+        if entity_vdb is not None and nodes_to_upsert:
+            data_for_vdb = {
+                compute_mdhash_id(entity_name, prefix="ent-"): {
+                    "entity_name": entity_name,
+                    "entity_type": node_data["entity_type"],
+                    "content": f"{entity_name}\n{node_data['description']}",
+                    "source_id": node_data["source_id"],
+                    "file_path": node_data.get("file_path", "unknown_source"),
+                }
+                for entity_name, node_data in nodes_to_upsert.items()
+            }
+            await entity_vdb.upsert(data_for_vdb)
+
+    # Relations: same pattern, locking both endpoints of every edge
+    edge_keys = [edge_key for edge_key in all_edges if edge_key[0] != edge_key[1]]
+    endpoint_ids = sorted({node_id for edge_key in edge_keys for node_id in edge_key})
+    edge_pairs = [{"src": src_id, "tgt": tgt_id} for src_id, tgt_id in edge_keys]
+    already_edges = {
+        edge_key: dict(edge)
+        for edge_key, edge in (
+            await knowledge_graph_inst.get_edges_batch(edge_pairs)
+        ).items()
+    }
+    merged_by_key = dict(
+        zip(edge_keys, await _run_all(_merge_edge_tasks(edge_keys, already_edges)))
+    )
+    async with get_storage_keyed_lock(
+        endpoint_ids, namespace=namespace, enable_logging=False
+    ):
+        current_edges = await knowledge_graph_inst.get_edges_batch(edge_pairs)
+        stale_keys = [
+            edge_key
+            for edge_key in edge_keys
+            if current_edges.get(edge_key) != already_edges.get(edge_key)
+        ]
+        if stale_keys:
+            merged_by_key.update(
+                zip(
+                    stale_keys,
+                    await _run_all(_merge_edge_tasks(stale_keys, current_edges)),
+                )
+            )
+        merged_edges = [merged_by_key[edge_key] for edge_key in edge_keys]
+
+        # Endpoints that are not entities yet get a placeholder node first
+        existing_endpoints = await knowledge_graph_inst.get_nodes_batch(endpoint_ids)
+        missing_nodes = {}
+        for (src_id, tgt_id), edge_data in zip(edge_keys, merged_edges):
+            for need_insert_id in (src_id, tgt_id):
+                if need_insert_id in existing_endpoints:
+                    continue
+                missing_nodes.setdefault(
+                    need_insert_id,
+                    {
+                        "entity_id": need_insert_id,
+                        "source_id": edge_data["source_id"],
+                        "description": edge_data["description"],
+                        "entity_type": "UNKNOWN",
+                        "file_path": edge_data["file_path"],
+                        "created_at": int(time.time()),
+                    },
+                )
+        if missing_nodes:
+            await knowledge_graph_inst.upsert_nodes_batch(missing_nodes)
+
+        if edge_keys:
+            await knowledge_graph_inst.upsert_edges_batch(
+                [
+                    (src_id, tgt_id, edge_data)
+                    for (src_id, tgt_id), edge_data in zip(edge_keys, merged_edges)
+                ]
+            )
 
-    # If all tasks completed successfully, collect results
-    # (No need to collect results since these tasks don't return values)
+        if relationships_vdb is not None and edge_keys:
+            data_for_vdb = {
+                compute_mdhash_id(src_id + tgt_id, prefix="rel-"): {
+                    "src_id": src_id,
+                    "tgt_id": tgt_id,
+                    "keywords": edge_data["keywords"],
+                    "content": f"{src_id}\t{tgt_id}\n{edge_data['keywords']}\n{edge_data['description']}",
+                    "source_id": edge_data["source_id"],
+                    "file_path": edge_data.get("file_path", "unknown_source"),
+                    "weight": edge_data.get("weight", 1.0),
+                }
+                for (src_id, tgt_id), edge_data in zip(edge_keys, merged_edges)
+            }
+            await relationships_vdb.upsert(data_for_vdb)
 
 
 async def extract_entities(
@@ -1692,9 +1721,9 @@ async def kg_query(
         return sys_prompt
 
     tokenizer: Tokenizer = global_config["tokenizer"]
-    len_of_prompts = len(tokenizer.encode(query + sys_prompt))
+    query_tokens, sys_prompt_tokens = tokenizer.count_tokens_many([query, sys_prompt])
     logger.debug(
-        f"[kg_query] Sending to LLM: {len_of_prompts:,} tokens (Query: {len(tokenizer.encode(query))}, System: {len(tokenizer.encode(sys_prompt))})"
+        f"[kg_query] Sending to LLM: {query_tokens + sys_prompt_tokens:,} tokens (Query: {query_tokens}, System: {sys_prompt_tokens})"
     )
 
     response = await use_model_func(
@@ -1817,7 +1846,7 @@ async def extract_keywords_only(
     )
 
     tokenizer: Tokenizer = global_config["tokenizer"]
-    len_of_prompts = len(tokenizer.encode(kw_prompt))
+    len_of_prompts = tokenizer.count_tokens(kw_prompt)
     logger.debug(
         f"[extract_keywords] Sending to LLM: {len_of_prompts:,} tokens (Prompt: {len_of_prompts})"
     )
@@ -1919,6 +1948,134 @@ async def _get_vector_context(
         return []
 
 
+async def _run_retrieval_branches(branches: dict[str, Any]) -> dict[str, Any]:
+    """Run independent retrieval coroutines concurrently
+
+    If any branch fails (or the caller is cancelled), the remaining branches are
+    cancelled before the exception propagates. The wall time of each branch is
+    logged so the critical path of a query is visible.
+
+    Args:
+        branches: Mapping of branch name -> coroutine
+
+    Returns:
+        Mapping of branch name -> coroutine result
+    """
+    timings: dict[str, float] = {}
+
+    async def _timed(name: str, coro):
+        start = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            timings[name] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tasks = {
+        name: asyncio.create_task(_timed(name, coro))
+        for name, coro in branches.items()
+    }
+    try:
+        done, pending = await asyncio.wait(
+            tasks.values(), return_when=asyncio.FIRST_EXCEPTION
+        )
+    except asyncio.CancelledError:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.wait(tasks.values())
+        raise
+
+    for task in done:
+        if task.exception():
+            # Cancel branches still running, the query aborts anyway
+            for pending_task in pending:
+                pending_task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+            raise task.exception()
+
+    logger.info(
+        f"Retrieval branches finished in {time.perf_counter() - start:.3f}s ("
+        + ", ".join(f"{name}: {timings[name]:.3f}s" for name in tasks)
+        + ")"
+    )
+    return {name: task.result() for name, task in tasks.items()}
+
+
+KG_CONTEXT_TEMPLATE = """-----Entities(KG)-----
+
+```json
+{entities_str}
+```
+
+-----Relationships(KG)-----
+
+```json
+{relations_str}
+```
+
+-----Document Chunks(DC)-----
+
+```json
+{text_units_str}
+```
+
+"""
+# Context with empty lists: the fixed token overhead of KG_CONTEXT_TEMPLATE
+KG_CONTEXT_OVERHEAD = KG_CONTEXT_TEMPLATE.format(
+    entities_str="[]", relations_str="[]", text_units_str="[]"
+)
+# Separator json.dumps puts between list items
+JSON_ITEM_SEPARATOR = ", "
+
+
+def _json_join(item_strs: list[str]) -> str:
+    """Join json.dumps'ed items into the same string json.dumps gives for the list"""
+    return "[" + JSON_ITEM_SEPARATOR.join(item_strs) + "]"
+
+
+def _truncate_context_items(
+    items: list[dict], max_token_size: int, tokenizer: Tokenizer
+) -> tuple[list[dict], list[str], int]:
+    """Serialize and count every context item once and keep items within max_token_size
+
+    Returns:
+        Tuple of (kept items, their json strings, their total token count)
+    """
+    if max_token_size <= 0:
+        return [], [], 0
+    item_strs = [json.dumps(item, ensure_ascii=False) for item in items]
+    tokens = 0
+    for i, count in enumerate(tokenizer.count_tokens_many(item_strs)):
+        if tokens + count > max_token_size:
+            return items[:i], item_strs[:i], tokens
+        tokens += count
+    return items, item_strs, tokens
+
+
+def warm_prompt_token_counts(tokenizer: Tokenizer) -> None:
+    """Count the fixed context and default system prompt templates once
+
+    Queries then only tokenize the parts that change from query to query, the
+    template overhead is served from the tokenizer's count cache.
+    """
+    default_prompt_args = dict(
+        history="",
+        context_data="",
+        content_data="",
+        response_type="Multiple Paragraphs",
+        user_prompt="",
+    )
+    tokenizer.count_tokens_many(
+        [
+            KG_CONTEXT_OVERHEAD,
+            JSON_ITEM_SEPARATOR,
+            PROMPTS["rag_response"].format(**default_prompt_args),
+            PROMPTS["naive_rag_response"].format(**default_prompt_args),
+        ]
+    )
+
+
 async def _build_query_context(
     query: str,
     ll_keywords: str,
@@ -1973,18 +2130,30 @@ async def _build_query_context(
         original_node_datas = use_entities
 
     else:  # hybrid or mix mode
-        ll_data = await _get_node_data(
-            ll_keywords,
-            knowledge_graph_inst,
-            entities_vdb,
-            query_param,
-        )
-        hl_data = await _get_edge_data(
-            hl_keywords,
-            knowledge_graph_inst,
-            relationships_vdb,
-            query_param,
-        )
+        # Low-level, high-level and vector retrieval are independent I/O chains
+        branches = {
+            "local": _get_node_data(
+                ll_keywords,
+                knowledge_graph_inst,
+                entities_vdb,
+                query_param,
+            ),
+            "global": _get_edge_data(
+                hl_keywords,
+                knowledge_graph_inst,
+                relationships_vdb,
+                query_param,
+            ),
+        }
+        if query_param.mode == "mix" and chunks_vdb:
+            branches["vector"] = _get_vector_context(
+                query,
+                chunks_vdb,
+                query_param,
+            )
+        branch_results = await _run_retrieval_branches(branches)
+        ll_data = branch_results["local"]
+        hl_data = branch_results["global"]
 
         (ll_entities_context, ll_relations_context, ll_node_datas, ll_edge_datas) = (
             ll_data
@@ -1994,13 +2163,8 @@ async def _build_query_context(
         )
 
         # Get vector chunks first if in mix mode
-        if query_param.mode == "mix" and chunks_vdb:
-            vector_chunks = await _get_vector_context(
-                query,
-                chunks_vdb,
-                query_param,
-            )
-            all_chunks.extend(vector_chunks)
+        if "vector" in branch_results:
+            all_chunks.extend(branch_results["vector"])
 
         # Store original data from both sources
         original_node_datas = ll_node_datas + hl_node_datas
@@ -2019,6 +2183,11 @@ async def _build_query_context(
     )
 
     # Unified token control system - Apply precise token limits to entities and relations
+    # Each entity/relation is serialized and counted once, the strings are reused
+    # for the chunk budget and the final context
+    entity_strs: list[str] = []
+    relation_strs: list[str] = []
+    entity_tokens = relation_tokens = 0
     tokenizer = text_chunks_db.global_config.get("tokenizer")
     if tokenizer:
         # Get new token limits from query_param (with fallback to global_config)
@@ -2055,11 +2224,8 @@ async def _build_query_context(
                         GRAPH_FIELD_SEP, ";"
                     )
 
-            entities_context = truncate_list_by_token_size(
-                entities_context,
-                key=lambda x: json.dumps(x, ensure_ascii=False),
-                max_token_size=max_entity_tokens,
-                tokenizer=tokenizer,
+            entities_context, entity_strs, entity_tokens = _truncate_context_items(
+                entities_context, max_entity_tokens, tokenizer
             )
             if len(entities_context) < original_entity_count:
                 logger.debug(
@@ -2077,11 +2243,10 @@ async def _build_query_context(
                         GRAPH_FIELD_SEP, ";"
                     )
 
-            relations_context = truncate_list_by_token_size(
-                relations_context,
-                key=lambda x: json.dumps(x, ensure_ascii=False),
-                max_token_size=max_relation_tokens,
-                tokenizer=tokenizer,
+            relations_context, relation_strs, relation_tokens = (
+                _truncate_context_items(
+                    relations_context, max_relation_tokens, tokenizer
+                )
             )
             if len(relations_context) < original_relation_count:
                 logger.debug(
@@ -2148,47 +2313,27 @@ async def _build_query_context(
     # Apply token processing to chunks if tokenizer is available
     text_units_context = []
     if tokenizer and all_chunks:
-        # Calculate dynamic token limit for text chunks
-        entities_str = json.dumps(entities_context, ensure_ascii=False)
-        relations_str = json.dumps(relations_context, ensure_ascii=False)
-
-        # Calculate base context tokens (entities + relations + template)
-        kg_context_template = """-----Entities(KG)-----
-
-```json
-{entities_str}
-```
-
------Relationships(KG)-----
-
-```json
-{relations_str}
-```
-
------Document Chunks(DC)-----
-
-```json
-[]
-```
-
-"""
-        kg_context = kg_context_template.format(
-            entities_str=entities_str, relations_str=relations_str
+        # Calculate base context tokens (template + entities + relations) from the
+        # per-item counts instead of rendering and tokenizing the whole context
+        separator_count = max(len(entity_strs) - 1, 0) + max(
+            len(relation_strs) - 1, 0
+        )
+        kg_context_tokens = (
+            tokenizer.count_tokens(KG_CONTEXT_OVERHEAD)
+            + entity_tokens
+            + relation_tokens
+            + separator_count * tokenizer.count_tokens(JSON_ITEM_SEPARATOR)
         )
-        kg_context_tokens = len(tokenizer.encode(kg_context))
 
         # Calculate actual system prompt overhead dynamically
-        # 1. Calculate conversation history tokens
+        # 1. Build conversation history
         history_context = ""
         if query_param.conversation_history:
             history_context = get_conversation_turns(
                 query_param.conversation_history, query_param.history_turns
             )
-        history_tokens = (
-            len(tokenizer.encode(history_context)) if history_context else 0
-        )
 
-        # 2. Calculate system prompt template tokens (excluding context_data)
+        # 2. Build system prompt template (excluding context_data)
         user_prompt = query_param.user_prompt if query_param.user_prompt else ""
         response_type = (
             query_param.response_type
@@ -2208,10 +2353,15 @@ async def _build_query_context(
             response_type=response_type,
             user_prompt=user_prompt,
         )
-        sys_prompt_template_tokens = len(tokenizer.encode(sample_sys_prompt))
+
+        # Count all parts in one batch, repeated prompts are served from the cache
+        history_tokens, sys_prompt_template_tokens, query_tokens = (
+            tokenizer.count_tokens_many([history_context, sample_sys_prompt, query])
+        )
+        if not history_context:
+            history_tokens = 0
 
         # Total system prompt overhead = template + query tokens
-        query_tokens = len(tokenizer.encode(query))
         sys_prompt_overhead = sys_prompt_template_tokens + query_tokens
 
         buffer_tokens = 100  # Safety buffer as requested
@@ -2264,30 +2414,18 @@ async def _build_query_context(
     if not entities_context and not relations_context:
         return None
 
-    entities_str = json.dumps(entities_context, ensure_ascii=False)
-    relations_str = json.dumps(relations_context, ensure_ascii=False)
-    text_units_str = json.dumps(text_units_context, ensure_ascii=False)
-
-    result = f"""-----Entities(KG)-----
-
-```json
-{entities_str}
-```
-
------Relationships(KG)-----
-
-```json
-{relations_str}
-```
-
------Document Chunks(DC)-----
-
-```json
-{text_units_str}
-```
+    if not tokenizer:
+        entity_strs = [json.dumps(e, ensure_ascii=False) for e in entities_context]
+        relation_strs = [
+            json.dumps(r, ensure_ascii=False) for r in relations_context
+        ]
 
-"""
-    return result
+    # Assemble the final context once from the already serialized items
+    return KG_CONTEXT_TEMPLATE.format(
+        entities_str=_json_join(entity_strs),
+        relations_str=_json_join(relation_strs),
+        text_units_str=json.dumps(text_units_context, ensure_ascii=False),
+    )
 
 
 async def _get_node_data(
@@ -2445,16 +2583,10 @@ async def _find_most_related_text_unit_from_entities(
                 all_text_units_lookup[c_id] = index
                 tasks.append((c_id, index, this_edges))
 
-    # Process in batches tasks at a time to avoid overwhelming resources
-    batch_size = 5
-    results = []
-
-    for i in range(0, len(tasks), batch_size):
-        batch_tasks = tasks[i : i + batch_size]
-        batch_results = await asyncio.gather(
-            *[text_chunks_db.get_by_id(c_id) for c_id, _, _ in batch_tasks]
-        )
-        results.extend(batch_results)
+    # Fetch all chunks with size-capped multi-gets
+    results = await _get_by_ids_batched(
+        text_chunks_db, [c_id for c_id, _, _ in tasks]
+    )
 
     for (c_id, index, this_edges), data in zip(tasks, results):
         all_text_units_lookup[c_id] = {
@@ -2738,7 +2870,7 @@ async def _find_related_text_unit_from_relationships(
 
     # Batch get all text chunk data
     chunk_ids = list(text_units_unique_flat.keys())
-    chunk_data_list = await text_chunks_db.get_by_ids(chunk_ids)
+    chunk_data_list = await _get_by_ids_batched(text_chunks_db, chunk_ids)
 
     # Build lookup table, handling possible missing data
     for chunk_id, chunk_data in zip(chunk_ids, chunk_data_list):
@@ -2820,9 +2952,8 @@ async def naive_query(
         history_context = get_conversation_turns(
             query_param.conversation_history, query_param.history_turns
         )
-    history_tokens = len(tokenizer.encode(history_context)) if history_context else 0
 
-    # Calculate system prompt template tokens (excluding content_data)
+    # Build system prompt template (excluding content_data)
     user_prompt = query_param.user_prompt if query_param.user_prompt else ""
     response_type = (
         query_param.response_type
@@ -2842,10 +2973,15 @@ async def naive_query(
         history=history_context,
         user_prompt=user_prompt,
     )
-    sys_prompt_template_tokens = len(tokenizer.encode(sample_sys_prompt))
+
+    # Count all parts in one batch, repeated prompts are served from the cache
+    history_tokens, sys_prompt_template_tokens, query_tokens = (
+        tokenizer.count_tokens_many([history_context, sample_sys_prompt, query])
+    )
+    if not history_context:
+        history_tokens = 0
 
     # Total system prompt overhead = template + query tokens
-    query_tokens = len(tokenizer.encode(query))
     sys_prompt_overhead = sys_prompt_template_tokens + query_tokens
 
     buffer_tokens = 100  # Safety buffer
@@ -2915,9 +3051,9 @@ async def naive_query(
     if query_param.only_need_prompt:
         return sys_prompt
 
-    len_of_prompts = len(tokenizer.encode(query + sys_prompt))
+    query_tokens, sys_prompt_tokens = tokenizer.count_tokens_many([query, sys_prompt])
     logger.debug(
-        f"[naive_query] Sending to LLM: {len_of_prompts:,} tokens (Query: {len(tokenizer.encode(query))}, System: {len(tokenizer.encode(sys_prompt))})"
+        f"[naive_query] Sending to LLM: {query_tokens + sys_prompt_tokens:,} tokens (Query: {query_tokens}, System: {sys_prompt_tokens})"
     )
 
     response = await use_model_func(
@@ -3041,9 +3177,9 @@ async def kg_query_with_keywords(
         return sys_prompt
 
     tokenizer: Tokenizer = global_config["tokenizer"]
-    len_of_prompts = len(tokenizer.encode(query + sys_prompt))
+    query_tokens, sys_prompt_tokens = tokenizer.count_tokens_many([query, sys_prompt])
     logger.debug(
-        f"[kg_query_with_keywords] Sending to LLM: {len_of_prompts:,} tokens (Query: {len(tokenizer.encode(query))}, System: {len(tokenizer.encode(sys_prompt))})"
+        f"[kg_query_with_keywords] Sending to LLM: {query_tokens + sys_prompt_tokens:,} tokens (Query: {query_tokens}, System: {sys_prompt_tokens})"
     )
 
     # 6. Generate response
@@ -1,11 +1,108 @@
 from __future__ import annotations
 
 import os
+import time
+import asyncio
+import hashlib
 import aiohttp
+from collections import OrderedDict
 from typing import Callable, Any, List, Dict, Optional
 from pydantic import BaseModel, Field
 
-from .utils import logger
+from .utils import logger, get_env_value
+
+# Max documents sent in one rerank request, larger lists are split into concurrent requests
+DEFAULT_RERANK_BATCH_SIZE = 128
+
+
+class RerankScoreCache:
+    """Small LRU cache of rerank scores keyed by (model, endpoint, query, content hash)
+
+    Entries older than ttl seconds are treated as missing. A max_size of 0 disables
+    the cache.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._scores: OrderedDict[tuple, tuple[float, float]] = OrderedDict()
+
+    @staticmethod
+    def make_key(model: str, base_url: str, query: str, content: str) -> tuple:
+        content_hash = hashlib.md5(content.encode("utf-8")).hexdigest()
+        return (model, base_url, query, content_hash)
+
+    def get(self, key: tuple) -> float | None:
+        entry = self._scores.get(key)
+        if entry is None:
+            return None
+        score, cached_at = entry
+        if time.monotonic() - cached_at > self.ttl:
+            del self._scores[key]
+            return None
+        self._scores.move_to_end(key)
+        return score
+
+    def put(self, key: tuple, score: float) -> None:
+        if self.max_size <= 0:
+            return
+        self._scores[key] = (score, time.monotonic())
+        self._scores.move_to_end(key)
+        while len(self._scores) > self.max_size:
+            self._scores.popitem(last=False)
+
+    def clear(self) -> None:
+        self._scores.clear()
+
+
+rerank_score_cache = RerankScoreCache(
+    max_size=get_env_value("RERANK_CACHE_SIZE", 4096, int),
+    ttl=get_env_value("RERANK_CACHE_TTL", 600.0, float),
+)
+
+# Long-lived sessions keyed by event loop, an aiohttp session cannot cross loops
+_rerank_sessions: dict[int, tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = {}
+
+
+def get_rerank_session() -> aiohttp.ClientSession:
+    """Return the shared rerank HTTP session of the running event loop.
+
+    The session keeps connections (and TLS sessions) alive between rerank calls.
+    Connection limits are read from RERANK_MAX_CONNECTIONS and
+    RERANK_KEEPALIVE_TIMEOUT. Sessions are released by `close_rerank_sessions`.
+    """
+    loop = asyncio.get_running_loop()
+
+    # Drop sessions whose event loop is gone, their connections cannot be reused
+    for key, (session_loop, _) in list(_rerank_sessions.items()):
+        if session_loop.is_closed():
+            _rerank_sessions.pop(key, None)
+
+    entry = _rerank_sessions.get(id(loop))
+    if entry is not None and not entry[1].closed:
+        return entry[1]
+
+    connector = aiohttp.TCPConnector(
+        limit=get_env_value("RERANK_MAX_CONNECTIONS", 32, int),
+        keepalive_timeout=get_env_value("RERANK_KEEPALIVE_TIMEOUT", 30.0, float),
+    )
+    session = aiohttp.ClientSession(connector=connector)
+    _rerank_sessions[id(loop)] = (loop, session)
+    return session
+
+
+async def close_rerank_sessions() -> None:
+    """Close the shared rerank sessions bound to the running event loop"""
+    loop = asyncio.get_running_loop()
+    for key, (session_loop, session) in list(_rerank_sessions.items()):
+        if session_loop is not loop and not session_loop.is_closed():
+            continue
+        _rerank_sessions.pop(key, None)
+        if session_loop is loop:
+            try:
+                await session.close()
+            except Exception as e:
+                logger.warning(f"Failed to close rerank session: {e}")
 
 
 class RerankModel(BaseModel):
@@ -119,6 +216,32 @@ class MultiRerankModel(BaseModel):
         return await model.rerank(query, documents, top_n, **kwargs)
 
 
+async def _post_rerank_request(
+    base_url: str,
+    headers: Dict[str, str],
+    data: Dict[str, Any],
+) -> List[tuple[int, Optional[float]]] | None:
+    """Send one rerank request, return (index, relevance_score) pairs or None on error"""
+    session = get_rerank_session()
+    async with session.post(base_url, headers=headers, json=data) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            logger.error(f"Rerank API error {response.status}: {error_text}")
+            return None
+
+        result = await response.json()
+
+    # Standard format: results contain index and relevance_score
+    if "results" not in result:
+        logger.warning("Unexpected rerank API response format")
+        return None
+    return [
+        (item["index"], item.get("relevance_score"))
+        for item in result["results"]
+        if "index" in item and 0 <= item["index"] < len(data["documents"])
+    ]
+
+
 async def generic_rerank_api(
     query: str,
     documents: List[Dict[str, Any]],
@@ -126,11 +249,17 @@ async def generic_rerank_api(
     base_url: str,
     api_key: str,
     top_n: Optional[int] = None,
+    batch_size: Optional[int] = None,
     **kwargs,
 ) -> List[Dict[str, Any]]:
     """
     Generic rerank function that works with Jina/Cohere compatible APIs.
 
+    Scores of recently reranked (query, document) pairs are served from
+    rerank_score_cache. The remaining documents are sent in requests of at most
+    batch_size documents that run concurrently on the shared session; their
+    scores are merged into a single ranking.
+
     Args:
         query: The search query
         documents: List of documents to rerank
@@ -138,6 +267,7 @@ async def generic_rerank_api(
         base_url: API endpoint URL
         api_key: API authentication key
         top_n: Number of top results to return
+        batch_size: Max documents per request, defaults to RERANK_BATCH_SIZE env
         **kwargs: Additional API-specific parameters
 
     Returns:
@@ -160,47 +290,80 @@ async def generic_rerank_api(
             text = str(doc)
         prepared_docs.append(text)
 
+    if batch_size is None:
+        batch_size = get_env_value(
+            "RERANK_BATCH_SIZE", DEFAULT_RERANK_BATCH_SIZE, int
+        )
+    batch_size = max(1, batch_size)
+
+    # index -> relevance score (None if the API returned no score)
+    scores: Dict[int, Optional[float]] = {}
+    cache_keys = [
+        RerankScoreCache.make_key(model, base_url, query, text)
+        for text in prepared_docs
+    ]
+    pending = []
+    for i, cache_key in enumerate(cache_keys):
+        cached_score = rerank_score_cache.get(cache_key)
+        if cached_score is None:
+            pending.append(i)
+        else:
+            scores[i] = cached_score
+
     # Prepare request
     headers = {"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"}
 
-    data = {"model": model, "query": query, "documents": prepared_docs, **kwargs}
-
-    if top_n is not None:
-        data["top_n"] = min(top_n, len(prepared_docs))
+    batches = [pending[i : i + batch_size] for i in range(0, len(pending), batch_size)]
+    requests = []
+    for batch in batches:
+        data = {
+            "model": model,
+            "query": query,
+            "documents": [prepared_docs[i] for i in batch],
+            **kwargs,
+        }
+        # top_n is applied after merging, so every score can be cached
+        requests.append(_post_rerank_request(base_url, headers, data))
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(base_url, headers=headers, json=data) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    logger.error(f"Rerank API error {response.status}: {error_text}")
-                    return documents
-
-                result = await response.json()
-
-                # Extract reranked results
-                if "results" in result:
-                    # Standard format: results contain index and relevance_score
-                    reranked_docs = []
-                    for item in result["results"]:
-                        if "index" in item:
-                            doc_idx = item["index"]
-                            if 0 <= doc_idx < len(documents):
-                                reranked_doc = documents[doc_idx].copy()
-                                if "relevance_score" in item:
-                                    reranked_doc["rerank_score"] = item[
-                                        "relevance_score"
-                                    ]
-                                reranked_docs.append(reranked_doc)
-                    return reranked_docs
-                else:
-                    logger.warning("Unexpected rerank API response format")
-                    return documents
-
+        batch_results = await asyncio.gather(*requests)
     except Exception as e:
         logger.error(f"Error during reranking: {e}")
         return documents
 
+    for batch, results in zip(batches, batch_results):
+        if results is None:
+            return documents
+        for batch_idx, score in results:
+            doc_idx = batch[batch_idx]
+            scores[doc_idx] = score
+            if score is not None:
+                rerank_score_cache.put(cache_keys[doc_idx], score)
+
+    cached_count = len(documents) - len(pending)
+    if cached_count or len(batches) > 1:
+        logger.debug(
+            f"Reranked {len(documents)} documents: {cached_count} cached, "
+            f"{len(pending)} in {len(batches)} requests"
+        )
+
+    # Merge scores of all batches into one ranking, keeping API order for ties
+    ranked = sorted(
+        scores.items(),
+        key=lambda item: float("-inf") if item[1] is None else item[1],
+        reverse=True,
+    )
+    if top_n is not None:
+        ranked = ranked[:top_n]
+
+    reranked_docs = []
+    for doc_idx, score in ranked:
+        reranked_doc = documents[doc_idx].copy()
+        if score is not None:
+            reranked_doc["rerank_score"] = score
+        reranked_docs.append(reranked_doc)
+    return reranked_docs
+
 
 async def jina_rerank(
     query: str,
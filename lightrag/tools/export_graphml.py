@@ -0,0 +1,47 @@
+"""
+Export a NetworkXStorage graph (binary snapshot + delta file) as GraphML,
+e.g. to open it in the graph visualizer.
+
+    python -m lightrag.tools.export_graphml --working-dir ./rag_storage
+"""
+
+import argparse
+import os
+
+import networkx as nx
+
+from lightrag.kg.networkx_impl import NetworkXStorage
+
+
+def export_graphml(
+    working_dir: str,
+    namespace: str = "chunk_entity_relation",
+    workspace: str = "",
+    output: str | None = None,
+) -> str:
+    graph_dir = os.path.join(working_dir, workspace) if workspace else working_dir
+    snapshot_file = os.path.join(graph_dir, f"graph_{namespace}.msgpack")
+    delta_file = os.path.join(graph_dir, f"graph_{namespace}.delta.msgpack")
+
+    loaded = NetworkXStorage.load_graph_snapshot(snapshot_file)
+    if loaded is None:
+        raise FileNotFoundError(f"No graph snapshot found at {snapshot_file}")
+    graph, generation = loaded
+    NetworkXStorage.replay_graph_delta(graph, delta_file, generation)
+
+    output = output or os.path.join(graph_dir, f"graph_{namespace}.graphml")
+    nx.write_graphml(graph, output)
+    print(
+        f"Exported {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges to {output}"
+    )
+    return output
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--working-dir", required=True)
+    parser.add_argument("--namespace", default="chunk_entity_relation")
+    parser.add_argument("--workspace", default="")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    export_graphml(args.working_dir, args.namespace, args.workspace, args.output)
@@ -2,6 +2,7 @@ from __future__ import annotations
 import weakref
 
 import asyncio
+import base64
 import html
 import csv
 import json
@@ -9,8 +10,10 @@ import logging
 import logging.handlers
 import os
 import re
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from functools import wraps
+from functools import partial, wraps
 from hashlib import md5
 from typing import Any, Protocol, Callable, TYPE_CHECKING, List
 import numpy as np
@@ -19,6 +22,7 @@ from lightrag.constants import (
     DEFAULT_LOG_MAX_BYTES,
     DEFAULT_LOG_BACKUP_COUNT,
     DEFAULT_LOG_FILENAME,
+    DEFAULT_TOKEN_COUNT_CACHE_SIZE,
 )
 
 
@@ -643,6 +647,123 @@ def write_json(json_obj, file_name):
         json.dump(json_obj, f, indent=2, ensure_ascii=False)
 
 
+class JsonChangeLog:
+    """Append-only change log in front of a JSON snapshot file.
+
+    Every upsert/delete is appended as one JSON line to ``<snapshot>.wal``, so the
+    cost of persisting scales with the changes, not with the store. `load` replays
+    the log on top of the snapshot. Once the log outgrows both ``compact_bytes`` and
+    the snapshot itself, it is rotated to ``<snapshot>.wal.old`` and a fresh snapshot
+    is written in a worker thread; the rotated log is removed when that finishes.
+    """
+
+    def __init__(self, snapshot_file: str, compact_bytes: int | None = None):
+        self.snapshot_file = snapshot_file
+        self.log_file = snapshot_file + ".wal"
+        self.rotated_file = self.log_file + ".old"
+        self.compact_bytes = compact_bytes or get_env_value(
+            "JSON_WAL_COMPACT_BYTES", 16 * 1024 * 1024, int
+        )
+        self._compaction: asyncio.Task | None = None
+
+    def load(self) -> dict[str, Any]:
+        data = load_json(self.snapshot_file) or {}
+        replayed = 0
+        # A rotated log is only left behind if compaction was interrupted
+        for log_file in (self.rotated_file, self.log_file):
+            replayed += self._replay(log_file, data)
+        if replayed:
+            logger.info(f"Replayed {replayed} change log records into {self.snapshot_file}")
+        return data
+
+    @staticmethod
+    def _replay(log_file: str, data: dict[str, Any]) -> int:
+        if not os.path.exists(log_file):
+            return 0
+        count = 0
+        complete_bytes = 0
+        with open(log_file, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Torn tail from an interrupted append
+                    logger.warning(f"Dropping torn change log record in {log_file}")
+                    break
+                complete_bytes += len(line)
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping unreadable change log record in {log_file}")
+                    continue
+                if record["op"] == "upsert":
+                    data.update(record["data"])
+                elif record["op"] == "delete":
+                    for key in record["ids"]:
+                        data.pop(key, None)
+                count += 1
+        if complete_bytes < os.path.getsize(log_file):
+            # Otherwise the next append would be glued onto the torn record
+            with open(log_file, "r+b") as f:
+                f.truncate(complete_bytes)
+        return count
+
+    @staticmethod
+    def encode_upsert(data: dict[str, Any]) -> str:
+        """Serialize an upsert record; call before changing the in-memory data so
+        values that cannot be serialized fail without leaving it ahead of the log"""
+        return json.dumps({"op": "upsert", "data": data}, ensure_ascii=False) + "\n"
+
+    def append(self, line: str) -> None:
+        """Append a record serialized by `encode_upsert`"""
+        with open(self.log_file, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    def append_delete(self, ids: list[str]) -> None:
+        self.append(
+            json.dumps({"op": "delete", "ids": list(ids)}, ensure_ascii=False) + "\n"
+        )
+
+    def needs_compaction(self) -> bool:
+        if self._compaction is not None and not self._compaction.done():
+            return False
+        if not os.path.exists(self.log_file) or os.path.exists(self.rotated_file):
+            return False
+        snapshot_size = (
+            os.path.getsize(self.snapshot_file)
+            if os.path.exists(self.snapshot_file)
+            else 0
+        )
+        return os.path.getsize(self.log_file) >= max(self.compact_bytes, snapshot_size)
+
+    def rotate(self) -> None:
+        """Move the current log aside; call under the storage lock together with
+        taking the snapshot copy so both describe the same state"""
+        os.replace(self.log_file, self.rotated_file)
+
+    def _write_snapshot(self, data: dict[str, Any], *log_files: str) -> None:
+        tmp_file = self.snapshot_file + ".tmp"
+        write_json(data, tmp_file)
+        os.replace(tmp_file, self.snapshot_file)
+        for log_file in log_files:
+            if os.path.exists(log_file):
+                os.remove(log_file)
+
+    def compact_in_background(self, data: dict[str, Any]) -> None:
+        """Write `data` (taken at rotation time) as the new snapshot in a worker thread"""
+        self._compaction = asyncio.create_task(
+            asyncio.to_thread(self._write_snapshot, data, self.rotated_file)
+        )
+
+    def reset(self, data: dict[str, Any]) -> None:
+        """Write `data` as the snapshot right away and discard all logs"""
+        self._write_snapshot(data, self.log_file, self.rotated_file)
+
+    async def wait(self) -> None:
+        """Wait for a running compaction to finish"""
+        if self._compaction is not None:
+            await self._compaction
+            self._compaction = None
+
+
 class TokenizerInterface(Protocol):
     """
     Defines the interface for a tokenizer, requiring encode and decode methods.
@@ -660,18 +781,112 @@ class TokenizerInterface(Protocol):
 class Tokenizer:
     """
     A wrapper around a tokenizer to provide a consistent interface for encoding and decoding.
+
+    Token counts are memoized in a bounded LRU keyed by content hash, since the same
+    entity, relation and chunk texts are counted again on every query.
     """
 
-    def __init__(self, model_name: str, tokenizer: TokenizerInterface):
+    def __init__(
+        self,
+        model_name: str,
+        tokenizer: TokenizerInterface,
+        cache_size: int | None = None,
+    ):
         """
         Initializes the Tokenizer with a tokenizer model name and a tokenizer instance.
 
         Args:
             model_name: The associated model name for the tokenizer.
             tokenizer: An instance of a class implementing the TokenizerInterface.
+            cache_size: Max number of cached token counts, 0 disables the cache.
+                Defaults to the TOKEN_COUNT_CACHE_SIZE environment variable.
         """
         self.model_name: str = model_name
         self.tokenizer: TokenizerInterface = tokenizer
+        if cache_size is None:
+            cache_size = get_env_value(
+                "TOKEN_COUNT_CACHE_SIZE", DEFAULT_TOKEN_COUNT_CACHE_SIZE, int
+            )
+        self._count_cache_size = cache_size
+        self._count_cache: OrderedDict[bytes, int] = OrderedDict()
+
+    def __deepcopy__(self, memo):
+        # asdict(LightRAG) deep-copies field values for every global_config. The
+        # tokenizer holds no per-config state, so copies share it and its cache.
+        return self
+
+    def _cache_count(self, key: bytes, count: int) -> None:
+        if self._count_cache_size <= 0:
+            return
+        self._count_cache[key] = count
+        if len(self._count_cache) > self._count_cache_size:
+            self._count_cache.popitem(last=False)
+
+    def _cached_count(self, key: bytes) -> int | None:
+        count = self._count_cache.get(key)
+        if count is not None:
+            self._count_cache.move_to_end(key)
+        return count
+
+    def count_tokens(self, content: str) -> int:
+        """
+        Counts the tokens of a string, served from the LRU cache when possible.
+
+        Args:
+            content: The string to count tokens for.
+
+        Returns:
+            The number of tokens, equal to len(self.encode(content)).
+        """
+        key = md5(content.encode("utf-8", "surrogatepass")).digest()
+        count = self._cached_count(key)
+        if count is None:
+            count = len(self.tokenizer.encode(content))
+            self._cache_count(key, count)
+        return count
+
+    def count_tokens_many(self, contents: List[str]) -> List[int]:
+        """
+        Counts the tokens of several strings, encoding cache misses in one batch.
+
+        tiktoken encodings and HuggingFace tokenizers are batch-encoded natively,
+        other tokenizers fall back to one encode call per string.
+
+        Args:
+            contents: The strings to count tokens for.
+
+        Returns:
+            The number of tokens of each string, in the order of contents.
+        """
+        keys = [md5(c.encode("utf-8", "surrogatepass")).digest() for c in contents]
+        counts = [self._cached_count(key) for key in keys]
+        # Deduplicate misses so repeated strings are encoded once
+        misses: dict[bytes, str] = {}
+        for key, content, count in zip(keys, contents, counts):
+            if count is None:
+                misses.setdefault(key, content)
+        if misses:
+            miss_counts = dict(
+                zip(misses, self._batch_count(list(misses.values())))
+            )
+            for key, count in miss_counts.items():
+                self._cache_count(key, count)
+            counts = [
+                miss_counts[key] if count is None else count
+                for key, count in zip(keys, counts)
+            ]
+        return counts
+
+    def _batch_count(self, contents: List[str]) -> List[int]:
+        if len(contents) > 1:
+            if hasattr(self.tokenizer, "encode_batch"):
+                # tiktoken.Encoding and tokenizers.Tokenizer
+                return [len(tokens) for tokens in self.tokenizer.encode_batch(contents)]
+            if hasattr(self.tokenizer, "batch_encode_plus"):
+                # transformers tokenizers
+                encoded = self.tokenizer.batch_encode_plus(contents)
+                return [len(tokens) for tokens in encoded["input_ids"]]
+        return [len(self.tokenizer.encode(content)) for content in contents]
 
     def encode(self, content: str) -> List[int]:
         """
@@ -761,6 +976,10 @@ def is_float_regex(value: str) -> bool:
     return bool(re.match(r"^[-+]?[0-9]*\.?[0-9]+$", value))
 
 
+# Items counted by the first batch of truncate_list_by_token_size, doubled per batch
+TRUNCATE_FIRST_BATCH_SIZE = 16
+
+
 def truncate_list_by_token_size(
     list_data: list[Any],
     key: Callable[[Any], str],
@@ -771,10 +990,19 @@ def truncate_list_by_token_size(
     if max_token_size <= 0:
         return []
     tokens = 0
-    for i, data in enumerate(list_data):
-        tokens += len(tokenizer.encode(key(data)))
-        if tokens > max_token_size:
-            return list_data[:i]
+    start = 0
+    batch_size = TRUNCATE_FIRST_BATCH_SIZE
+    # Count in growing batches so items past the budget are rarely encoded
+    while start < len(list_data):
+        batch = list_data[start : start + batch_size]
+        for i, count in enumerate(
+            tokenizer.count_tokens_many([key(data) for data in batch]), start
+        ):
+            tokens += count
+            if tokens > max_token_size:
+                return list_data[:i]
+        start += len(batch)
+        batch_size *= 2
     return list_data
 
 
@@ -832,13 +1060,14 @@ def quantize_embedding(embedding: np.ndarray | list[float], bits: int = 8) -> tu
     if min_val == max_val:
         # handle constant vector
         quantized = np.zeros_like(embedding, dtype=np.uint8)
-        return quantized, min_val, max_val
+        return quantized, float(min_val), float(max_val)
 
     # Quantize to 0-255 range
     scale = (2**bits - 1) / (max_val - min_val)
     quantized = np.round((embedding - min_val) * scale).astype(np.uint8)
 
-    return quantized, min_val, max_val
+    # Plain floats, numpy scalars are not JSON serializable
+    return quantized, float(min_val), float(max_val)
 
 
 def dequantize_embedding(
@@ -853,6 +1082,29 @@ def dequantize_embedding(
     return (quantized * scale + min_val).astype(np.float32)
 
 
+def decode_embeddings(embeddings: list[str | list[float]]) -> np.ndarray:
+    """Stack embeddings from an OpenAI-style response into a float32 matrix
+
+    Items may be base64 strings of little-endian float32 (encoding_format="base64"),
+    which are copied straight into the preallocated result via np.frombuffer, or
+    plain float lists for servers that only speak the float format.
+    """
+    if not embeddings:
+        return np.empty((0, 0), dtype=np.float32)
+
+    first = embeddings[0]
+    if isinstance(first, str):
+        first = np.frombuffer(base64.b64decode(first), dtype="<f4")
+    result = np.empty((len(embeddings), len(first)), dtype=np.float32)
+    result[0] = first
+    for i in range(1, len(embeddings)):
+        embedding = embeddings[i]
+        if isinstance(embedding, str):
+            embedding = np.frombuffer(base64.b64decode(embedding), dtype="<f4")
+        result[i] = embedding
+    return result
+
+
 async def handle_cache(
     hashing_kv,
     args_hash,
@@ -860,7 +1112,13 @@ async def handle_cache(
     mode="default",
     cache_type=None,
 ):
-    """Generic cache handling function with flattened cache keys"""
+    """Generic cache handling function with flattened cache keys
+
+    When a semantic query cache is attached to ``hashing_kv`` (see
+    `SemanticQueryCache`), query lookups that miss the exact hash fall back to the
+    most similar cached query of the same mode, and the quantized query embedding
+    is returned so `save_to_cache` can persist it.
+    """
     if hashing_kv is None:
         return None, None, None, None
 
@@ -874,10 +1132,31 @@ async def handle_cache(
     # Use flattened cache key format: {mode}:{cache_type}:{hash}
     flattened_key = generate_cache_key(mode, cache_type, args_hash)
     cache_entry = await hashing_kv.get_by_id(flattened_key)
+    semantic_cache: SemanticQueryCache | None = getattr(
+        hashing_kv, "semantic_cache", None
+    )
+    if (
+        cache_entry
+        and semantic_cache is not None
+        and cache_type == "query"
+        and semantic_cache.is_expired(cache_entry)
+    ):
+        logger.debug(f"Expired cache entry(key:{flattened_key})")
+        await hashing_kv.delete([flattened_key])
+        cache_entry = None
     if cache_entry:
         logger.debug(f"Flattened cache hit(key:{flattened_key})")
         return cache_entry["return"], None, None, None
 
+    if semantic_cache is not None and mode != "default" and cache_type == "query":
+        embedding = await semantic_cache.embed_query(prompt)
+        cached_return = await semantic_cache.lookup(mode, embedding)
+        quantized, min_val, max_val = quantize_embedding(embedding)
+        if cached_return is not None:
+            return cached_return, quantized, min_val, max_val
+        logger.debug(f"Cache missed(mode:{mode} type:{cache_type})")
+        return None, quantized, min_val, max_val
+
     logger.debug(f"Cache missed(mode:{mode} type:{cache_type})")
     return None, None, None, None
 
@@ -945,6 +1224,516 @@ async def save_to_cache(hashing_kv, cache_data: CacheData):
     # Save using flattened key
     await hashing_kv.upsert({flattened_key: cache_entry})
 
+    semantic_cache: SemanticQueryCache | None = getattr(
+        hashing_kv, "semantic_cache", None
+    )
+    if (
+        semantic_cache is not None
+        and cache_data.cache_type == "query"
+        and cache_data.quantized is not None
+    ):
+        semantic_cache.add(
+            cache_data.mode,
+            flattened_key,
+            dequantize_embedding(
+                cache_data.quantized, cache_data.min_val, cache_data.max_val
+            ),
+        )
+
+
+class SemanticQueryCache:
+    """Similarity lookup over cached query responses.
+
+    Keeps one flat in-memory index of normalized query embeddings per query mode.
+    A query whose embedding reaches ``similarity_threshold`` against a cached query
+    of the same mode is answered from the LLM response cache. Entries older than
+    ``ttl`` seconds are evicted from both the index and the KV storage. The index is
+    rebuilt from the LLM response cache on `initialize`, re-embedding queries whose
+    backend does not keep the stored embedding.
+    """
+
+    QUERY_MODES = ("local", "global", "hybrid", "naive", "mix")
+
+    def __init__(
+        self,
+        embedding_func: Callable[..., Any],
+        hashing_kv,
+        similarity_threshold: float = 0.95,
+        ttl: int = 0,
+        max_entries: int = 10_000,
+    ):
+        self.embedding_func = embedding_func
+        self.hashing_kv = hashing_kv
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._keys: dict[str, list[str]] = {}
+        self._vectors: dict[str, list[np.ndarray]] = {}
+        self._created: dict[str, list[float]] = {}
+        self._matrix: dict[str, np.ndarray] = {}
+
+    async def initialize(self) -> None:
+        get_all = getattr(self.hashing_kv, "get_all", None)
+        if get_all is None:
+            logger.warning(
+                f"{type(self.hashing_kv).__name__} cannot list cache entries, semantic cache starts empty"
+            )
+            return
+
+        entries = await get_all()
+        now = time.time()
+        pending: list[tuple[str, str, str, float]] = []
+        for key, entry in entries.items():
+            parsed = parse_cache_key(key)
+            if not entry or parsed is None:
+                continue
+            mode, cache_type, _ = parsed
+            if cache_type != "query" or mode not in self.QUERY_MODES:
+                continue
+            created = float(entry.get("create_time") or now)
+            if self.ttl and now - created > self.ttl:
+                continue
+            if entry.get("embedding") and entry.get("embedding_min") is not None:
+                quantized = np.frombuffer(
+                    bytes.fromhex(entry["embedding"]), dtype=np.uint8
+                )
+                vector = dequantize_embedding(
+                    quantized, entry["embedding_min"], entry["embedding_max"]
+                )
+                self.add(mode, key, vector, created)
+            elif entry.get("original_prompt"):
+                pending.append((mode, key, entry["original_prompt"], created))
+
+        # Backends such as PostgreSQL do not keep the embedding columns
+        batch_size = 32
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start : start + batch_size]
+            embeddings = await self.embedding_func([prompt for _, _, prompt, _ in batch])
+            for (mode, key, _, created), vector in zip(batch, embeddings):
+                self.add(mode, key, np.asarray(vector, dtype=np.float32), created)
+
+        logger.info(
+            f"Semantic query cache rebuilt with {sum(len(k) for k in self._keys.values())} entries"
+        )
+
+    async def embed_query(self, query: str) -> np.ndarray:
+        embedding = await self.embedding_func([query], _priority=5)
+        return np.asarray(embedding[0], dtype=np.float32)
+
+    def add(
+        self, mode: str, key: str, vector: np.ndarray, created: float | None = None
+    ) -> None:
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return
+        keys = self._keys.setdefault(mode, [])
+        vectors = self._vectors.setdefault(mode, [])
+        created_at = self._created.setdefault(mode, [])
+        if key in keys:
+            pos = keys.index(key)
+            del keys[pos], vectors[pos], created_at[pos]
+        keys.append(key)
+        vectors.append(np.asarray(vector, dtype=np.float32) / norm)
+        created_at.append(created if created is not None else time.time())
+        if len(keys) > self.max_entries:
+            del keys[0], vectors[0], created_at[0]
+        self._matrix.pop(mode, None)
+
+    def is_expired(self, entry: dict[str, Any]) -> bool:
+        """Whether a cached query entry is older than ttl"""
+        created = entry.get("create_time")
+        return bool(self.ttl and created and time.time() - float(created) > self.ttl)
+
+    async def evict_expired(self) -> None:
+        """Evict expired entries of every mode from the index and the KV storage"""
+        for mode in list(self._keys):
+            await self._evict_expired(mode)
+
+    async def _evict_expired(self, mode: str) -> None:
+        if not self.ttl or mode not in self._keys:
+            return
+        cutoff = time.time() - self.ttl
+        created_at = self._created[mode]
+        if not created_at or min(created_at) >= cutoff:
+            return
+        expired = [k for k, c in zip(self._keys[mode], created_at) if c < cutoff]
+        keep = [i for i, c in enumerate(created_at) if c >= cutoff]
+        self._keys[mode] = [self._keys[mode][i] for i in keep]
+        self._vectors[mode] = [self._vectors[mode][i] for i in keep]
+        self._created[mode] = [created_at[i] for i in keep]
+        self._matrix.pop(mode, None)
+        await self.hashing_kv.delete(expired)
+        logger.debug(f"Semantic cache evicted {len(expired)} expired {mode} entries")
+
+    async def lookup(self, mode: str, embedding: np.ndarray) -> str | None:
+        await self.evict_expired()
+        if not self._keys.get(mode):
+            return None
+        matrix = self._matrix.get(mode)
+        if matrix is None:
+            matrix = np.stack(self._vectors[mode])
+            self._matrix[mode] = matrix
+        norm = np.linalg.norm(embedding)
+        if norm == 0:
+            return None
+        similarities = matrix @ (embedding / norm)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+
+        key = self._keys[mode][best]
+        entry = await self.hashing_kv.get_by_id(key)
+        if not entry:
+            return None
+        logger.debug(
+            f"Semantic cache hit(key:{key}, similarity:{similarities[best]:.4f})"
+        )
+        return entry["return"]
+
+
+class EmbeddingBatcher:
+    """Coalesce concurrent small embedding calls into full batches.
+
+    Calls arriving within ``wait_ms`` of each other (and with identical keyword
+    arguments, e.g. the same ``_priority``) are concatenated into one request of at
+    most ``batch_size`` texts; the resulting vectors are split back per caller.
+    Calls that already carry ``batch_size`` texts or more are passed straight through.
+    """
+
+    def __init__(
+        self,
+        embedding_func: Callable[..., Any],
+        batch_size: int = 10,
+        wait_ms: float = 5,
+    ):
+        self.embedding_func = embedding_func
+        self.batch_size = max(1, batch_size)
+        self.wait = wait_ms / 1000
+        self.requested_calls = 0
+        self.dispatched_calls = 0
+        self._pending: dict[tuple, list[tuple[list[str], asyncio.Future]]] = {}
+        self._pending_count: dict[tuple, int] = {}
+        self._pending_kwargs: dict[tuple, dict[str, Any]] = {}
+        self._timers: dict[tuple, asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def wrap(self) -> Callable[..., Any]:
+        """Return a drop-in replacement for the wrapped embedding function"""
+
+        @wraps(self.embedding_func)
+        async def batched_embedding_func(texts: list[str], **kwargs):
+            return await self.embed(texts, **kwargs)
+
+        batched_embedding_func.embedding_batcher = self
+        return batched_embedding_func
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "requested_calls": self.requested_calls,
+            "dispatched_calls": self.dispatched_calls,
+        }
+
+    async def embed(self, texts: list[str], **kwargs) -> np.ndarray:
+        self.requested_calls += 1
+        if len(texts) >= self.batch_size or self.wait <= 0:
+            self.dispatched_calls += 1
+            return await self.embedding_func(texts, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        key = (id(loop), repr(sorted(kwargs.items())))
+        if self._pending_count.get(key, 0) + len(texts) > self.batch_size:
+            self._flush(key)
+
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append((texts, future))
+        self._pending_kwargs[key] = kwargs
+        self._pending_count[key] = self._pending_count.get(key, 0) + len(texts)
+
+        if self._pending_count[key] >= self.batch_size:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.wait, self._flush, key)
+        return await future
+
+    def _flush(self, key: tuple) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        items = self._pending.pop(key, None)
+        kwargs = self._pending_kwargs.pop(key, {})
+        self._pending_count.pop(key, None)
+        if not items:
+            return
+        task = asyncio.ensure_future(self._dispatch(items, kwargs))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(
+        self, items: list[tuple[list[str], asyncio.Future]], kwargs: dict[str, Any]
+    ) -> None:
+        texts = [text for batch, _ in items for text in batch]
+        self.dispatched_calls += 1
+        try:
+            vectors = await self.embedding_func(texts, **kwargs)
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for batch, future in items:
+            if not future.done():
+                future.set_result(vectors[offset : offset + len(batch)])
+            offset += len(batch)
+
+
+class EmbeddingCache:
+    """Persistent content-hash -> vector cache in front of an embedding function.
+
+    Entries are stored in the LLM response cache KV under the ``embedding`` mode, so
+    every KV backend that can hold LLM cache records can hold embeddings too. Vectors
+    are kept compact, either as 8-bit codes from `quantize_embedding` (``int8``) or as
+    ``float16``. The number of cached vectors is bounded by ``max_entries`` with LRU
+    eviction. Recency is kept per entry as the record's ``update_time``, refreshed at
+    most once per ``touch_interval`` seconds, and the LRU order is rebuilt from it by
+    scanning the cache once on first use.
+
+    Cache keys include the embedding model identity, ``model_name`` when given,
+    otherwise one derived from the wrapped function, so switching to another model
+    with the same dimension does not return stale vectors.
+    """
+
+    MODE = "embedding"
+
+    def __init__(
+        self,
+        embedding_func: Callable[..., Any],
+        hashing_kv,
+        max_entries: int = 100_000,
+        precision: str = "int8",
+        touch_interval: float = 3600,
+        model_name: str | None = None,
+    ):
+        if precision not in ("int8", "float16"):
+            raise ValueError(f"Unsupported embedding cache precision: {precision}")
+        self.embedding_func = embedding_func
+        self.hashing_kv = hashing_kv
+        self.max_entries = max_entries
+        self.precision = precision
+        self.touch_interval = touch_interval
+        self.embedding_dim = getattr(embedding_func, "embedding_dim", None)
+        self.model_identity = model_name or self._model_identity(embedding_func)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # hash -> last access time recorded in storage, in LRU order
+        self._lru: OrderedDict[str, float] = OrderedDict()
+        # hash -> stored payload of hits whose stored access time is stale
+        self._pending_touches: dict[str, str] = {}
+        self._index_loaded = False
+        self._lock = asyncio.Lock()
+
+    def wrap(self) -> Callable[..., Any]:
+        """Return a drop-in replacement for the wrapped embedding function"""
+
+        @wraps(self.embedding_func)
+        async def cached_embedding_func(texts: list[str], *args, **kwargs):
+            return await self.embed(texts, *args, **kwargs)
+
+        cached_embedding_func.embedding_cache = self
+        return cached_embedding_func
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._lru),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    @staticmethod
+    def _model_identity(embedding_func: Callable[..., Any]) -> str:
+        """Derive a model identity from the embedding function and its bound arguments"""
+        func = getattr(embedding_func, "func", embedding_func)
+        bound: dict[str, Any] = {}
+        while isinstance(func, partial):
+            bound = {**func.keywords, **bound}
+            func = func.func
+        name = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}"
+        details = [
+            f"{key}={bound[key]}"
+            for key in ("model", "model_name", "base_url", "host")
+            if bound.get(key)
+        ]
+        return "|".join([name, *details])
+
+    def _hash(self, text: str) -> str:
+        return compute_args_hash(self.model_identity, self.embedding_dim, text)
+
+    def _encode(self, vector: np.ndarray) -> str:
+        if self.precision == "float16":
+            data = np.asarray(vector, dtype=np.float16).tobytes()
+            return "f16|" + base64.b64encode(data).decode("ascii")
+        quantized, min_val, max_val = quantize_embedding(
+            np.asarray(vector, dtype=np.float32)
+        )
+        data = base64.b64encode(quantized.tobytes()).decode("ascii")
+        return f"q8|{float(min_val)!r}|{float(max_val)!r}|{data}"
+
+    @staticmethod
+    def _decode(payload: str) -> np.ndarray | None:
+        try:
+            kind, _, rest = payload.partition("|")
+            if kind == "f16":
+                data = np.frombuffer(base64.b64decode(rest), dtype=np.float16)
+                return data.astype(np.float32)
+            if kind == "q8":
+                min_val, max_val, data = rest.split("|", 2)
+                quantized = np.frombuffer(base64.b64decode(data), dtype=np.uint8)
+                return dequantize_embedding(quantized, float(min_val), float(max_val))
+        except (ValueError, TypeError):
+            pass
+        return None
+
+    def _record(self, payload: str) -> dict[str, Any]:
+        return {
+            "return": payload,
+            "cache_type": "vector",
+            "mode": self.MODE,
+            "chunk_id": None,
+            "original_prompt": "",
+        }
+
+    async def _load_index(self) -> None:
+        """Rebuild the LRU order from the stored access time of every cached vector"""
+        if self._index_loaded:
+            return
+        async with self._lock:
+            if self._index_loaded:
+                return
+            get_all = getattr(self.hashing_kv, "get_all", None)
+            if get_all is None:
+                logger.warning(
+                    "Embedding cache storage cannot be scanned, eviction only covers vectors cached by this process"
+                )
+                self._index_loaded = True
+                return
+
+            prefix = generate_cache_key(self.MODE, "vector", "")
+            entries = []
+            for key, row in (await get_all()).items():
+                if key.startswith(prefix) and row:
+                    accessed_at = row.get("update_time") or row.get("create_time") or 0
+                    entries.append((accessed_at, key[len(prefix) :]))
+            entries.sort()
+            for accessed_at, hash_value in entries:
+                self._lru[hash_value] = accessed_at
+
+            # Legacy single index record holding the whole LRU order
+            legacy_index = generate_cache_key(self.MODE, "index", "lru")
+            evicted = [legacy_index]
+            while len(self._lru) > self.max_entries:
+                evicted_hash, _ = self._lru.popitem(last=False)
+                evicted.append(generate_cache_key(self.MODE, "vector", evicted_hash))
+            self.evictions += len(evicted) - 1
+            await self.hashing_kv.delete(evicted)
+            self._index_loaded = True
+
+    async def _fetch(self, hashes: list[str]) -> dict[str, tuple[np.ndarray, str]]:
+        """Fetch cached vectors, returns hash -> (vector, stored payload)"""
+        keys = [generate_cache_key(self.MODE, "vector", h) for h in hashes]
+        rows = await self.hashing_kv.get_by_ids(keys)
+        found: dict[str, tuple[np.ndarray, str]] = {}
+        for pos, row in enumerate(rows or []):
+            if not row:
+                continue
+            row_key = row.get("_id") or row.get("id")
+            # Backends that do not echo the id return rows aligned with the request
+            if row_key is None and len(rows) == len(keys):
+                row_key = keys[pos]
+            payload = row.get("return") or ""
+            vector = self._decode(payload)
+            if row_key is not None and vector is not None:
+                found[parse_cache_key(str(row_key))[2]] = (vector, payload)
+        return found
+
+    async def embed(self, texts: list[str], *args, **kwargs) -> np.ndarray:
+        await self._load_index()
+        hashes = [self._hash(text) for text in texts]
+        unique_hashes = list(dict.fromkeys(hashes))
+        cached = await self._fetch(unique_hashes)
+        vectors = {h: vector for h, (vector, _) in cached.items()}
+
+        missing = [h for h in unique_hashes if h not in vectors]
+        missing_set = set(missing)
+        miss_count = sum(1 for h in hashes if h in missing_set)
+        self.misses += miss_count
+        self.hits += len(hashes) - miss_count
+
+        new_entries: dict[str, dict[str, Any]] = {}
+        if missing:
+            text_by_hash = dict(zip(hashes, texts))
+            embeddings = await self.embedding_func(
+                [text_by_hash[h] for h in missing], *args, **kwargs
+            )
+            for hash_value, embedding in zip(missing, embeddings):
+                vectors[hash_value] = np.asarray(embedding, dtype=np.float32)
+                new_entries[generate_cache_key(self.MODE, "vector", hash_value)] = (
+                    self._record(self._encode(embedding))
+                )
+
+        now = time.time()
+        evicted: list[str] = []
+        async with self._lock:
+            for hash_value in unique_hashes:
+                if hash_value in cached:
+                    accessed_at = self._lru.get(hash_value, 0)
+                    # Refresh the stored access time only when it is stale
+                    if now - accessed_at > self.touch_interval:
+                        self._pending_touches[hash_value] = cached[hash_value][1]
+                        accessed_at = now
+                else:
+                    accessed_at = now
+                    self._pending_touches.pop(hash_value, None)
+                self._lru[hash_value] = accessed_at
+                self._lru.move_to_end(hash_value)
+            while len(self._lru) > self.max_entries:
+                evicted_hash, _ = self._lru.popitem(last=False)
+                self._pending_touches.pop(evicted_hash, None)
+                evicted.append(generate_cache_key(self.MODE, "vector", evicted_hash))
+        if new_entries:
+            await self.hashing_kv.upsert(new_entries)
+        if evicted:
+            self.evictions += len(evicted)
+            await self.hashing_kv.delete(evicted)
+
+        if not hashes:
+            return np.empty((0, self.embedding_dim or 0), dtype=np.float32)
+        return np.stack([vectors[h] for h in hashes])
+
+    async def index_done_callback(self) -> None:
+        """Persist refreshed access times of entries hit since their last refresh
+
+        Only entries whose stored access time was older than touch_interval are
+        rewritten, the upsert updates their update_time.
+        """
+        async with self._lock:
+            if not self._pending_touches:
+                return
+            touches = self._pending_touches
+            self._pending_touches = {}
+        await self.hashing_kv.upsert(
+            {
+                generate_cache_key(self.MODE, "vector", hash_value): self._record(
+                    payload
+                )
+                for hash_value, payload in touches.items()
+            }
+        )
+
 
 def safe_unicode_decode(content):
     # Regular expression to find all Unicode escape sequences of the form \uXXXX
@@ -0,0 +1,12 @@
+from fastapi import Request
+
+from lightrag import LightRAG
+from plm.core.rag import rag_pool
+
+
+async def get_rag(request: Request) -> LightRAG:
+    """FastAPI dependency returning the warm LightRAG instance created in the app lifespan"""
+    rag = getattr(request.app.state, "rag", None)
+    if rag is None:
+        rag = await rag_pool.get()
+    return rag
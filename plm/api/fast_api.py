@@ -44,7 +44,7 @@ from plm.utils.handler.exception_handler import (
     docx_parser_exception_handler
 )
 
-from plm.core.rag import init_rag
+from plm.core.rag import rag_pool
 from lightrag.kg.shared_storage import (
     get_namespace_data,
     get_pipeline_status_lock,
@@ -59,18 +59,15 @@ def create_app():
     logger.level(app_settings.LOG_LEVEL)
     logger.info('---create-app---')
 
-    rag = init_rag()
-
     @asynccontextmanager
     async def lifespan(app: FastAPI):
         """Lifespan context manager for startup and shutdown events"""
         # Store background tasks
         app.state.background_tasks = set()
-        # app.state.rag=rag
 
         try:
-            # Initialize database connections
-            await rag.initialize_storages()
+            # Initialize database connections and warm up the shared RAG instance once
+            app.state.rag = await rag_pool.get()
 
             logger.info('RAG INIT SUCCESSFULLY.')
 
@@ -99,7 +96,7 @@ def create_app():
 
         finally:
             # Clean up database connections
-            await rag.finalize_storages()
+            await rag_pool.close()
 
     logger.info('---settinngs fastapi---')
     # Initialize FastAPI
@@ -7,8 +7,8 @@ import mammoth
 from fastapi import APIRouter, UploadFile, File, Depends
 from loguru import logger
 
-from lightrag.kg.shared_storage import initialize_pipeline_status
-from plm.core.rag import init_rag
+from lightrag import LightRAG
+from plm.api.deps import get_rag
 from plm.utils.parser.docx_parser import DocxParser
 from plm.deepdoc.docx_parser import do_parse
 from plm.conf.settings import file_settings
@@ -21,7 +21,7 @@ image_suffixes = [".png", ".jpeg", ".jpg", ".webp", ".gif"]
 
 
 @router.post(path="/files")
-async def upload_files(file_name: str, file: UploadFile=File(...)):
+async def upload_files(file_name: str, file: UploadFile=File(...), rag: LightRAG = Depends(get_rag)):
     # , method, backend, lang, server_url,
     # # start_page_id, end_page_id, table_enable,
     # device_mode, virtual_vram, model_source, ** kwargs
@@ -89,11 +89,6 @@ async def upload_files(file_name: str, file: UploadFile=File(...)):
 
     logger.info(f'Docx Parse Result: {html_text}')
 
-    # Initialize RAG
-    rag = init_rag()
-    # Initialize database connections
-    await rag.initialize_storages()
-    await initialize_pipeline_status()
     MAGIC_SPLIT_STR = "\n↔\n"
     # rag_ainsert_reponse = await rag.ainsert(input=html_text,
     #                                         split_by_character=MAGIC_SPLIT_STR,
@@ -3,13 +3,12 @@ from typing import Annotated
 
 from fastapi import APIRouter, Request, Body, Depends
 
-from lightrag import QueryParam
+from lightrag import LightRAG, QueryParam
 from plm.utils.schema import RAGQARequest,RAGQAResponse
 
 from loguru import logger
 
-from lightrag.kg.shared_storage import initialize_pipeline_status
-from plm.core.rag import init_rag
+from plm.api.deps import get_rag
 
 router = APIRouter()
 
@@ -17,7 +16,8 @@ router = APIRouter()
 async def rag_query_and_answer(
         # request: Request,
         args: Annotated[RAGQARequest,
-        Body(examples=[{"question": "PLM 怎么修改物料的采购类型？"}])]
+        Body(examples=[{"question": "PLM 怎么修改物料的采购类型？"}])],
+        rag: Annotated[LightRAG, Depends(get_rag)],
         # db_session=Depends()
 ):
     logger.info(f'RAG QUERY AND ANSWER...')
@@ -25,11 +25,6 @@ async def rag_query_and_answer(
     # logger.info(f'User Request Info: {request.headers}')
 
     text = args.question
-    # Initialize RAG
-    rag = init_rag()
-    # Initialize database connections
-    await rag.initialize_storages()
-    await initialize_pipeline_status()
     # MAGIC_SPLIT_STR = "\n↔\n"
     # rag_ainsert_reponse = await rag.ainsert(input=text,
     #                                         split_by_character=MAGIC_SPLIT_STR,
@@ -48,4 +43,15 @@ async def rag_query_and_answer(
     return RAGQAResponse(data={"answer":rag_query_response})
 
 if __name__ == "__main__":
-    asyncio.run(rag_query_and_answer(RAGQARequest(question="请问BOM是什么？")))
+    from lightrag.kg.shared_storage import initialize_pipeline_status
+    from plm.core.rag import rag_pool
+
+    async def _main():
+        rag = await rag_pool.get()
+        await initialize_pipeline_status()
+        try:
+            await rag_query_and_answer(RAGQARequest(question="请问BOM是什么？"), rag)
+        finally:
+            await rag_pool.close()
+
+    asyncio.run(_main())
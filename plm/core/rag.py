@@ -1,3 +1,7 @@
+import asyncio
+import time
+from functools import lru_cache
+
 from loguru import logger
 from transformers import AutoTokenizer
 
@@ -52,6 +56,7 @@ def embedding_func():
     )
 
 
+@lru_cache(maxsize=1)
 def tokenizer():
     return AutoTokenizer.from_pretrained(llm_settings.HIK_MAAS_TOKENIZER.get_secret_value())  # local tokenizer
 
@@ -70,10 +75,11 @@ async def rerank_model_func(
         **kwargs,
     )
 
-def init_rag():
+def init_rag(workspace: str | None = None):
+   workspace_kwargs = {} if workspace is None else {"workspace": workspace}
    return LightRAG(
         # working_dir=args.working_dir,
-        # workspace=args.workspace,
+        **workspace_kwargs,
         llm_model_func=hik_openai_model_complete,  # azure_openai_model_complete
         chunking_func=custom_chunking,
         chunk_token_size=int(rag_settings.CHUNK_SIZE),
@@ -102,3 +108,51 @@ def init_rag():
         addon_params={"language": rag_settings.SUMMARY_LANGUAGE},
     )
 
+
+
+async def warm_up_rag(rag: LightRAG) -> None:
+    """Preload tokenizer, vector indexes and graph so the first query does not pay for it"""
+    start = time.perf_counter()
+    rag.tokenizer.encode("warm up")
+    warm_up_tasks = [
+        rag.chunks_vdb.query("warm up", top_k=1),
+        rag.entities_vdb.query("warm up", top_k=1),
+        rag.relationships_vdb.query("warm up", top_k=1),
+        rag.chunk_entity_relation_graph.has_node("warm up"),
+    ]
+    results = await asyncio.gather(*warm_up_tasks, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"RAG warm up step failed: {result}")
+    logger.info(f"RAG warm up finished in {time.perf_counter() - start:.3f}s")
+
+
+class RAGPool:
+    """Process-wide LightRAG instances, one per workspace, initialized once and reused by all requests"""
+
+    def __init__(self):
+        self._instances: dict[str, LightRAG] = {}
+        self._lock = asyncio.Lock()
+
+    async def get(self, workspace: str | None = None) -> LightRAG:
+        key = workspace or ""
+        rag = self._instances.get(key)
+        if rag is not None:
+            return rag
+        async with self._lock:
+            rag = self._instances.get(key)
+            if rag is None:
+                rag = init_rag(workspace)
+                await rag.initialize_storages()
+                await warm_up_rag(rag)
+                self._instances[key] = rag
+        return rag
+
+    async def close(self) -> None:
+        async with self._lock:
+            instances, self._instances = self._instances, {}
+        for rag in instances.values():
+            await rag.finalize_storages()
+
+
+rag_pool = RAGPool()
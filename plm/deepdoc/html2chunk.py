@@ -1,4 +1,5 @@
 import uuid
+from collections import defaultdict
 from pathlib import Path
 
 from bs4 import BeautifulSoup, Tag, NavigableString
@@ -45,6 +46,8 @@ class HTMLChunker:
     def __init__(self, tokenizer: Tokenizer, content: str, html_path):
         self.html_path = html_path
         self.nodes = []  # 存储所有节点
+        self.node_index: Dict[str, ChunkNode] = {}  # id -> 节点索引
+        self.children: Dict[str, List[str]] = defaultdict(list)  # 父节点id -> 子节点id列表
         self.current_parent_stack = []  # 跟踪当前父节点id
         self.encoder = tokenizer  # qwen3
         self.doc_name = Path(html_path).stem
@@ -56,7 +59,7 @@ class HTMLChunker:
             title="Document Root",
             metadata={"source": html_path}
         )
-        self.nodes.append(root_node)
+        self.add_node(root_node)
         self.current_parent_stack.append('root')  # 初始化当前父节点
 
         # 读取并解析HTML
@@ -73,6 +76,13 @@ class HTMLChunker:
         """ 计算文本token数量 """
         return len(self.encoder.encode(text))
 
+    def add_node(self, node: ChunkNode):
+        """ 添加节点并维护 id 索引和子节点邻接表 """
+        self.nodes.append(node)
+        self.node_index[node.id] = node
+        if node.parent_id is not None:
+            self.children[node.parent_id].append(node.id)
+
     def recursive_process(self, element: Tag):
         """ 递归处理 HTML 元素 """
         # 获取当前父节点ID
@@ -103,7 +113,7 @@ class HTMLChunker:
                 metadata={"source": self.html_path},
                 parent_id=current_parent_id
             )
-            self.nodes.append(new_node)
+            self.add_node(new_node)
 
 
             # 将新节点设为当前父节点
@@ -130,14 +140,15 @@ class HTMLChunker:
             # 获取当前父节点
             parent_node = self.get_node_by_id(current_parent_id)
             if parent_node:
+                # 首次追加前统计节点已有文本（文档名-章节名）的token数
+                if parent_node.token_count == 0 and parent_node.text:
+                    parent_node.token_count = self.count_tokens(parent_node.text)
                 # 添加内容到当前父节点的文本
-                if parent_node.text:
-                    # parent_node.text += "\n\n" + content_text
-                    parent_node.text += "。" + content_text
-                else:
-                    parent_node.text = '。' + content_text # 节点初始化时有文档名-章节名，所以需要加句号
-                # 更新token计数
-                parent_node.token_count = self.count_tokens(parent_node.text)
+                fragment = "。" + content_text  # 节点初始化时有文档名-章节名，所以需要加句号
+                # parent_node.text += "\n\n" + content_text
+                parent_node.text += fragment
+                # 增量更新token计数，只统计新追加的片段
+                parent_node.token_count += self.count_tokens(fragment)
                 # 添加图片到元数据
                 if images:
                     if "images" not in parent_node.metadata:
@@ -151,10 +162,7 @@ class HTMLChunker:
 
     def get_node_by_id(self, node_id: str) -> Optional[ChunkNode]:
         """根据 id 查找节点"""
-        for node in self.nodes:
-            if node.id == node_id:
-                return node
-        return None
+        return self.node_index.get(node_id)
 
     def extract_content(self, element: Tag) -> Tuple[str, list]:
         """ 提取元素内容， 返回文本和图片列表 """
@@ -290,9 +298,8 @@ class HTMLChunker:
         full_text += node.text
 
         # 添加直接子节点内容
-        children = [n for n in self.nodes if n.parent_id == node_id]
-        for child in children:
-            full_text += "\n\n" + self.get_full_text(child.id)
+        for child_id in self.children.get(node_id, []):
+            full_text += "\n\n" + self.get_full_text(child_id)
         return full_text.strip()
 
     def save_to_database(self):
@@ -0,0 +1,158 @@
+"""Parity of the batch graph reads between NetworkXStorage and MemgraphStorage
+
+Both backends are loaded with the same small graph and every batch method must
+return the same result for them. The Memgraph side runs only when MEMGRAPH_URI
+points to a reachable server.
+"""
+
+import asyncio
+import importlib.util
+import os
+import socket
+from urllib.parse import urlparse
+
+import pytest
+
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import initialize_share_data
+
+PARITY_WORKSPACE = "lightrag_batch_parity_test"
+
+NODES = {
+    name: {
+        "entity_id": name,
+        "entity_type": "category",
+        "description": f"{name} description",
+        "source_id": f"chunk-{name}",
+        "file_path": "parity.md",
+    }
+    for name in ("A", "B", "C", "D")
+}
+EDGES = {
+    ("A", "B"): {
+        "weight": 1.0,
+        "description": "A relates to B",
+        "keywords": "ab",
+        "source_id": "chunk-A",
+        "file_path": "parity.md",
+    },
+    ("B", "C"): {
+        "weight": 2.0,
+        "description": "B relates to C",
+        "keywords": "bc",
+        "source_id": "chunk-B",
+        "file_path": "parity.md",
+    },
+}
+# D is isolated, "missing" does not exist
+NODE_IDS = ["A", "B", "D", "missing"]
+
+
+def _memgraph_reachable() -> bool:
+    uri = os.environ.get("MEMGRAPH_URI")
+    if not uri or importlib.util.find_spec("neo4j") is None:
+        return False
+    parsed = urlparse(uri)
+    try:
+        with socket.create_connection(
+            (parsed.hostname or "localhost", parsed.port or 7687), timeout=2
+        ):
+            return True
+    except OSError:
+        return False
+
+
+BACKENDS = [
+    "networkx",
+    pytest.param(
+        "memgraph",
+        marks=pytest.mark.skipif(
+            not _memgraph_reachable(), reason="MEMGRAPH_URI is not set or unreachable"
+        ),
+    ),
+]
+
+
+async def _open_storage(backend: str, working_dir: str):
+    global_config = {"working_dir": working_dir, "max_graph_nodes": 1000}
+    if backend == "networkx":
+        initialize_share_data()
+        storage = NetworkXStorage(
+            namespace="chunk_entity_relation",
+            workspace="",
+            global_config=global_config,
+            embedding_func=None,
+        )
+    else:
+        from lightrag.kg.memgraph_impl import MemgraphStorage
+
+        storage = MemgraphStorage(
+            namespace="chunk_entity_relation",
+            global_config=global_config,
+            embedding_func=None,
+            workspace=PARITY_WORKSPACE,
+        )
+    await storage.initialize()
+    await storage.drop()
+    for node_id, node_data in NODES.items():
+        await storage.upsert_node(node_id, dict(node_data))
+    for (src, tgt), edge_data in EDGES.items():
+        await storage.upsert_edge(src, tgt, dict(edge_data))
+    return storage
+
+
+def _run(backend: str, working_dir, read):
+    async def main():
+        storage = await _open_storage(backend, str(working_dir))
+        try:
+            return await read(storage)
+        finally:
+            await storage.drop()
+            if backend == "memgraph":
+                await storage.finalize()
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_get_nodes_batch(backend, tmp_path):
+    result = _run(backend, tmp_path, lambda s: s.get_nodes_batch(NODE_IDS))
+    assert result == {name: NODES[name] for name in ("A", "B", "D")}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_node_degrees_batch(backend, tmp_path):
+    result = _run(backend, tmp_path, lambda s: s.node_degrees_batch(NODE_IDS))
+    assert result == {"A": 1, "B": 2, "D": 0, "missing": 0}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_edge_degrees_batch(backend, tmp_path):
+    pairs = [("A", "B"), ("C", "B"), ("D", "missing")]
+    result = _run(backend, tmp_path, lambda s: s.edge_degrees_batch(pairs))
+    assert result == {("A", "B"): 3, ("C", "B"): 3, ("D", "missing"): 0}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_get_edges_batch(backend, tmp_path):
+    pairs = [
+        {"src": "A", "tgt": "B"},
+        # Edges are undirected, the reversed pair finds the same edge
+        {"src": "C", "tgt": "B"},
+        {"src": "A", "tgt": "C"},
+        {"src": "A", "tgt": "missing"},
+    ]
+    result = _run(backend, tmp_path, lambda s: s.get_edges_batch(pairs))
+    assert result == {("A", "B"): EDGES[("A", "B")], ("C", "B"): EDGES[("B", "C")]}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_get_nodes_edges_batch(backend, tmp_path):
+    result = _run(backend, tmp_path, lambda s: s.get_nodes_edges_batch(NODE_IDS))
+    # Edge order is backend specific
+    assert {node_id: sorted(edges) for node_id, edges in result.items()} == {
+        "A": [("A", "B")],
+        "B": [("B", "A"), ("B", "C")],
+        "D": [],
+        "missing": [],
+    }
@@ -0,0 +1,62 @@
+"""Durability of JsonKVStorage's change log across interrupted writes and restarts"""
+
+import asyncio
+
+import pytest
+
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+
+
+async def _start(working_dir: str) -> JsonKVStorage:
+    """Open the storage as a freshly started process would"""
+    finalize_share_data()
+    initialize_share_data()
+    kv = JsonKVStorage(
+        namespace="full_docs",
+        workspace="",
+        global_config={"working_dir": working_dir},
+        embedding_func=None,
+    )
+    await kv.initialize()
+    return kv
+
+
+def test_records_after_torn_append_survive_restart(tmp_path):
+    async def main():
+        kv = await _start(str(tmp_path))
+        await kv.upsert({"a": {"content": "a"}})
+        await kv.upsert({"b": {"content": "b"}})
+        # A crash in the middle of appending the record of "b"
+        log_file = kv._change_log.log_file
+        with open(log_file, "rb") as f:
+            content = f.read()
+        with open(log_file, "wb") as f:
+            f.write(content[:-10])
+
+        kv = await _start(str(tmp_path))
+        assert await kv.get_by_id("b") is None
+        await kv.upsert({"c": {"content": "c"}})
+        await kv.upsert({"d": {"content": "d"}})
+
+        kv = await _start(str(tmp_path))
+        return sorted((await kv.get_all()).keys())
+
+    assert asyncio.run(main()) == ["a", "c", "d"]
+
+
+def test_unserializable_upsert_leaves_memory_unchanged(tmp_path):
+    async def main():
+        kv = await _start(str(tmp_path))
+        await kv.upsert({"a": {"content": "a"}})
+        with pytest.raises(TypeError):
+            await kv.upsert({"a": {"content": object()}, "b": {"content": "b"}})
+        in_memory = await kv.get_all()
+
+        kv = await _start(str(tmp_path))
+        return in_memory, await kv.get_all()
+
+    in_memory, reloaded = asyncio.run(main())
+    assert sorted(in_memory) == ["a"]
+    assert in_memory["a"]["content"] == "a"
+    assert in_memory == reloaded
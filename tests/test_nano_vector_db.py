@@ -0,0 +1,79 @@
+"""Relation deletes of NanoVectorDBStorage"""
+
+import asyncio
+
+import numpy as np
+
+from lightrag.kg import nano_vector_db_impl
+from lightrag.kg.nano_vector_db_impl import NanoVectorDBStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.utils import EmbeddingFunc
+
+DIM = 8
+
+
+async def _embed(texts, **kwargs):
+    rng = np.random.default_rng(len(texts))
+    return rng.standard_normal((len(texts), DIM)).astype(np.float32)
+
+
+async def _open_storage(working_dir: str) -> NanoVectorDBStorage:
+    finalize_share_data()
+    initialize_share_data()
+    storage = NanoVectorDBStorage(
+        namespace="relationships",
+        workspace="",
+        global_config={
+            "working_dir": working_dir,
+            "embedding_batch_num": 32,
+            "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": 0.2},
+        },
+        embedding_func=EmbeddingFunc(
+            embedding_dim=DIM, max_token_size=512, func=_embed
+        ),
+        meta_fields={"src_id", "tgt_id", "content"},
+    )
+    await storage.initialize()
+    return storage
+
+
+def _relation(src: str, tgt: str) -> dict:
+    return {"src_id": src, "tgt_id": tgt, "content": f"{src} {tgt}"}
+
+
+def test_delete_entity_relation_tracks_upserts_and_deletes(tmp_path, monkeypatch):
+    snapshot_builds = []
+    build = nano_vector_db_impl._SearchIndex.build.__func__
+    monkeypatch.setattr(
+        nano_vector_db_impl._SearchIndex,
+        "build",
+        classmethod(lambda cls, *args: snapshot_builds.append(1) or build(cls, *args)),
+    )
+
+    async def main():
+        storage = await _open_storage(str(tmp_path))
+        await storage.upsert(
+            {
+                "r1": _relation("A", "B"),
+                "r2": _relation("B", "C"),
+                "r3": _relation("C", "D"),
+            }
+        )
+        await storage.delete_entity_relation("A")
+        # Changes after the relation index was built must be reflected by it
+        await storage.upsert({"r4": _relation("B", "E"), "r3": _relation("D", "E")})
+        await storage.delete(["r2"])
+        await storage.delete_entity_relation("B")
+        remaining_after_b = sorted(
+            dp["__id__"] for dp in (await storage.client_storage)["data"]
+        )
+        await storage.delete_entity_relation("C")
+        await storage.delete_entity_relation("E")
+        remaining = (await storage.client_storage)["data"]
+        return remaining_after_b, remaining
+
+    remaining_after_b, remaining = asyncio.run(main())
+    assert remaining_after_b == ["r3"]
+    assert remaining == []
+    # Relation deletes do not build the search snapshot
+    assert not snapshot_builds
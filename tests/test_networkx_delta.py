@@ -0,0 +1,75 @@
+"""Recovery of the NetworkXStorage snapshot + delta log from interrupted writes"""
+
+import asyncio
+
+import pytest
+
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import initialize_share_data
+
+
+def _new_storage(working_dir: str) -> NetworkXStorage:
+    initialize_share_data()
+    return NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="",
+        global_config={"working_dir": working_dir, "max_graph_nodes": 1000},
+        embedding_func=None,
+    )
+
+
+def _node(name: str) -> dict:
+    return {"entity_id": name, "entity_type": "category", "source_id": "chunk-1"}
+
+
+@pytest.mark.parametrize("torn_tail", [b"\x94\xa1n", b"\x94"])
+def test_interrupted_append_is_truncated(tmp_path, torn_tail):
+    async def main():
+        storage = _new_storage(str(tmp_path))
+        await storage.initialize()
+        await storage.upsert_node("n0", _node("n0"))
+        await storage.index_done_callback()
+        await storage.upsert_node("n1", _node("n1"))
+        await storage.index_done_callback()
+
+        # A crash in the middle of appending the next record
+        with open(storage._delta_file, "ab") as f:
+            f.write(torn_tail)
+
+        restarted = _new_storage(str(tmp_path))
+        await restarted.initialize()
+        assert await restarted.has_node("n1")
+        await restarted.upsert_node("n2", _node("n2"))
+        assert await restarted.index_done_callback()
+
+        reloaded = _new_storage(str(tmp_path))
+        await reloaded.initialize()
+        return sorted(reloaded._graph.nodes())
+
+    assert asyncio.run(main()) == ["n0", "n1", "n2"]
+
+
+def test_stale_delta_header_is_replaced(tmp_path):
+    async def main():
+        storage = _new_storage(str(tmp_path))
+        await storage.initialize()
+        await storage.upsert_node("n0", _node("n0"))
+        await storage.index_done_callback()
+
+        # A crash between writing a new snapshot and replacing the delta header
+        NetworkXStorage.write_graph_snapshot(
+            storage._graph, storage._snapshot_file, storage._generation + 1
+        )
+
+        restarted = _new_storage(str(tmp_path))
+        await restarted.initialize()
+        await restarted.upsert_node("n1", _node("n1"))
+        await restarted.index_done_callback()
+        await restarted.upsert_node("n2", _node("n2"))
+        await restarted.index_done_callback()
+
+        reloaded = _new_storage(str(tmp_path))
+        await reloaded.initialize()
+        return sorted(reloaded._graph.nodes())
+
+    assert asyncio.run(main()) == ["n0", "n1", "n2"]
@@ -0,0 +1,102 @@
+"""SemanticQueryCache on top of the default JSON KV storage"""
+
+import asyncio
+
+import numpy as np
+
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.utils import (
+    CacheData,
+    SemanticQueryCache,
+    compute_args_hash,
+    handle_cache,
+    save_to_cache,
+)
+
+VECTORS = {
+    "what is a BOM review": [0.9, 0.1, 0.2, 0.1],
+    "what is the BOM review": [0.88, 0.12, 0.21, 0.1],
+    "how do I reset a password": [0.1, 0.9, 0.1, 0.3],
+}
+
+
+async def _embed(texts, **kwargs):
+    return np.array([VECTORS[text] for text in texts], dtype=np.float32)
+
+
+async def _open_cache(working_dir: str, ttl: int = 0) -> JsonKVStorage:
+    finalize_share_data()
+    initialize_share_data()
+    kv = JsonKVStorage(
+        namespace="llm_response_cache",
+        workspace="",
+        global_config={"working_dir": working_dir, "enable_llm_cache": True},
+        embedding_func=None,
+    )
+    await kv.initialize()
+    kv.semantic_cache = SemanticQueryCache(
+        _embed, kv, similarity_threshold=0.95, ttl=ttl
+    )
+    await kv.semantic_cache.initialize()
+    return kv
+
+
+async def _query(kv: JsonKVStorage, prompt: str, answer: str) -> str:
+    """Answer a query through the cache like kg_query does"""
+    args_hash = compute_args_hash("local", prompt)
+    cached, quantized, min_val, max_val = await handle_cache(
+        kv, args_hash, prompt, "local", cache_type="query"
+    )
+    if cached is not None:
+        return cached
+    await save_to_cache(
+        kv,
+        CacheData(
+            args_hash=args_hash,
+            content=answer,
+            prompt=prompt,
+            quantized=quantized,
+            min_val=min_val,
+            max_val=max_val,
+            mode="local",
+            cache_type="query",
+        ),
+    )
+    return answer
+
+
+def test_cache_miss_is_saved_and_reused(tmp_path):
+    async def main():
+        kv = await _open_cache(str(tmp_path))
+        first = await _query(kv, "what is a BOM review", "answer 1")
+        similar = await _query(kv, "what is the BOM review", "answer 2")
+        other = await _query(kv, "how do I reset a password", "answer 3")
+        return first, similar, other
+
+    assert asyncio.run(main()) == ("answer 1", "answer 1", "answer 3")
+
+
+def test_expired_entries_are_not_served(tmp_path):
+    async def main():
+        kv = await _open_cache(str(tmp_path), ttl=60)
+        await _query(kv, "what is a BOM review", "answer 1")
+        await _query(kv, "how do I reset a password", "answer 2")
+        # Age both entries past the ttl
+        for entry in kv._data.values():
+            entry["create_time"] -= 120
+        kv.semantic_cache._created = {
+            mode: [created - 120 for created in created_at]
+            for mode, created_at in kv.semantic_cache._created.items()
+        }
+
+        exact = await _query(kv, "what is a BOM review", "answer 3")
+        similar = await _query(kv, "what is the BOM review", "answer 4")
+        return exact, similar, sorted(
+            entry["return"] for entry in (await kv.get_all()).values()
+        )
+
+    exact, similar, stored = asyncio.run(main())
+    assert (exact, similar) == ("answer 3", "answer 3")
+    # The expired "answer 2" was evicted too, though its query was not repeated
+    assert stored == ["answer 3"]